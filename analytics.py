@@ -0,0 +1,169 @@
+"""
+Finance Assistant Bot - Spending Analytics
+==========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Spending rollups and the aggregated queries served from them.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+from datetime import date, datetime
+
+from budgets import SPENDING_TYPES, add_months
+
+MAX_TREND_MONTHS = 120
+
+# Rollup sums are accumulated incrementally, so allow for float rounding
+ROLLUP_TOLERANCE = 0.005
+
+_ROLLUP_SOURCE = '''
+    SELECT account_id, 'day' AS bucket_type, substr(created_at, 1, 10) AS bucket,
+           COALESCE(category, 'Other') AS category, transaction_type,
+           SUM(amount) AS total, COUNT(*) AS count
+    FROM transactions
+    GROUP BY account_id, bucket, COALESCE(category, 'Other'), transaction_type
+    UNION ALL
+    SELECT account_id, 'month' AS bucket_type, substr(created_at, 1, 7) AS bucket,
+           COALESCE(category, 'Other') AS category, transaction_type,
+           SUM(amount) AS total, COUNT(*) AS count
+    FROM transactions
+    GROUP BY account_id, bucket, COALESCE(category, 'Other'), transaction_type
+'''
+
+# Spending queries over the rollups; {where} is filled by spending_query()
+CATEGORY_SPENDING_SQL = '''
+    SELECT category, SUM(total) AS total, SUM(count) AS count
+    FROM transaction_rollups
+    WHERE {where} AND bucket_type = 'day' AND bucket >= ?
+    GROUP BY category
+    HAVING SUM(count) > 0
+    ORDER BY total DESC
+'''
+MONTH_SPENDING_SQL = '''
+    SELECT COALESCE(SUM(total), 0) AS total
+    FROM transaction_rollups
+    WHERE {where} AND bucket_type = 'month' AND bucket >= ?
+'''
+MONTHLY_TRENDS_SQL = '''
+    SELECT bucket AS month, category, SUM(total) AS total
+    FROM transaction_rollups
+    WHERE {where} AND bucket_type = 'month' AND bucket >= ?
+    GROUP BY bucket, category
+    HAVING SUM(count) > 0
+'''
+
+
+def rebuild_rollups(conn):
+    """Recompute transaction_rollups from the raw ledger (caller commits)"""
+    conn.execute('DELETE FROM transaction_rollups')
+    conn.execute(f'INSERT INTO transaction_rollups {_ROLLUP_SOURCE}')
+
+
+def verify_rollups(conn):
+    """Compare transaction_rollups with the raw ledger.
+
+    Returns a list of drift records, each a dict with the bucket key and
+    the expected (ledger) and actual (rollup) total and count.
+    """
+    rows = conn.execute(f'''
+        WITH expected AS ({_ROLLUP_SOURCE}),
+        keys AS (
+            SELECT account_id, bucket_type, bucket, category, transaction_type FROM expected
+            UNION
+            SELECT account_id, bucket_type, bucket, category, transaction_type FROM transaction_rollups
+        )
+        SELECT k.account_id, k.bucket_type, k.bucket, k.category, k.transaction_type,
+               COALESCE(e.total, 0) AS expected_total, COALESCE(r.total, 0) AS actual_total,
+               COALESCE(e.count, 0) AS expected_count, COALESCE(r.count, 0) AS actual_count
+        FROM keys k
+        LEFT JOIN expected e USING (account_id, bucket_type, bucket, category, transaction_type)
+        LEFT JOIN transaction_rollups r USING (account_id, bucket_type, bucket, category, transaction_type)
+    ''').fetchall()
+    return [dict(row) for row in rows
+            if row['expected_count'] != row['actual_count']
+            or abs(row['expected_total'] - row['actual_total']) > ROLLUP_TOLERANCE]
+
+
+def spending_query(sql, account_ids, *params):
+    """Fill a spending query template for ``account_ids``; returns (sql, parameters)"""
+    placeholders = ','.join('?' * len(account_ids))
+    type_placeholders = ','.join('?' * len(SPENDING_TYPES))
+    where = f'account_id IN ({placeholders}) AND transaction_type IN ({type_placeholders})'
+    return sql.format(where=where), list(account_ids) + list(SPENDING_TYPES) + list(params)
+
+
+def spending_by_category(conn, account_ids, since_date):
+    """Spending per category on or after ``since_date`` (a YYYY-MM-DD string)
+
+    Returns rows ordered by total, largest first.
+    """
+    if not account_ids:
+        return []
+    return conn.execute(*spending_query(CATEGORY_SPENDING_SQL, account_ids, since_date)).fetchall()
+
+
+def spending_since_month(conn, account_ids, month):
+    """Total spending from the start of ``month`` (a YYYY-MM string) onwards"""
+    if not account_ids:
+        return 0
+    row = conn.execute(*spending_query(MONTH_SPENDING_SQL, account_ids, month)).fetchone()
+    return row['total']
+
+
+def clamp_months(months):
+    """Bound a requested trend window to 1..MAX_TREND_MONTHS"""
+    return max(1, min(int(months), MAX_TREND_MONTHS))
+
+
+def expense_trends(conn, account_ids, months, by_category=False, today=None):
+    """Spending per calendar month for the last ``months`` months.
+
+    One query over the monthly rollup buckets covers the whole window;
+    months without spending are zero-filled. With ``by_category``
+    each month also carries a category -> total mapping that includes
+    every category seen in the window, so the result is a full
+    month x category matrix.
+
+    Returns (trends, categories).
+    """
+    today = today or date.today()
+    months = clamp_months(months)
+    first_month = add_months(today.replace(day=1), -(months - 1))
+    month_keys = [add_months(first_month, i).strftime('%Y-%m') for i in range(months)]
+
+    totals = {key: 0 for key in month_keys}
+    matrix = {key: {} for key in month_keys}
+    categories = []
+    if account_ids:
+        rows = conn.execute(*spending_query(MONTHLY_TRENDS_SQL, account_ids,
+                                            first_month.strftime('%Y-%m'))).fetchall()
+
+        seen = set()
+        for row in rows:
+            if row['month'] not in totals:
+                continue
+            totals[row['month']] += row['total']
+            if by_category:
+                matrix[row['month']][row['category']] = row['total']
+                seen.add(row['category'])
+        categories = sorted(seen)
+
+    trends = []
+    for key in month_keys:
+        entry = {
+            'month': key,
+            'total': round(totals[key], 2),
+            'month_name': datetime.strptime(key, '%Y-%m').strftime('%B %Y')
+        }
+        if by_category:
+            entry['categories'] = {category: round(matrix[key].get(category, 0), 2) for category in categories}
+        trends.append(entry)
+    return trends, categories
@@ -15,193 +15,535 @@ Website: https://rskworld.in
 Year: 2026
 """
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import (Flask, render_template, request, jsonify, session, g, has_app_context, has_request_context,
+                   Response, stream_with_context)
 from flask_session import Session
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
 from datetime import datetime, timedelta
 import sqlite3
+import csv
+import io
 import json
 import os
+import re
 import secrets
+import sys
+import threading
+import time
+import zlib
+import click
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from functools import wraps
+from database import ConnectionPool, SharedConnection
+from cache import ResponseCache
+from sessions import SESSION_BACKENDS, SqliteSessionInterface
+from passwords import HasherBusyError, PasswordHasher
+from migrations import apply_migrations, find_table_scans
+from intent_router import IntentRouter, StageTimer
+from budgets import evaluate_budgets
+from pagination import decode_cursor, page_size, paginate
+from search import search_transactions as search_index
+from queries import (ACCOUNT_BY_NUMBER_SQL, ACTIVE_RECURRING_SQL, CALENDAR_BILLS_SQL, CALENDAR_GOALS_SQL,
+                     CALENDAR_RECURRING_SQL, PENDING_BILLS_SQL, RECENT_TRANSACTIONS_SQL, STATEMENT_OPENING_BALANCE_SQL,
+                     STATEMENT_TOTALS_SQL, USER_ACCOUNT_IDS_SQL, USER_ACCOUNTS_SQL, USER_BUDGETS_SQL, USER_BY_ID_SQL,
+                     USER_BY_USERNAME_SQL, USER_EXISTS_SQL, USER_GOALS_SQL, USER_INVESTMENTS_SQL, alerts_sql,
+                     statement_page_sql, transactions_listing_sql)
+from scheduler import RecurringScheduler
+from debts import DebtInputError, load_user_debts, simulate_payoff
+from loans import Amortization, LoanInputError, grid_rows, loan_grid
+from writer import WriteQueue, WriteQueueBusyError, execute
+from ledger import InsufficientFundsError, LedgerError, WriteRetry, is_busy, pay_bill, transfer
+from currencies import BASE_CURRENCY, MAX_BATCH as CONVERT_MAX_BATCH, CurrencyError, ExchangeRates, RateFeedError
+from shards import (MAIN_DATABASE, ShardMoveError, assign_shard, lookup_shard, move_user, placement_counts,
+                    plan_rebalance, resume_moves, shard_path)
+from projections import ProjectionInputError, parameter_hash, run_projection, validate_projection
+from importer import IMPORT_FORMATS, ImportFormatError, detect_format, import_transactions
+from analytics import (clamp_months, expense_trends as monthly_expense_trends, rebuild_rollups,
+                       spending_by_category, spending_since_month, verify_rollups)
 
 app = Flask(__name__)
-app.config['SECRET_KEY'] = secrets.token_hex(16)
+app.config['SECRET_KEY'] = os.environ.get('FINANCE_BOT_SECRET_KEY') or secrets.token_hex(16)
+app.config['SESSION_BACKEND'] = os.environ.get('FINANCE_BOT_SESSION_BACKEND', 'filesystem')
 app.config['SESSION_TYPE'] = 'filesystem'
 app.config['SESSION_PERMANENT'] = False
-Session(app)
+app.config['DATABASE'] = os.environ.get('FINANCE_BOT_DB', 'finance_bot.db')
+app.config['DB_PRAGMA_PROFILE'] = os.environ.get('FINANCE_BOT_DB_PROFILE', 'default')
+app.config['DB_POOL_SIZE'] = int(os.environ.get('FINANCE_BOT_DB_POOL_SIZE', 16))
+app.config['DB_READ_POOL_SIZE'] = int(os.environ.get('FINANCE_BOT_DB_READ_POOL_SIZE', app.config['DB_POOL_SIZE']))
+app.config['DB_STATEMENT_CACHE_SIZE'] = 256
+app.config['SHARDS'] = int(os.environ.get('FINANCE_BOT_SHARDS', 0))
+app.config['PASSWORD_HASH_METHOD'] = os.environ.get('FINANCE_BOT_PASSWORD_HASH', 'scrypt')
+app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('FINANCE_BOT_PASSWORD_HASH_WORKERS', 2))
+app.config['PASSWORD_HASH_QUEUE'] = int(os.environ.get('FINANCE_BOT_PASSWORD_HASH_QUEUE', 64))
+app.config['BATCH_MAX_REQUESTS'] = int(os.environ.get('FINANCE_BOT_BATCH_MAX_REQUESTS', 20))
+app.config['RESPONSE_CACHE_SIZE'] = int(os.environ.get('FINANCE_BOT_CACHE_SIZE', 1024))
+app.config['RESPONSE_CACHE_TTL'] = float(os.environ.get('FINANCE_BOT_CACHE_TTL', 60))
+app.config['SCHEDULER_INTERVAL'] = float(os.environ.get('FINANCE_BOT_SCHEDULER_INTERVAL', 60))
+app.config['SCHEDULER_BATCH_SIZE'] = int(os.environ.get('FINANCE_BOT_SCHEDULER_BATCH_SIZE', 200))
+app.config['SIMULATION_WORKERS'] = int(os.environ.get('FINANCE_BOT_SIMULATION_WORKERS', min(4, os.cpu_count() or 1)))
+app.config['BUSY_RETRIES'] = int(os.environ.get('FINANCE_BOT_BUSY_RETRIES', 5))
+app.config['WRITE_QUEUE'] = os.environ.get('FINANCE_BOT_WRITE_QUEUE', '0') == '1'
+app.config['WRITE_BATCH_SIZE'] = int(os.environ.get('FINANCE_BOT_WRITE_BATCH_SIZE', 64))
+app.config['WRITE_WINDOW_MS'] = float(os.environ.get('FINANCE_BOT_WRITE_WINDOW_MS', 0))
+app.config['WRITE_TIMEOUT'] = 30
+app.config['FX_FEED'] = os.environ.get('FINANCE_BOT_FX_FEED', os.path.join(app.root_path, 'data', 'exchange_rates.csv'))
+app.config['FX_REFRESH_INTERVAL'] = float(os.environ.get('FINANCE_BOT_FX_REFRESH_INTERVAL', 30))
+app.config['REPORTING_CURRENCY'] = os.environ.get('FINANCE_BOT_REPORTING_CURRENCY', 'USD').upper()
+app.config['RESPONSE_CACHE_DISABLED'] = [name for name in os.environ.get('FINANCE_BOT_CACHE_DISABLED', '').split(',') if name]
+
+# Key derivation runs on its own bounded pool so login bursts cannot
+# take every core away from the other endpoints
+password_hasher = PasswordHasher(method=app.config['PASSWORD_HASH_METHOD'],
+                                 max_workers=app.config['PASSWORD_HASH_WORKERS'],
+                                 max_queue=app.config['PASSWORD_HASH_QUEUE'])
+
+# Computed read responses, keyed by user and that user's data version.
+# Every write path must call response_cache.bump(user_id) after commit.
+response_cache = ResponseCache(max_entries=app.config['RESPONSE_CACHE_SIZE'],
+                               ttl=app.config['RESPONSE_CACHE_TTL'],
+                               disabled=app.config['RESPONSE_CACHE_DISABLED'])
+
+# Transfers and bill payments: one BEGIN IMMEDIATE transaction each,
+# retried with jittered backoff while the database is locked
+ledger_writes = WriteRetry(attempts=app.config['BUSY_RETRIES'])
+
+_db_pool = None
+_db_pool_lock = threading.Lock()
+
+def get_db_pool():
+    """Return the process-wide connection pool, creating it on first use"""
+    global _db_pool
+    with _db_pool_lock:
+        if _db_pool is None:
+            _db_pool = ConnectionPool(app.config['DATABASE'],
+                                      profile=app.config['DB_PRAGMA_PROFILE'],
+                                      max_connections=app.config['DB_POOL_SIZE'],
+                                      cached_statements=app.config['DB_STATEMENT_CACHE_SIZE'])
+    return _db_pool
+
+_read_pool = None
+
+def get_read_pool():
+    """Return the read-only connection pool (the main pool when the split is off)"""
+    global _read_pool
+    if app.config['DB_READ_POOL_SIZE'] <= 0:
+        return get_db_pool()
+    with _db_pool_lock:
+        if _read_pool is None:
+            _read_pool = ConnectionPool(app.config['DATABASE'],
+                                        profile=app.config['DB_PRAGMA_PROFILE'],
+                                        max_connections=app.config['DB_READ_POOL_SIZE'],
+                                        cached_statements=app.config['DB_STATEMENT_CACHE_SIZE'],
+                                        read_only=True)
+    return _read_pool
+
+_shard_pools = {}
+
+def get_shard_pool(shard, access='write'):
+    """Return a shard's write or read-only pool; MAIN_DATABASE is the main database's"""
+    if shard == MAIN_DATABASE:
+        return get_read_pool() if access == 'read' else get_db_pool()
+    read = access == 'read' and app.config['DB_READ_POOL_SIZE'] > 0
+    with _db_pool_lock:
+        pool = _shard_pools.get((shard, read))
+        if pool is None:
+            pool = _shard_pools[(shard, read)] = ConnectionPool(
+                shard_path(app.config['DATABASE'], shard),
+                profile=app.config['DB_PRAGMA_PROFILE'],
+                max_connections=app.config['DB_READ_POOL_SIZE' if read else 'DB_POOL_SIZE'],
+                cached_statements=app.config['DB_STATEMENT_CACHE_SIZE'],
+                read_only=read)
+    return pool
+
+def all_databases():
+    """The main database followed by every configured shard"""
+    return [MAIN_DATABASE, *range(app.config['SHARDS'])]
+
+def user_shard(user_id):
+    """Shard holding ``user_id``'s data, looked up in the main database once per request"""
+    if not app.config['SHARDS'] or user_id is None:
+        return MAIN_DATABASE
+    placements = g.setdefault('user_shards', {}) if has_app_context() else {}
+    if user_id not in placements:
+        conn = get_read_pool().acquire()
+        try:
+            placements[user_id] = lookup_shard(conn, user_id)
+        finally:
+            conn.close()
+    return placements[user_id]
+
+def get_db_connection(access=None, user_id=None):
+    """Get a pooled database connection; close() returns it to the pool.
+
+    ``access`` is 'read' or 'write'; by default it is the current
+    request's mode set by :func:`read_only` or the chat intent, else
+    'write'. Reads get a read-only snapshot connection. With shards the
+    connection is to the database of ``user_id`` (by default the
+    session's user); without a user it is the main database.
+    """
+    if has_app_context() and g.get('shared_connection') is not None:
+        return g.shared_connection
+    if access is None:
+        access = g.get('db_access', 'write') if has_app_context() else 'write'
+    if user_id is None and app.config['SHARDS'] and has_request_context():
+        user_id = session.get('user_id')
+    conn = get_shard_pool(user_shard(user_id), access).acquire()
+    if has_app_context():
+        g.setdefault('db_connections', []).append((conn, conn.lease))
+    return conn
+
+def get_directory_connection(access='write'):
+    """Connection to the main database, home of users, sessions and exchange rates"""
+    if not app.config['SHARDS']:
+        return get_db_connection(access)
+    conn = get_shard_pool(MAIN_DATABASE, access).acquire()
+    if has_app_context():
+        g.setdefault('db_connections', []).append((conn, conn.lease))
+    return conn
+
+def begin_snapshot(conn):
+    """Start a read transaction so every query on ``conn`` sees the same snapshot.
+
+    Only for connections the view owns; a shared batch connection keeps
+    its own transaction. Releasing the connection ends the snapshot.
+    """
+    if g.get('shared_connection') is None and not conn.in_transaction:
+        conn.execute('BEGIN')
+    return conn
+
+def read_only(f):
+    """Decorator marking a view's GET requests as read-only, served from the read pool"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if request.method == 'GET':
+            g.db_access = 'read'
+        return f(*args, **kwargs)
+    return decorated_function
+
+_simulation_executor = None
+_simulation_executor_lock = threading.Lock()
+
+def get_simulation_executor():
+    """Return the process pool for large Monte Carlo runs (None when disabled)"""
+    global _simulation_executor
+    if app.config['SIMULATION_WORKERS'] <= 0:
+        return None
+    with _simulation_executor_lock:
+        if _simulation_executor is None:
+            # spawn, not fork: the server process is multi-threaded
+            _simulation_executor = ProcessPoolExecutor(app.config['SIMULATION_WORKERS'],
+                                                       mp_context=multiprocessing.get_context('spawn'))
+    return _simulation_executor
+
+@app.teardown_appcontext
+def release_db_connections(exc):
+    """Return any connection a handler forgot to close"""
+    for conn, lease in g.pop('db_connections', []):
+        conn.pool.release(conn, lease)
+
+# Session storage: 'filesystem' (flask_session pickle files), 'sqlite'
+# (sessions table) or 'cookie' (Flask's signed cookie with user_id and
+# username only; set FINANCE_BOT_SECRET_KEY so cookies survive restarts)
+if app.config['SESSION_BACKEND'] not in SESSION_BACKENDS:
+    raise ValueError(f"Unknown session backend: {app.config['SESSION_BACKEND']}")
+if app.config['SESSION_BACKEND'] == 'filesystem':
+    Session(app)
+elif app.config['SESSION_BACKEND'] == 'sqlite':
+    app.session_interface = SqliteSessionInterface(get_directory_connection)
+
+def bump_users(user_ids):
+    """Invalidate cached responses for users whose data a background job changed"""
+    for user_id in user_ids:
+        response_cache.bump(user_id)
+
+def database_connectors():
+    """One write-connection factory per database, the main one first"""
+    return [get_shard_pool(shard).acquire for shard in all_databases()]
+
+# Posts due recurring transactions and bills for every user. The server
+# entry points start it on a background thread; `flask run-scheduler`
+# runs it from cron or a dedicated worker instead.
+scheduler = RecurringScheduler(get_db_connection, interval=app.config['SCHEDULER_INTERVAL'],
+                               batch_size=app.config['SCHEDULER_BATCH_SIZE'], on_commit=bump_users,
+                               databases=database_connectors)
+
+# Dated exchange rates loaded from a local feed file. Totals in cached
+# responses depend on them, so a reload drops every cached response.
+# Uses its own pooled connection: a batch request may hold the shared one
+# in a transaction when the feed is reloaded.
+exchange_rates = ExchangeRates(lambda: get_db_pool().acquire(), feed_path=app.config['FX_FEED'],
+                               refresh_interval=app.config['FX_REFRESH_INTERVAL'],
+                               on_change=response_cache.clear)
+
+def convert_balances(accounts, currency, matrix=None):
+    """Total of account balances held in mixed currencies, as ``currency``"""
+    matrix = matrix or exchange_rates.matrix()
+    return matrix.total([acc['balance'] for acc in accounts], [acc['currency'] or BASE_CURRENCY for acc in accounts],
+                        currency)
+
+# Optional single writer for small writes (alerts, budgets, goals,
+# investments): handlers queue the write and wait for the group commit
+# that contains it, so many requests share one fsync. One writer per
+# database, since each has its own write lock.
+write_queues = {}
+_write_queues_lock = threading.Lock()
+
+def get_write_queue(shard):
+    """Return the write queue of a database, or None when the queue is off"""
+    if not app.config['WRITE_QUEUE']:
+        return None
+    with _write_queues_lock:
+        if shard not in write_queues:
+            write_queues[shard] = WriteQueue(get_shard_pool(shard).acquire, batch_size=app.config['WRITE_BATCH_SIZE'],
+                                             window=app.config['WRITE_WINDOW_MS'] / 1000)
+        return write_queues[shard]
+
+def apply_write(user_id, operation):
+    """Run ``operation(conn)`` as a committed write, through the write queue when enabled"""
+    write_queue = get_write_queue(user_shard(user_id))
+    # Batch calls share one connection and may be one transaction; keep them on it
+    if write_queue is None or g.get('shared_connection') is not None:
+        conn = get_db_connection(user_id=user_id)
+        result = operation(conn)
+        conn.commit()
+        conn.close()
+    else:
+        try:
+            result = write_queue.submit(operation).result(timeout=app.config['WRITE_TIMEOUT'])
+        except TimeoutError:
+            raise WriteQueueBusyError('Write not applied in time')
+    response_cache.bump(user_id)
+    return result
+
+def migrate_databases():
+    """Apply pending migrations to the main database and every shard; returns {shard: versions}"""
+    applied = {}
+    for shard in all_databases():
+        conn = get_shard_pool(shard).acquire()
+        try:
+            applied[shard] = apply_migrations(conn)
+        finally:
+            conn.close()
+    return applied
+
+def database_label(shard):
+    return 'main' if shard == MAIN_DATABASE else f'shard {shard}'
 
 # Database initialization
 def init_db():
     """Initialize database with required tables"""
-    conn = sqlite3.connect('finance_bot.db')
-    c = conn.cursor()
-    
-    # Users table
-    c.execute('''CREATE TABLE IF NOT EXISTS users
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  username TEXT UNIQUE NOT NULL,
-                  email TEXT UNIQUE NOT NULL,
-                  password TEXT NOT NULL,
-                  full_name TEXT,
-                  phone TEXT,
-                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-    
-    # Accounts table
-    c.execute('''CREATE TABLE IF NOT EXISTS accounts
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  user_id INTEGER NOT NULL,
-                  account_number TEXT UNIQUE NOT NULL,
-                  account_type TEXT NOT NULL,
-                  balance REAL DEFAULT 0.0,
-                  currency TEXT DEFAULT 'USD',
-                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                  FOREIGN KEY (user_id) REFERENCES users (id))''')
-    
-    # Transactions table
-    c.execute('''CREATE TABLE IF NOT EXISTS transactions
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  account_id INTEGER NOT NULL,
-                  transaction_type TEXT NOT NULL,
-                  amount REAL NOT NULL,
-                  description TEXT,
-                  category TEXT DEFAULT 'Other',
-                  balance_after REAL,
-                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                  FOREIGN KEY (account_id) REFERENCES accounts (id))''')
-    
-    # Bills table
-    c.execute('''CREATE TABLE IF NOT EXISTS bills
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  user_id INTEGER NOT NULL,
-                  bill_type TEXT NOT NULL,
-                  amount REAL NOT NULL,
-                  due_date DATE NOT NULL,
-                  status TEXT DEFAULT 'pending',
-                  paid_at TIMESTAMP,
-                  recurring INTEGER DEFAULT 0,
-                  FOREIGN KEY (user_id) REFERENCES users (id))''')
-    
-    # Budgets table
-    c.execute('''CREATE TABLE IF NOT EXISTS budgets
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  user_id INTEGER NOT NULL,
-                  category TEXT NOT NULL,
-                  budget_amount REAL NOT NULL,
-                  period TEXT DEFAULT 'monthly',
-                  start_date DATE NOT NULL,
-                  end_date DATE,
-                  FOREIGN KEY (user_id) REFERENCES users (id))''')
-    
-    # Savings goals table
-    c.execute('''CREATE TABLE IF NOT EXISTS savings_goals
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  user_id INTEGER NOT NULL,
-                  goal_name TEXT NOT NULL,
-                  target_amount REAL NOT NULL,
-                  current_amount REAL DEFAULT 0.0,
-                  target_date DATE,
-                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                  FOREIGN KEY (user_id) REFERENCES users (id))''')
-    
-    # Investment accounts table
-    c.execute('''CREATE TABLE IF NOT EXISTS investments
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  user_id INTEGER NOT NULL,
-                  investment_type TEXT NOT NULL,
-                  amount REAL NOT NULL,
-                  purchase_date DATE NOT NULL,
-                  current_value REAL,
-                  description TEXT,
-                  FOREIGN KEY (user_id) REFERENCES users (id))''')
-    
-    # Account alerts table
-    c.execute('''CREATE TABLE IF NOT EXISTS alerts
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  user_id INTEGER NOT NULL,
-                  alert_type TEXT NOT NULL,
-                  message TEXT NOT NULL,
-                  is_read INTEGER DEFAULT 0,
-                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                  FOREIGN KEY (user_id) REFERENCES users (id))''')
-    
-    # Loans table
-    c.execute('''CREATE TABLE IF NOT EXISTS loans
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  user_id INTEGER NOT NULL,
-                  loan_name TEXT NOT NULL,
-                  principal_amount REAL NOT NULL,
-                  interest_rate REAL NOT NULL,
-                  loan_term_months INTEGER NOT NULL,
-                  monthly_payment REAL,
-                  remaining_balance REAL,
-                  start_date DATE NOT NULL,
-                  status TEXT DEFAULT 'active',
-                  FOREIGN KEY (user_id) REFERENCES users (id))''')
-    
-    # Debts table
-    c.execute('''CREATE TABLE IF NOT EXISTS debts
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  user_id INTEGER NOT NULL,
-                  debt_name TEXT NOT NULL,
-                  total_amount REAL NOT NULL,
-                  current_balance REAL NOT NULL,
-                  interest_rate REAL DEFAULT 0.0,
-                  minimum_payment REAL DEFAULT 0.0,
-                  due_date INTEGER DEFAULT 1,
-                  FOREIGN KEY (user_id) REFERENCES users (id))''')
-    
-    # Recurring transactions table
-    c.execute('''CREATE TABLE IF NOT EXISTS recurring_transactions
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  user_id INTEGER NOT NULL,
-                  account_id INTEGER NOT NULL,
-                  description TEXT NOT NULL,
-                  amount REAL NOT NULL,
-                  transaction_type TEXT NOT NULL,
-                  category TEXT,
-                  frequency TEXT NOT NULL,
-                  next_date DATE NOT NULL,
-                  end_date DATE,
-                  is_active INTEGER DEFAULT 1,
-                  FOREIGN KEY (user_id) REFERENCES users (id),
-                  FOREIGN KEY (account_id) REFERENCES accounts (id))''')
-    
-    # Custom categories table
-    c.execute('''CREATE TABLE IF NOT EXISTS custom_categories
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  user_id INTEGER NOT NULL,
-                  category_name TEXT NOT NULL,
-                  parent_category TEXT,
-                  color TEXT,
-                  icon TEXT,
-                  FOREIGN KEY (user_id) REFERENCES users (id))''')
-    
-    # Transaction tags table
-    c.execute('''CREATE TABLE IF NOT EXISTS transaction_tags
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  transaction_id INTEGER NOT NULL,
-                  tag_name TEXT NOT NULL,
-                  FOREIGN KEY (transaction_id) REFERENCES transactions (id))''')
-    
-    conn.commit()
-    conn.close()
+    migrate_databases()
+    exchange_rates.refresh(force=True)
     
     # Create default admin user if not exists
     create_default_user()
 
+@app.cli.command('migrate')
+def migrate_command():
+    """Apply pending schema migrations to the main database and every shard"""
+    for shard, applied in migrate_databases().items():
+        label = database_label(shard)
+        click.echo(f'{label}: applied migrations {applied}' if applied else f'{label}: schema is up to date')
+
+@app.cli.command('check-query-plans')
+def check_query_plans_command():
+    """Fail if any hot endpoint query falls back to a full table scan"""
+    conn = get_db_connection()
+    apply_migrations(conn)
+    offenders = find_table_scans(conn)
+    conn.close()
+    for name, detail in offenders:
+        click.echo(f'{name}: {detail}', err=True)
+    if offenders:
+        raise SystemExit(1)
+    click.echo('All hot queries use an index')
+
+@app.cli.command('import-transactions')
+@click.argument('account_number')
+@click.argument('statement', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS), help='Defaults to the file extension')
+def import_transactions_command(account_number, statement, fmt):
+    """Bulk-import a bank statement file into an account"""
+    fmt = fmt or detect_format(statement) or 'csv'
+    migrate_databases()
+    for shard in all_databases():
+        conn = get_shard_pool(shard).acquire()
+        account = conn.execute('SELECT id, user_id FROM accounts WHERE account_number = ?',
+                               (account_number,)).fetchone()
+        # Skip a leftover copy from an interrupted shard move
+        if account and user_shard(account['user_id']) == shard:
+            break
+        conn.close()
+    else:
+        raise click.ClickException(f'Unknown account {account_number}')
+    started = time.perf_counter()
+    with open(statement, encoding='utf-8-sig', newline='') as lines:
+        try:
+            summary = import_transactions(conn, account['id'], lines, fmt)
+        except ImportFormatError as e:
+            conn.close()
+            raise click.ClickException(str(e))
+    conn.close()
+    response_cache.bump(account['user_id'])
+    for error in summary['errors']:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    click.echo(f"Imported {summary['imported']} transactions ({summary['duplicates']} duplicates, "
+               f"{summary['skipped']} skipped) in {time.perf_counter() - started:.2f}s; "
+               f"balance now {summary['balance']:.2f}")
+
+@app.cli.command('load-rates')
+@click.argument('feed', required=False, type=click.Path(exists=True, dir_okay=False))
+def load_rates_command(feed):
+    """Load an exchange-rate feed file (CSV or JSON) into the rates table"""
+    migrate_databases()
+    try:
+        count = exchange_rates.load_feed(feed or app.config['FX_FEED'])
+    except (OSError, RateFeedError) as e:
+        raise click.ClickException(str(e))
+    matrix = exchange_rates.matrix()
+    click.echo(f"Loaded {count} rates; {len(matrix.currencies)} currencies, newest as of {matrix.as_of}")
+
+@app.cli.command('run-scheduler')
+@click.option('--dry-run', is_flag=True, help='Report what is due without posting anything')
+@click.option('--as-of', type=click.DateTime(formats=['%Y-%m-%d']), help='Post everything due up to this date')
+@click.option('--loop', is_flag=True, help='Keep running every SCHEDULER_INTERVAL seconds')
+def run_scheduler_command(dry_run, as_of, loop):
+    """Post due recurring transactions and recurring bills"""
+    migrate_databases()
+    while True:
+        summary = scheduler.run(as_of=as_of.date() if as_of else None, dry_run=dry_run)
+        for plan in summary.pop('planned', []):
+            click.echo(f"would post {plan['source']} {plan['id']} on {plan['occurrence']}: "
+                       f"{plan['transaction_type']} {plan['amount']:.2f} {plan['description']}")
+        click.echo(json.dumps(summary))
+        if not loop or dry_run:
+            break
+        time.sleep(scheduler.interval or 60)
+
+@app.cli.command('verify-rollups')
+@click.option('--rebuild', is_flag=True, help='Recompute the rollups from the ledger first')
+def verify_rollups_command(rebuild):
+    """Check the spending rollups against the raw ledger in every database"""
+    drifted = False
+    for shard in all_databases():
+        conn = get_shard_pool(shard).acquire()
+        if rebuild:
+            rebuild_rollups(conn)
+            conn.commit()
+            click.echo(f'{database_label(shard)}: rollups rebuilt from the transactions table')
+        drift = verify_rollups(conn)
+        conn.close()
+        for row in drift:
+            click.echo(f"{database_label(shard)}: account {row['account_id']} {row['bucket_type']} {row['bucket']} "
+                       f"{row['category']}/{row['transaction_type']}: "
+                       f"ledger {row['expected_total']:.2f} ({row['expected_count']}) vs "
+                       f"rollup {row['actual_total']:.2f} ({row['actual_count']})", err=True)
+        drifted = drifted or bool(drift)
+    if drifted:
+        raise SystemExit(1)
+    click.echo('Rollups match the ledger')
+
+def move_users(moves):
+    """Move (user id, target shard) pairs, reporting each; returns the number moved"""
+    directory = get_db_pool().acquire()
+    moved = 0
+    try:
+        for user_id, target in moves:
+            started = time.perf_counter()
+            counts = move_user(directory, lambda shard: get_shard_pool(shard).acquire(), user_id, target)
+            if counts is None:
+                continue
+            moved += 1
+            response_cache.bump(user_id)
+            click.echo(f'user {user_id} -> {database_label(target)}: {sum(counts.values())} rows '
+                       f'in {time.perf_counter() - started:.2f}s')
+    finally:
+        directory.close()
+    return moved
+
+@app.cli.command('shard-status')
+def shard_status_command():
+    """Show how many users each database holds and any unfinished moves"""
+    migrate_databases()
+    conn = get_db_pool().acquire()
+    placements = placement_counts(conn)
+    pending = conn.execute('''SELECT COUNT(*) FROM user_shards
+                              WHERE moving_to IS NOT NULL OR moved_from IS NOT NULL''').fetchone()[0]
+    misplaced = len(plan_rebalance(conn, app.config['SHARDS']))
+    conn.close()
+    for shard in sorted(set(all_databases()) | set(placements)):
+        path = shard_path(app.config['DATABASE'], shard)
+        size = os.path.getsize(path) / 1e6 if os.path.exists(path) else 0.0
+        configured = '' if shard in all_databases() else ' (not configured)'
+        click.echo(f'{database_label(shard)}{configured}: {placements.get(shard, 0)} users, {size:.1f} MB, {path}')
+    click.echo(f"{app.config['SHARDS']} shards configured; {misplaced} users off their hashed shard, "
+               f'{pending} unfinished moves')
+
+@app.cli.command('shard-rebalance')
+@click.option('--dry-run', is_flag=True, help='List the moves without making them')
+@click.option('--limit', type=int, help='Move at most this many users')
+def shard_rebalance_command(dry_run, limit):
+    """Move every user to its hashed shard (with FINANCE_BOT_SHARDS=0, back to the main database)"""
+    migrate_databases()
+    directory = get_db_pool().acquire()
+    try:
+        if not dry_run:
+            resumed = resume_moves(directory, lambda shard: get_shard_pool(shard).acquire())
+            for user_id in resumed:
+                response_cache.bump(user_id)
+            if resumed:
+                click.echo(f'Finished {len(resumed)} interrupted moves')
+        plan = plan_rebalance(directory, app.config['SHARDS'])[:limit]
+    finally:
+        directory.close()
+    if dry_run:
+        for user_id, current, target in plan:
+            click.echo(f'user {user_id}: {database_label(current)} -> {database_label(target)}')
+        click.echo(f'{len(plan)} users would move')
+        return
+    started = time.perf_counter()
+    moved = move_users([(user_id, target) for user_id, _, target in plan])
+    click.echo(f'Moved {moved} users in {time.perf_counter() - started:.2f}s')
+
+@app.cli.command('shard-move')
+@click.argument('user_id', type=int)
+@click.argument('shard')
+def shard_move_command(user_id, shard):
+    """Move one user to SHARD, a shard number or 'main'"""
+    try:
+        target = MAIN_DATABASE if shard == 'main' else int(shard)
+    except ValueError:
+        raise click.ClickException("SHARD must be a shard number or 'main'")
+    if target != MAIN_DATABASE and not 0 <= target < app.config['SHARDS']:
+        raise click.ClickException(f"Shard {target} is not configured (FINANCE_BOT_SHARDS={app.config['SHARDS']})")
+    migrate_databases()
+    try:
+        moved = move_users([(user_id, target)])
+    except ShardMoveError as e:
+        raise click.ClickException(str(e))
+    if not moved:
+        click.echo(f'User {user_id} is already in {database_label(target)}')
+
 def create_default_user():
     """Create default user for demo purposes"""
-    conn = sqlite3.connect('finance_bot.db')
+    conn = get_directory_connection()
     c = conn.cursor()
     
     # Check if admin exists
     c.execute("SELECT id FROM users WHERE username = ?", ('demo',))
     if not c.fetchone():
-        hashed_password = generate_password_hash('demo123')
+        hashed_password = password_hasher.hash('demo123')
         c.execute("INSERT INTO users (username, email, password, full_name, phone) VALUES (?, ?, ?, ?, ?)",
                   ('demo', 'demo@rskworld.in', hashed_password, 'Demo User', '+91 93305 39277'))
         user_id = c.lastrowid
+        if assign_shard(conn, user_id, app.config['SHARDS']) != MAIN_DATABASE:
+            # The user's rows go to their shard
+            conn.commit()
+            conn.close()
+            conn = get_db_connection(user_id=user_id)
+            c = conn.cursor()
         
         # Create sample accounts
         c.execute("INSERT INTO accounts (user_id, account_number, account_type, balance, currency) VALUES (?, ?, ?, ?, ?)",
@@ -276,17 +618,47 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-def get_db_connection():
-    """Get database connection"""
-    conn = sqlite3.connect('finance_bot.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+def cached_view(endpoint, args=()):
+    """Decorator caching a view's 200 responses per user and query args"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*view_args, **view_kwargs):
+            key = tuple((name, request.args.get(name, '').strip()) for name in args)
+            rendered = []
+            
+            def render():
+                resp = app.make_response(f(*view_args, **view_kwargs))
+                rendered.append(resp)
+                if resp.status_code != 200:
+                    return None
+                return resp.get_data(), resp.mimetype
+            
+            # A rate reload clears the cache, so pick it up before looking
+            exchange_rates.refresh()
+            cached = response_cache.get_or_compute(session['user_id'], endpoint, key, render)
+            if cached is None:
+                return rendered[0]
+            resp = Response(cached[0], mimetype=cached[1])
+            resp.headers['X-Cache'] = 'MISS' if rendered else 'HIT'
+            return resp
+        return decorated_function
+    return decorator
 
 @app.route('/')
 def index():
     """Main page"""
     return render_template('index.html')
 
+def busy_response():
+    """503 returned when the password hashing or write queue is full, or the database stays locked"""
+    resp = jsonify({'success': False, 'message': 'Server busy, please retry shortly'})
+    resp.headers['Retry-After'] = '1'
+    return resp, 503
+
+@app.errorhandler(WriteQueueBusyError)
+def write_queue_busy(e):
+    return busy_response()
+
 @app.route('/api/login', methods=['POST'])
 def login():
     """User login endpoint"""
@@ -294,11 +666,24 @@ def login():
     username = data.get('username')
     password = data.get('password')
     
-    conn = get_db_connection()
-    user = conn.execute('SELECT * FROM users WHERE username = ?', (username,)).fetchone()
+    conn = get_directory_connection()
+    user = conn.execute(USER_BY_USERNAME_SQL, (username,)).fetchone()
     conn.close()
     
-    if user and check_password_hash(user['password'], password):
+    valid = False
+    if user and password:
+        try:
+            valid, upgraded_hash = password_hasher.verify_and_upgrade(user['password'], password)
+        except HasherBusyError:
+            return busy_response()
+        if upgraded_hash:
+            conn = get_directory_connection()
+            conn.execute('UPDATE users SET password = ? WHERE id = ? AND password = ?',
+                         (upgraded_hash, user['id'], user['password']))
+            conn.commit()
+            conn.close()
+    
+    if valid:
         session['user_id'] = user['id']
         session['username'] = user['username']
         return jsonify({'success': True, 'message': 'Login successful', 'user': {
@@ -328,21 +713,36 @@ def register():
     if not username or not email or not password:
         return jsonify({'success': False, 'message': 'Missing required fields'}), 400
     
-    conn = get_db_connection()
+    # Hash before taking a connection, so a burst of registrations waiting
+    # on the hasher does not hold pooled connections
+    try:
+        hashed_password = password_hasher.hash(password)
+    except HasherBusyError:
+        return busy_response()
+    
+    conn = get_directory_connection()
     
     # Check if user exists
-    existing = conn.execute('SELECT id FROM users WHERE username = ? OR email = ?', 
+    existing = conn.execute(USER_EXISTS_SQL, 
                           (username, email)).fetchone()
     if existing:
         conn.close()
         return jsonify({'success': False, 'message': 'Username or email already exists'}), 400
     
-    # Create user
-    hashed_password = generate_password_hash(password)
+    # Create user; the unique constraints catch a registration that raced the check
     c = conn.cursor()
-    c.execute('INSERT INTO users (username, email, password, full_name, phone) VALUES (?, ?, ?, ?, ?)',
-                (username, email, hashed_password, full_name, phone))
+    try:
+        c.execute('INSERT INTO users (username, email, password, full_name, phone) VALUES (?, ?, ?, ?, ?)',
+                    (username, email, hashed_password, full_name, phone))
+    except sqlite3.IntegrityError:
+        conn.rollback()
+        conn.close()
+        return jsonify({'success': False, 'message': 'Username or email already exists'}), 400
     user_id = c.lastrowid
+    if assign_shard(conn, user_id, app.config['SHARDS']) != MAIN_DATABASE:
+        conn.commit()
+        conn.close()
+        conn = get_db_connection(user_id=user_id)
     
     # Create default account
     account_number = f'ACC{secrets.token_hex(6).upper()}'
@@ -363,481 +763,477 @@ def chat():
     user_id = session['user_id']
     
     response = process_chat_message(message, user_id)
-    return jsonify({'response': response})
+    resp = jsonify({'response': response})
+    timings = g.pop('chat_timings', None)
+    if timings:
+        resp.headers['Server-Timing'] = ', '.join(f'{stage};dur={elapsed * 1000:.3f}'
+                                                  for stage, elapsed in timings)
+    return resp
+
+# Chat intents are matched in one pass; lower priority values win, which
+# keeps the precedence of the original if/elif chain. Only handlers that
+# need data open a database connection.
+chat_router = IntentRouter()
+latency = StageTimer()
+
+# Read-only chat replies served through response_cache
+CACHED_CHAT_INTENTS = {'spending', 'report', 'trends', 'calendar'}
 
 def process_chat_message(message, user_id):
     """Process chat message and return appropriate response"""
+    started = time.perf_counter()
+    intent = chat_router.route(message)
+    routed = time.perf_counter()
+    handler = chat_router.handler(intent)
+    g.db_access = chat_router.access(intent)
+    if intent in CACHED_CHAT_INTENTS:
+        exchange_rates.refresh()
+        response = response_cache.get_or_compute(user_id, f'chat.{intent}', message,
+                                                 lambda: handler(message, user_id))
+    else:
+        response = handler(message, user_id)
+    finished = time.perf_counter()
+    
+    latency.record('chat.route', routed - started)
+    latency.record(f'chat.handler.{intent or "help"}', finished - routed)
+    if has_app_context():
+        g.chat_timings = [('route', routed - started), ('handler', finished - routed)]
+    return response
+
+@chat_router.intent('all_accounts', priority=10, keywords=['all accounts', 'list accounts', 'show accounts'], access='read')
+def chat_all_accounts(message, user_id):
+    """Multiple accounts inquiry"""
     conn = get_db_connection()
-    
-    # Multiple accounts inquiry
-    if any(word in message for word in ['all accounts', 'list accounts', 'show accounts']):
-        accounts = conn.execute('SELECT * FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
-        if accounts:
-            response = "Your accounts:\n"
-            total = 0
+    accounts = conn.execute(USER_ACCOUNTS_SQL, (user_id,)).fetchall()
+    conn.close()
+    if accounts:
+        response = "Your accounts:\n"
+        for acc in accounts:
+            response += f"\n{acc['account_number']} ({acc['account_type']}): ${acc['balance']:.2f} {acc['currency']}"
+        currency = app.config['REPORTING_CURRENCY']
+        try:
+            response += f"\n\nTotal Balance: ${convert_balances(accounts, currency):.2f} {currency}"
+        except CurrencyError as e:
+            response += f"\n\nTotal Balance unavailable: {e}"
+        return response
+    else:
+        return "No accounts found. Please contact support."
+
+@chat_router.intent('balance', priority=20, keywords=['balance', 'account balance', 'my balance', 'check balance'], access='read')
+def chat_balance(message, user_id):
+    """Account balance inquiry"""
+    conn = get_db_connection()
+    accounts = conn.execute(USER_ACCOUNTS_SQL, (user_id,)).fetchall()
+    conn.close()
+    if accounts:
+        if len(accounts) == 1:
+            acc = accounts[0]
+            response = f"Your account balance is ${acc['balance']:.2f} {acc['currency']}. Account: {acc['account_number']}"
+        else:
+            response = "You have multiple accounts. Here are your balances:\n"
             for acc in accounts:
                 response += f"\n{acc['account_number']} ({acc['account_type']}): ${acc['balance']:.2f} {acc['currency']}"
-                total += acc['balance']
-            response += f"\n\nTotal Balance: ${total:.2f}"
-            conn.close()
-            return response
-        else:
-            conn.close()
-            return "No accounts found. Please contact support."
-    
-    # Account inquiry
-    elif any(word in message for word in ['balance', 'account balance', 'my balance', 'check balance']):
-        accounts = conn.execute('SELECT * FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
-        if accounts:
-            if len(accounts) == 1:
-                acc = accounts[0]
-                response = f"Your account balance is ${acc['balance']:.2f} {acc['currency']}. Account: {acc['account_number']}"
-            else:
-                response = "You have multiple accounts. Here are your balances:\n"
-                for acc in accounts:
-                    response += f"\n{acc['account_number']} ({acc['account_type']}): ${acc['balance']:.2f}"
-            conn.close()
-            return response
-        else:
-            conn.close()
-            return "No account found. Please contact support."
-    
-    # Transaction history
-    elif any(word in message for word in ['transaction', 'history', 'statement', 'transactions']):
-        account = conn.execute('SELECT id FROM accounts WHERE user_id = ?', (user_id,)).fetchone()
-        if account:
-            transactions = conn.execute(
-                'SELECT * FROM transactions WHERE account_id = ? ORDER BY created_at DESC LIMIT 10',
-                (account['id'],)).fetchall()
-            
-            if transactions:
-                response = "Recent transactions:\n"
-                for trans in transactions:
-                    date = datetime.strptime(trans['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%b %d, %Y')
-                    response += f"\n{date}: {trans['transaction_type'].upper()} - ${trans['amount']:.2f} - {trans['description']}"
-                return response
-            else:
-                return "No transactions found."
-        else:
-            return "No account found."
+            currency = app.config['REPORTING_CURRENCY']
+            try:
+                response += f"\n\nTotal: ${convert_balances(accounts, currency):.2f} {currency}"
+            except CurrencyError as e:
+                response += f"\n\nTotal unavailable: {e}"
+        return response
+    else:
+        return "No account found. Please contact support."
+
+@chat_router.intent('transaction_history', priority=30, keywords=['transaction', 'history', 'statement', 'transactions'], access='read')
+def chat_transaction_history(message, user_id):
+    """Recent transaction history"""
+    conn = get_db_connection()
+    account = conn.execute(USER_ACCOUNT_IDS_SQL, (user_id,)).fetchone()
+    if not account:
+        conn.close()
+        return "No account found."
     
-    # Bill payments
-    elif any(word in message for word in ['bill', 'bills', 'pay bill', 'due']):
-        bills = conn.execute(
-            'SELECT * FROM bills WHERE user_id = ? AND status = ? ORDER BY due_date',
-            (user_id, 'pending')).fetchall()
-        
-        if bills:
-            response = "Pending bills:\n"
-            for bill in bills:
-                due_date = datetime.strptime(bill['due_date'], '%Y-%m-%d').strftime('%b %d, %Y')
-                response += f"\n{bill['bill_type']}: ${bill['amount']:.2f} - Due: {due_date}"
-            return response
-        else:
-            return "No pending bills found."
-    
-    # Pay bill
-    elif any(word in message for word in ['pay', 'payment', 'make payment']):
-        if 'electricity' in message:
-            bill_type = 'Electricity'
-        elif 'internet' in message:
-            bill_type = 'Internet'
-        elif 'credit card' in message or 'credit' in message:
-            bill_type = 'Credit Card'
-        else:
-            return "Please specify which bill you want to pay (Electricity, Internet, or Credit Card)."
-        
-        bill = conn.execute(
-            'SELECT * FROM bills WHERE user_id = ? AND bill_type = ? AND status = ?',
-            (user_id, bill_type, 'pending')).fetchone()
-        
-        if bill:
-            account = conn.execute('SELECT * FROM accounts WHERE user_id = ?', (user_id,)).fetchone()
-            if account['balance'] >= bill['amount']:
-                # Update account balance
-                new_balance = account['balance'] - bill['amount']
-                conn.execute('UPDATE accounts SET balance = ? WHERE id = ?', 
-                           (new_balance, account['id']))
-                
-                # Record transaction
-                conn.execute('INSERT INTO transactions (account_id, transaction_type, amount, description, category, balance_after) VALUES (?, ?, ?, ?, ?, ?)',
-                           (account['id'], 'payment', bill['amount'], f'{bill_type} bill payment', 'Utilities', new_balance))
-                
-                # Update bill status
-                conn.execute('UPDATE bills SET status = ?, paid_at = ? WHERE id = ?',
-                           ('paid', datetime.now().strftime('%Y-%m-%d %H:%M:%S'), bill['id']))
-                
-                conn.commit()
-                conn.close()
-                return f"Payment of ${bill['amount']:.2f} for {bill_type} bill completed successfully. New balance: ${new_balance:.2f}"
-            else:
-                conn.close()
-                return f"Insufficient balance. Required: ${bill['amount']:.2f}, Available: ${account['balance']:.2f}"
-        else:
-            conn.close()
-            return f"No pending {bill_type} bill found."
+    transactions = conn.execute(
+        RECENT_TRANSACTIONS_SQL,
+        (account['id'],)).fetchall()
+    conn.close()
     
-    # Financial advice
-    elif any(word in message for word in ['advice', 'saving', 'invest', 'financial', 'tips']):
-        advice = get_financial_advice(message)
-        conn.close()
-        return advice
+    if transactions:
+        response = "Recent transactions:\n"
+        for trans in transactions:
+            date = datetime.strptime(trans['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%b %d, %Y')
+            response += f"\n{date}: {trans['transaction_type'].upper()} - ${trans['amount']:.2f} - {trans['description']}"
+        return response
+    else:
+        return "No transactions found."
+
+@chat_router.intent('bills', priority=40, keywords=['bill', 'bills', 'pay bill', 'due'], access='read')
+def chat_bills(message, user_id):
+    """Pending bills"""
+    conn = get_db_connection()
+    bills = conn.execute(
+        PENDING_BILLS_SQL,
+        (user_id, 'pending')).fetchall()
+    conn.close()
+    
+    if bills:
+        response = "Pending bills:\n"
+        for bill in bills:
+            due_date = datetime.strptime(bill['due_date'], '%Y-%m-%d').strftime('%b %d, %Y')
+            response += f"\n{bill['bill_type']}: ${bill['amount']:.2f} - Due: {due_date}"
+        return response
+    else:
+        return "No pending bills found."
+
+@chat_router.intent('pay_bill', priority=50, keywords=['pay', 'payment', 'make payment'], access='write')
+def chat_pay_bill(message, user_id):
+    """Pay a pending bill from the first account"""
+    if 'electricity' in message:
+        bill_type = 'Electricity'
+    elif 'internet' in message:
+        bill_type = 'Internet'
+    elif 'credit card' in message or 'credit' in message:
+        bill_type = 'Credit Card'
+    else:
+        return "Please specify which bill you want to pay (Electricity, Internet, or Credit Card)."
     
-    # Transfer funds
-    elif any(word in message for word in ['transfer', 'send money', 'move money']):
-        # This would typically require more structured input, but for demo:
+    conn = get_db_connection()
+    try:
+        paid = ledger_writes.run(conn, lambda conn: pay_bill(conn, user_id, bill_type))
+    except InsufficientFundsError as e:
+        return f"Insufficient balance. Required: ${e.required:.2f}, Available: ${e.available:.2f}"
+    except LedgerError as e:
+        return e.message
+    except sqlite3.OperationalError as e:
+        if not is_busy(e):
+            raise
+        return "The bank is busy right now. Please try the payment again in a moment."
+    finally:
         conn.close()
-        return "To transfer funds, please use the transfer feature in your dashboard or specify: 'Transfer $X from ACCOUNT1 to ACCOUNT2'"
-    
-    # Budget tracking
-    elif any(word in message for word in ['budget', 'budgets', 'my budget', 'budget status']):
-        budgets = conn.execute('SELECT * FROM budgets WHERE user_id = ?', (user_id,)).fetchall()
-        if budgets:
-            response = "Your budgets:\n"
-            # Get spending for each budget category
-            accounts = conn.execute('SELECT id FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
-            account_ids = [acc['id'] for acc in accounts]
-            month_start = datetime.now().replace(day=1).strftime('%Y-%m-%d')
-            
-            for budget in budgets:
-                if account_ids:
-                    placeholders = ','.join('?' * len(account_ids))
-                    spent = conn.execute(f'''
-                        SELECT COALESCE(SUM(amount), 0) as total FROM transactions 
-                        WHERE account_id IN ({placeholders}) 
-                        AND category = ? AND transaction_type IN ('payment', 'withdrawal')
-                        AND created_at >= ?
-                    ''', account_ids + [budget['category'], month_start]).fetchone()
-                    spent_amount = spent['total']
-                    remaining = budget['budget_amount'] - spent_amount
-                    percentage = (spent_amount / budget['budget_amount'] * 100) if budget['budget_amount'] > 0 else 0
-                    status = "✅ Under budget" if remaining >= 0 else "⚠️ Over budget"
-                    response += f"\n{budget['category']}: ${spent_amount:.2f} / ${budget['budget_amount']:.2f} ({percentage:.1f}%) - {status}"
-                else:
-                    response += f"\n{budget['category']}: $0.00 / ${budget['budget_amount']:.2f} - No transactions"
-            conn.close()
-            return response
-        else:
-            conn.close()
-            return "No budgets set. You can create budgets for different categories like Food, Utilities, Entertainment, etc."
-    
-    # Savings goals
-    elif any(word in message for word in ['goal', 'goals', 'savings goal', 'my goals']):
-        goals = conn.execute('SELECT * FROM savings_goals WHERE user_id = ?', (user_id,)).fetchall()
-        if goals:
-            response = "Your savings goals:\n"
-            for goal in goals:
-                progress = (goal['current_amount'] / goal['target_amount'] * 100) if goal['target_amount'] > 0 else 0
-                response += f"\n{goal['goal_name']}: ${goal['current_amount']:.2f} / ${goal['target_amount']:.2f} ({progress:.1f}%)\n"
-                if goal['target_date']:
-                    target = datetime.strptime(goal['target_date'], '%Y-%m-%d')
-                    days_left = (target - datetime.now()).days
-                    response += f"  Target date: {target.strftime('%b %d, %Y')} ({days_left} days remaining)\n"
+    response_cache.bump(user_id)
+    return f"Payment of ${paid['amount']:.2f} for {bill_type} bill completed successfully. New balance: ${paid['balance']:.2f}"
+
+@chat_router.intent('advice', priority=60, keywords=['advice', 'saving', 'invest', 'financial', 'tips'], access='read')
+def chat_advice(message, user_id):
+    """Financial advice"""
+    return get_financial_advice(message)
+
+@chat_router.intent('transfer', priority=70, keywords=['transfer', 'send money', 'move money'], access='read')
+def chat_transfer(message, user_id):
+    """Transfer funds help"""
+    # This would typically require more structured input, but for demo:
+    return "To transfer funds, please use the transfer feature in your dashboard or specify: 'Transfer $X from ACCOUNT1 to ACCOUNT2'"
+
+@chat_router.intent('budget', priority=80, keywords=['budget', 'budgets', 'my budget', 'budget status'], access='read')
+def chat_budget(message, user_id):
+    """Budget tracking"""
+    conn = get_db_connection()
+    budgets = evaluate_budgets(conn, user_id)
+    conn.close()
+    if budgets:
+        response = "Your budgets:\n"
+        for budget in budgets:
+            status = "⚠️ Over budget" if budget['over_budget'] else "✅ Under budget"
+            response += f"\n{budget['category']} ({budget['period']}): ${budget['spent']:.2f} / ${budget['budget_amount']:.2f} ({budget['percent']:.1f}%) - {status}"
+        return response
+    else:
+        return "No budgets set. You can create budgets for different categories like Food, Utilities, Entertainment, etc."
+
+@chat_router.intent('goals', priority=90, keywords=['goal', 'goals', 'savings goal', 'my goals'], access='read')
+def chat_goals(message, user_id):
+    """Savings goals"""
+    conn = get_db_connection()
+    goals = conn.execute(USER_GOALS_SQL, (user_id,)).fetchall()
+    conn.close()
+    if goals:
+        response = "Your savings goals:\n"
+        for goal in goals:
+            progress = (goal['current_amount'] / goal['target_amount'] * 100) if goal['target_amount'] > 0 else 0
+            response += f"\n{goal['goal_name']}: ${goal['current_amount']:.2f} / ${goal['target_amount']:.2f} ({progress:.1f}%)\n"
+            if goal['target_date']:
+                target = datetime.strptime(goal['target_date'], '%Y-%m-%d')
+                days_left = (target - datetime.now()).days
+                response += f"  Target date: {target.strftime('%b %d, %Y')} ({days_left} days remaining)\n"
+        return response
+    else:
+        return "No savings goals set. I can help you create goals like 'Emergency Fund', 'Vacation', etc."
+
+@chat_router.intent('investments', priority=100, keywords=['investment', 'investments', 'portfolio', 'my investments'], access='read')
+def chat_investments(message, user_id):
+    """Investment portfolio"""
+    conn = get_db_connection()
+    investments = conn.execute(USER_INVESTMENTS_SQL, (user_id,)).fetchall()
+    conn.close()
+    if investments:
+        response = "Your investments:\n"
+        total_invested = 0
+        total_current = 0
+        for inv in investments:
+            total_invested += inv['amount']
+            current_val = inv['current_value'] if inv['current_value'] is not None else inv['amount']
+            total_current += current_val
+            gain_loss = current_val - inv['amount']
+            gain_percent = ((current_val - inv['amount']) / inv['amount'] * 100) if inv['amount'] > 0 else 0
+            sign = "+" if gain_loss >= 0 else ""
+            response += f"\n{inv['investment_type']}: ${inv['amount']:.2f} → ${current_val:.2f} ({sign}{gain_percent:.2f}%)"
+            if inv['description']:
+                response += f"\n  {inv['description']}"
+        
+        total_gain = total_current - total_invested
+        total_percent = ((total_current - total_invested) / total_invested * 100) if total_invested > 0 else 0
+        sign = "+" if total_gain >= 0 else ""
+        response += f"\n\nTotal: ${total_invested:.2f} → ${total_current:.2f} ({sign}{total_percent:.2f}%)"
+        return response
+    else:
+        return "No investments found. You can track stocks, bonds, mutual funds, and other investments here."
+
+@chat_router.intent('spending', priority=110, keywords=['spending', 'spending analysis', 'expenses', 'where did my money go'], access='read')
+def chat_spending(message, user_id):
+    """Spending analysis for the current month"""
+    conn = get_db_connection()
+    accounts = conn.execute(USER_ACCOUNT_IDS_SQL, (user_id,)).fetchall()
+    account_ids = [acc['id'] for acc in accounts]
+    
+    if account_ids:
+        month_start = datetime.now().replace(day=1).strftime('%Y-%m-%d')
+        transactions = spending_by_category(conn, account_ids, month_start)
+        
+        if transactions:
+            response = "Your spending this month by category:\n"
+            total = sum(t['total'] for t in transactions)
+            for trans in transactions:
+                percentage = (trans['total'] / total * 100) if total > 0 else 0
+                response += f"\n{trans['category']}: ${trans['total']:.2f} ({percentage:.1f}%)"
+            response += f"\n\nTotal spent: ${total:.2f}"
             conn.close()
             return response
-        else:
-            conn.close()
-            return "No savings goals set. I can help you create goals like 'Emergency Fund', 'Vacation', etc."
-    
-    # Investments
-    elif any(word in message for word in ['investment', 'investments', 'portfolio', 'my investments']):
-        investments = conn.execute('SELECT * FROM investments WHERE user_id = ?', (user_id,)).fetchall()
-        if investments:
-            response = "Your investments:\n"
-            total_invested = 0
-            total_current = 0
-            for inv in investments:
-                total_invested += inv['amount']
-                current_val = inv.get('current_value', inv['amount'])
-                total_current += current_val
-                gain_loss = current_val - inv['amount']
-                gain_percent = ((current_val - inv['amount']) / inv['amount'] * 100) if inv['amount'] > 0 else 0
-                sign = "+" if gain_loss >= 0 else ""
-                response += f"\n{inv['investment_type']}: ${inv['amount']:.2f} → ${current_val:.2f} ({sign}{gain_percent:.2f}%)"
-                if inv['description']:
-                    response += f"\n  {inv['description']}"
-            
-            total_gain = total_current - total_invested
-            total_percent = ((total_current - total_invested) / total_invested * 100) if total_invested > 0 else 0
-            sign = "+" if total_gain >= 0 else ""
-            response += f"\n\nTotal: ${total_invested:.2f} → ${total_current:.2f} ({sign}{total_percent:.2f}%)"
+    
+    conn.close()
+    return "No spending data found for this month."
+
+@chat_router.intent('report', priority=120, keywords=['report', 'financial report', 'summary', 'financial summary'], access='read')
+def chat_report(message, user_id):
+    """Financial report"""
+    conn = get_db_connection()
+    accounts = conn.execute(USER_ACCOUNTS_SQL, (user_id,)).fetchall()
+    
+    investments = conn.execute('SELECT SUM(current_value) as total FROM investments WHERE user_id = ?', (user_id,)).fetchone()
+    
+    account_ids = [acc['id'] for acc in accounts]
+    monthly_spending = spending_since_month(conn, account_ids, datetime.now().strftime('%Y-%m'))
+    
+    goals = conn.execute(USER_GOALS_SQL, (user_id,)).fetchall()
+    conn.close()
+    
+    # Investments carry no currency and are valued in US dollars
+    currency = app.config['REPORTING_CURRENCY']
+    matrix = exchange_rates.matrix()
+    try:
+        total_balance = convert_balances(accounts, currency, matrix)
+        total_investments = (investments['total'] or 0) * matrix.rate(BASE_CURRENCY, currency)
+    except CurrencyError as e:
+        return f"I can't total your accounts right now: {e}"
+    
+    response = "📊 Financial Report\n"
+    response += f"\nTotal Balance: ${total_balance:.2f} {currency}"
+    response += f"\nTotal Investments: ${total_investments:.2f} {currency}"
+    response += f"\nNet Worth: ${total_balance + total_investments:.2f} {currency}"
+    response += f"\nMonthly Spending: ${monthly_spending:.2f}"
+    response += f"\nActive Accounts: {len(accounts)}"
+    response += f"\nSavings Goals: {len(goals)}"
+    return response
+
+@chat_router.intent('categories', priority=130, keywords=['category', 'categories', 'spending by category'], access='read')
+def chat_categories(message, user_id):
+    """Transaction categories"""
+    conn = get_db_connection()
+    accounts = conn.execute(USER_ACCOUNT_IDS_SQL, (user_id,)).fetchall()
+    account_ids = [acc['id'] for acc in accounts]
+    
+    if account_ids:
+        placeholders = ','.join('?' * len(account_ids))
+        categories = conn.execute(f'''
+            SELECT DISTINCT category 
+            FROM transactions 
+            WHERE account_id IN ({placeholders}) 
+            AND category IS NOT NULL
+        ''', account_ids).fetchall()
+        
+        if categories:
+            response = "Transaction categories:\n"
+            for cat in categories:
+                response += f"\n• {cat['category']}"
             conn.close()
             return response
-        else:
-            conn.close()
-            return "No investments found. You can track stocks, bonds, mutual funds, and other investments here."
     
-    # Spending analysis
-    elif any(word in message for word in ['spending', 'spending analysis', 'expenses', 'where did my money go']):
-        accounts = conn.execute('SELECT id FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
-        account_ids = [acc['id'] for acc in accounts]
-        
-        if account_ids:
-            month_start = datetime.now().replace(day=1).strftime('%Y-%m-%d')
-            placeholders = ','.join('?' * len(account_ids))
-            transactions = conn.execute(f'''
-                SELECT category, SUM(amount) as total 
-                FROM transactions 
-                WHERE account_id IN ({placeholders}) 
-                AND transaction_type IN ('payment', 'withdrawal')
-                AND created_at >= ?
-                GROUP BY category
-                ORDER BY total DESC
-            ''', account_ids + [month_start]).fetchall()
-            
-            if transactions:
-                response = "Your spending this month by category:\n"
-                total = sum(t['total'] for t in transactions)
-                for trans in transactions:
-                    percentage = (trans['total'] / total * 100) if total > 0 else 0
-                    response += f"\n{trans['category']}: ${trans['total']:.2f} ({percentage:.1f}%)"
-                response += f"\n\nTotal spent: ${total:.2f}"
-                conn.close()
-                return response
+    conn.close()
+    return "No transaction categories found."
+
+@chat_router.intent('account_details', priority=140, keywords=['account', 'details', 'info', 'information'], access='read')
+def chat_account_details(message, user_id):
+    """Account details"""
+    conn = get_db_connection()
+    accounts = conn.execute(USER_ACCOUNTS_SQL, (user_id,)).fetchall()
+    conn.close()
+    conn = get_directory_connection('read')
+    user = conn.execute(USER_BY_ID_SQL, (user_id,)).fetchone()
+    conn.close()
+    
+    if accounts and user:
+        response = f"Account Details for {user['full_name'] or user['username']}:\n\n"
+        for acc in accounts:
+            response += f"Account Number: {acc['account_number']}\n"
+            response += f"Type: {acc['account_type']}\n"
+            response += f"Balance: ${acc['balance']:.2f} {acc['currency']}\n\n"
+        return response.strip()
+    else:
+        return "Account information not available."
+
+@chat_router.intent('loan', priority=150, keywords=['loan', 'calculate loan', 'loan payment', 'mortgage'], access='read')
+def chat_loan(message, user_id):
+    """Loan calculator help"""
+    return "I can calculate loan payments! Please use the format: 'Loan calculator: Principal $X, Rate Y%, Term Z years' or use the calculator feature in your dashboard."
+
+@chat_router.intent('interest', priority=160, keywords=['interest', 'compound interest', 'savings calculator', 'investment calculator'], access='read')
+def chat_interest(message, user_id):
+    """Interest calculator help"""
+    return "I can calculate compound interest! Please use: 'Interest calculator: Principal $X, Rate Y%, Years Z' or use the calculator feature."
+
+@chat_router.intent('currency', priority=170, keywords=['convert', 'currency', 'exchange rate'], access='read')
+def chat_currency(message, user_id):
+    """Currency converter help"""
+    currencies = ', '.join(exchange_rates.matrix().currencies)
+    return f"I can convert currencies! Try: 'Convert $100 USD to EUR' or use the currency converter feature. Supported currencies: {currencies}."
+
+@chat_router.intent('trends', priority=180, keywords=['trend', 'trends', 'spending trend', 'expense trend'], access='read')
+def chat_trends(message, user_id):
+    """Expense trends"""
+    conn = get_db_connection()
+    accounts = conn.execute(USER_ACCOUNT_IDS_SQL, (user_id,)).fetchall()
+    account_ids = [acc['id'] for acc in accounts]
+    
+    if account_ids:
+        months = 6
+        if 'month' in message:
+            # Try to extract number of months
+            months_match = re.search(r'(\d+)\s*month', message)
+            if months_match:
+                months = clamp_months(months_match.group(1))
         
+        trends, _ = monthly_expense_trends(conn, account_ids, months)
         conn.close()
-        return "No spending data found for this month."
+        
+        trends_text = f"Expense Trends (Last {months} months):\n"
+        for trend in trends:
+            month_name = datetime.strptime(trend['month'], '%Y-%m').strftime('%b %Y')
+            trends_text += f"\n{month_name}: ${trend['total']:.2f}"
+        return trends_text
     
-    # Financial report
-    elif any(word in message for word in ['report', 'financial report', 'summary', 'financial summary']):
-        accounts = conn.execute('SELECT * FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
-        total_balance = sum(acc['balance'] for acc in accounts)
+    conn.close()
+    return "No expense trends data available."
+
+@chat_router.intent('statement', priority=190, keywords=['statement', 'account statement', 'monthly statement'], access='read')
+def chat_statement(message, user_id):
+    """Account statement summary for the last 30 days"""
+    conn = get_db_connection()
+    account = conn.execute(USER_ACCOUNTS_SQL, (user_id,)).fetchone()
+    if account:
+        # Get last 30 days statement
+        start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        account_id = account['id']
         
-        investments = conn.execute('SELECT SUM(current_value) as total FROM investments WHERE user_id = ?', (user_id,)).fetchone()
-        total_investments = investments['total'] or 0
+        transactions = conn.execute('''
+            SELECT * FROM transactions 
+            WHERE account_id = ? AND created_at >= ?
+            ORDER BY created_at DESC
+        ''', (account_id, start_date)).fetchall()
         
-        month_start = datetime.now().replace(day=1).strftime('%Y-%m-%d')
-        account_ids = [acc['id'] for acc in accounts]
-        monthly_spending = 0
-        if account_ids:
-            placeholders = ','.join('?' * len(account_ids))
-            spending = conn.execute(f'''
-                SELECT SUM(amount) as total FROM transactions 
-                WHERE account_id IN ({placeholders}) 
-                AND transaction_type IN ('payment', 'withdrawal')
-                AND created_at >= ?
-            ''', account_ids + [month_start]).fetchone()
-            monthly_spending = spending['total'] or 0
+        total_deposits = sum(t['amount'] for t in transactions if t['transaction_type'] in ['deposit', 'transfer_in'])
+        total_withdrawals = sum(t['amount'] for t in transactions if t['transaction_type'] in ['withdrawal', 'payment', 'transfer_out'])
         
-        goals = conn.execute('SELECT * FROM savings_goals WHERE user_id = ?', (user_id,)).fetchall()
+        response = f"Account Statement - Last 30 Days\n"
+        response += f"Account: {account['account_number']}\n"
+        response += f"Total Deposits: ${total_deposits:.2f}\n"
+        response += f"Total Withdrawals: ${total_withdrawals:.2f}\n"
+        response += f"Transactions: {len(transactions)}\n"
+        response += f"\nFor detailed statement, use the statement feature in dashboard."
         
-        response = "📊 Financial Report\n"
-        response += f"\nTotal Balance: ${total_balance:.2f}"
-        response += f"\nTotal Investments: ${total_investments:.2f}"
-        response += f"\nNet Worth: ${total_balance + total_investments:.2f}"
-        response += f"\nMonthly Spending: ${monthly_spending:.2f}"
-        response += f"\nActive Accounts: {len(accounts)}"
-        response += f"\nSavings Goals: {len(goals)}"
         conn.close()
         return response
     
-    # Transaction categories
-    elif any(word in message for word in ['category', 'categories', 'spending by category']):
-        accounts = conn.execute('SELECT id FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
-        account_ids = [acc['id'] for acc in accounts]
-        
-        if account_ids:
-            placeholders = ','.join('?' * len(account_ids))
-            categories = conn.execute(f'''
-                SELECT DISTINCT category 
-                FROM transactions 
-                WHERE account_id IN ({placeholders}) 
-                AND category IS NOT NULL
-            ''', account_ids).fetchall()
+    conn.close()
+    return "No account found for statement."
+
+@chat_router.intent('debt', priority=200, keywords=['debt', 'payoff', 'pay off debt', 'debt calculator'], access='read')
+def chat_debt(message, user_id):
+    """Debt payoff calculator help"""
+    return "I can help calculate debt payoff strategies! Use the debt payoff calculator feature. It supports both 'snowball' (smallest balance first) and 'avalanche' (highest interest first) strategies."
+
+@chat_router.intent('search', priority=210, keywords=['search', 'find transaction', 'look for'], access='read')
+def chat_search(message, user_id):
+    """Search transactions by description"""
+    if 'transaction' in message or 'payment' in message:
+        search_term = message.replace('search', '').replace('transaction', '').replace('for', '').strip()
+        if search_term:
+            conn = get_db_connection()
+            accounts = conn.execute(USER_ACCOUNT_IDS_SQL, (user_id,)).fetchall()
+            account_ids = [acc['id'] for acc in accounts]
             
-            if categories:
-                response = "Transaction categories:\n"
-                for cat in categories:
-                    response += f"\n• {cat['category']}"
+            if account_ids:
+                transactions, _ = search_index(conn, account_ids, search_term, 10)
                 conn.close()
-                return response
-        
-        conn.close()
-        return "No transaction categories found."
-    
-    # Account details
-    elif any(word in message for word in ['account', 'details', 'info', 'information']):
-        accounts = conn.execute('SELECT * FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
-        user = conn.execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
-        conn.close()
-        
-        if accounts and user:
-            response = f"Account Details for {user['full_name'] or user['username']}:\n\n"
-            for acc in accounts:
-                response += f"Account Number: {acc['account_number']}\n"
-                response += f"Type: {acc['account_type']}\n"
-                response += f"Balance: ${acc['balance']:.2f} {acc['currency']}\n\n"
-            return response.strip()
-        else:
-            return "Account information not available."
-    
-    # Loan calculator
-    elif any(word in message for word in ['loan', 'calculate loan', 'loan payment', 'mortgage']):
-        conn.close()
-        return "I can calculate loan payments! Please use the format: 'Loan calculator: Principal $X, Rate Y%, Term Z years' or use the calculator feature in your dashboard."
-    
-    # Interest calculator
-    elif any(word in message for word in ['interest', 'compound interest', 'savings calculator', 'investment calculator']):
-        conn.close()
-        return "I can calculate compound interest! Please use: 'Interest calculator: Principal $X, Rate Y%, Years Z' or use the calculator feature."
-    
-    # Currency converter
-    elif any(word in message for word in ['convert', 'currency', 'exchange rate']):
-        conn.close()
-        return "I can convert currencies! Try: 'Convert $100 USD to EUR' or use the currency converter feature. Supported currencies: USD, EUR, GBP, JPY, INR, CAD, AUD, CNY."
-    
-    # Expense trends
-    elif any(word in message for word in ['trend', 'trends', 'spending trend', 'expense trend']):
-        accounts = conn.execute('SELECT id FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
-        account_ids = [acc['id'] for acc in accounts]
-        
-        if account_ids:
-            months = 6
-            if 'month' in message:
-                # Try to extract number of months
-                import re
-                months_match = re.search(r'(\d+)\s*month', message)
-                if months_match:
-                    months = int(months_match.group(1))
-            
-            placeholders = ','.join('?' * len(account_ids))
-            trends_text = f"Expense Trends (Last {months} months):\n"
-            
-            for i in range(months - 1, -1, -1):
-                month_start = (datetime.now() - timedelta(days=30*i)).replace(day=1).strftime('%Y-%m-%d')
-                month_end = (datetime.now() - timedelta(days=30*(i-1))).replace(day=1).strftime('%Y-%m-%d') if i > 0 else datetime.now().strftime('%Y-%m-%d')
                 
-                result = conn.execute(f'''
-                    SELECT COALESCE(SUM(amount), 0) as total 
-                    FROM transactions 
-                    WHERE account_id IN ({placeholders}) 
-                    AND transaction_type IN ('payment', 'withdrawal')
-                    AND created_at >= ? AND created_at < ?
-                ''', account_ids + [month_start, month_end]).fetchone()
+                if transactions:
+                    response = f"Found {len(transactions)} transactions matching '{search_term}':\n"
+                    for trans in transactions:
+                        date = datetime.strptime(trans['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%b %d, %Y')
+                        response += f"\n{date}: ${trans['amount']:.2f} - {trans['description']}"
+                    return response
                 
-                month_name = datetime.strptime(month_start[:7], '%Y-%m').strftime('%b %Y')
-                trends_text += f"\n{month_name}: ${result['total']:.2f}"
-            
-            conn.close()
-            return trends_text
-        
-        conn.close()
-        return "No expense trends data available."
-    
-    # Account statement
-    elif any(word in message for word in ['statement', 'account statement', 'monthly statement']):
-        account = conn.execute('SELECT * FROM accounts WHERE user_id = ?', (user_id,)).fetchone()
-        if account:
-            # Get last 30 days statement
-            start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-            account_id = account['id']
-            
-            transactions = conn.execute('''
-                SELECT * FROM transactions 
-                WHERE account_id = ? AND created_at >= ?
-                ORDER BY created_at DESC
-            ''', (account_id, start_date)).fetchall()
-            
-            total_deposits = sum(t['amount'] for t in transactions if t['transaction_type'] in ['deposit', 'transfer_in'])
-            total_withdrawals = sum(t['amount'] for t in transactions if t['transaction_type'] in ['withdrawal', 'payment', 'transfer_out'])
-            
-            response = f"Account Statement - Last 30 Days\n"
-            response += f"Account: {account['account_number']}\n"
-            response += f"Total Deposits: ${total_deposits:.2f}\n"
-            response += f"Total Withdrawals: ${total_withdrawals:.2f}\n"
-            response += f"Transactions: {len(transactions)}\n"
-            response += f"\nFor detailed statement, use the statement feature in dashboard."
-            
+                return f"No transactions found matching '{search_term}'."
             conn.close()
-            return response
-        
-        conn.close()
-        return "No account found for statement."
     
-    # Debt payoff
-    elif any(word in message for word in ['debt', 'payoff', 'pay off debt', 'debt calculator']):
-        conn.close()
-        return "I can help calculate debt payoff strategies! Use the debt payoff calculator feature. It supports both 'snowball' (smallest balance first) and 'avalanche' (highest interest first) strategies."
-    
-    # Search transactions
-    elif any(word in message for word in ['search', 'find transaction', 'look for']):
-        if 'transaction' in message or 'payment' in message:
-            search_term = message.replace('search', '').replace('transaction', '').replace('for', '').strip()
-            if search_term:
-                accounts = conn.execute('SELECT id FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
-                account_ids = [acc['id'] for acc in accounts]
-                
-                if account_ids:
-                    placeholders = ','.join('?' * len(account_ids))
-                    transactions = conn.execute(f'''
-                        SELECT t.*, a.account_number 
-                        FROM transactions t
-                        JOIN accounts a ON t.account_id = a.id
-                        WHERE t.account_id IN ({placeholders}) 
-                        AND LOWER(t.description) LIKE ?
-                        ORDER BY t.created_at DESC
-                        LIMIT 10
-                    ''', account_ids + [f'%{search_term}%']).fetchall()
-                    
-                    if transactions:
-                        response = f"Found {len(transactions)} transactions matching '{search_term}':\n"
-                        for trans in transactions:
-                            date = datetime.strptime(trans['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%b %d, %Y')
-                            response += f"\n{date}: ${trans['amount']:.2f} - {trans['description']}"
-                        conn.close()
-                        return response
-                    
-                    conn.close()
-                    return f"No transactions found matching '{search_term}'."
-        
-        conn.close()
-        return "To search transactions, say: 'Search for [description]' or 'Find transaction [keyword]'"
-    
-    # Financial calendar
-    elif any(word in message for word in ['calendar', 'schedule', 'upcoming', 'what\'s due']):
-        bills = conn.execute('''
-            SELECT * FROM bills 
-            WHERE user_id = ? AND status = 'pending' AND due_date >= date('now')
-            ORDER BY due_date
-            LIMIT 10
-        ''', (user_id,)).fetchall()
-        
-        if bills:
-            response = "Upcoming Financial Events:\n"
-            for bill in bills:
-                due_date = datetime.strptime(bill['due_date'], '%Y-%m-%d').strftime('%b %d, %Y')
-                response += f"\n{bill['bill_type']} Bill: ${bill['amount']:.2f} - Due: {due_date}"
-            conn.close()
-            return response
-        else:
-            conn.close()
-            return "No upcoming bills or financial events found."
-    
-    # Recurring transactions
-    elif any(word in message for word in ['recurring', 'auto', 'automatic', 'scheduled transaction']):
-        recurring = conn.execute('''
-            SELECT rt.*, a.account_number 
-            FROM recurring_transactions rt
-            JOIN accounts a ON rt.account_id = a.id
-            WHERE rt.user_id = ? AND rt.is_active = 1
-            ORDER BY rt.next_date
-        ''', (user_id,)).fetchall()
-        
-        if recurring:
-            response = "Recurring Transactions:\n"
-            for rec in recurring:
-                next_date = datetime.strptime(rec['next_date'], '%Y-%m-%d').strftime('%b %d, %Y')
-                response += f"\n{rec['description']}: ${rec['amount']:.2f} ({rec['frequency']}) - Next: {next_date}"
-            conn.close()
-            return response
-        else:
-            conn.close()
-            return "No recurring transactions set up. You can create them in your dashboard."
+    return "To search transactions, say: 'Search for [description]' or 'Find transaction [keyword]'"
+
+@chat_router.intent('calendar', priority=220, keywords=['calendar', 'schedule', 'upcoming', 'what\'s due'], access='read')
+def chat_calendar(message, user_id):
+    """Upcoming financial events"""
+    conn = get_db_connection()
+    bills = conn.execute('''
+        SELECT * FROM bills 
+        WHERE user_id = ? AND status = 'pending' AND due_date >= date('now')
+        ORDER BY due_date
+        LIMIT 10
+    ''', (user_id,)).fetchall()
+    conn.close()
     
-    # Default response with all features
+    if bills:
+        response = "Upcoming Financial Events:\n"
+        for bill in bills:
+            due_date = datetime.strptime(bill['due_date'], '%Y-%m-%d').strftime('%b %d, %Y')
+            response += f"\n{bill['bill_type']} Bill: ${bill['amount']:.2f} - Due: {due_date}"
+        return response
     else:
-        conn.close()
-        return """I can help you with:
+        return "No upcoming bills or financial events found."
+
+@chat_router.intent('recurring', priority=230, keywords=['recurring', 'auto', 'automatic', 'scheduled transaction'], access='read')
+def chat_recurring(message, user_id):
+    """Recurring transactions"""
+    conn = get_db_connection()
+    recurring = conn.execute(ACTIVE_RECURRING_SQL, (user_id,)).fetchall()
+    conn.close()
+    
+    if recurring:
+        response = "Recurring Transactions:\n"
+        for rec in recurring:
+            next_date = datetime.strptime(rec['next_date'], '%Y-%m-%d').strftime('%b %d, %Y')
+            response += f"\n{rec['description']}: ${rec['amount']:.2f} ({rec['frequency']}) - Next: {next_date}"
+        return response
+    else:
+        return "No recurring transactions set up. You can create them in your dashboard."
+
+@chat_router.default
+def chat_help(message, user_id):
+    """Default response with all features"""
+    return """I can help you with:
 
 💰 Account Management:
 - Check balance (all accounts or specific)
@@ -902,13 +1298,15 @@ def get_financial_advice(message):
 
 @app.route('/api/account', methods=['GET'])
 @login_required
+@read_only
 def get_account():
     """Get user account information"""
     user_id = session['user_id']
     conn = get_db_connection()
-    
-    accounts = conn.execute('SELECT * FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
-    user = conn.execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
+    accounts = conn.execute(USER_ACCOUNTS_SQL, (user_id,)).fetchall()
+    conn.close()
+    conn = get_directory_connection('read')
+    user = conn.execute(USER_BY_ID_SQL, (user_id,)).fetchone()
     conn.close()
     
     if accounts and user:
@@ -921,11 +1319,12 @@ def get_account():
 
 @app.route('/api/accounts', methods=['GET'])
 @login_required
+@read_only
 def get_all_accounts():
     """Get all user accounts"""
     user_id = session['user_id']
     conn = get_db_connection()
-    accounts = conn.execute('SELECT * FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
+    accounts = conn.execute(USER_ACCOUNTS_SQL, (user_id,)).fetchall()
     conn.close()
     return jsonify({'accounts': [dict(acc) for acc in accounts]})
 
@@ -943,47 +1342,29 @@ def transfer_funds():
         return jsonify({'success': False, 'message': 'Invalid amount'}), 400
     
     conn = get_db_connection()
-    
-    # Get accounts
-    from_acc = conn.execute('SELECT * FROM accounts WHERE account_number = ? AND user_id = ?', 
-                           (from_account, user_id)).fetchone()
-    to_acc = conn.execute('SELECT * FROM accounts WHERE account_number = ? AND user_id = ?', 
-                         (to_account, user_id)).fetchone()
-    
-    if not from_acc or not to_acc:
+    try:
+        ledger_writes.run(conn, lambda conn: transfer(conn, user_id, from_account, to_account, amount))
+    except LedgerError as e:
+        return jsonify({'success': False, 'message': e.message}), e.status
+    except sqlite3.OperationalError as e:
+        if not is_busy(e):
+            raise
+        return busy_response()
+    finally:
         conn.close()
-        return jsonify({'success': False, 'message': 'Account not found'}), 404
-    
-    if from_acc['balance'] < amount:
-        conn.close()
-        return jsonify({'success': False, 'message': 'Insufficient balance'}), 400
-    
-    # Update balances
-    new_from_balance = from_acc['balance'] - amount
-    new_to_balance = to_acc['balance'] + amount
-    
-    conn.execute('UPDATE accounts SET balance = ? WHERE id = ?', (new_from_balance, from_acc['id']))
-    conn.execute('UPDATE accounts SET balance = ? WHERE id = ?', (new_to_balance, to_acc['id']))
-    
-    # Record transactions
-    conn.execute('INSERT INTO transactions (account_id, transaction_type, amount, description, category, balance_after) VALUES (?, ?, ?, ?, ?, ?)',
-                (from_acc['id'], 'transfer_out', amount, f'Transfer to {to_account}', 'Transfer', new_from_balance))
-    conn.execute('INSERT INTO transactions (account_id, transaction_type, amount, description, category, balance_after) VALUES (?, ?, ?, ?, ?, ?)',
-                (to_acc['id'], 'transfer_in', amount, f'Transfer from {from_account}', 'Transfer', new_to_balance))
-    
-    conn.commit()
-    conn.close()
+    response_cache.bump(user_id)
     return jsonify({'success': True, 'message': f'Transfer of ${amount:.2f} completed successfully'})
 
 @app.route('/api/budgets', methods=['GET', 'POST'])
 @login_required
+@read_only
 def manage_budgets():
     """Get or create budgets"""
     user_id = session['user_id']
-    conn = get_db_connection()
     
     if request.method == 'GET':
-        budgets = conn.execute('SELECT * FROM budgets WHERE user_id = ?', (user_id,)).fetchall()
+        conn = get_db_connection()
+        budgets = conn.execute(USER_BUDGETS_SQL, (user_id,)).fetchall()
         conn.close()
         return jsonify({'budgets': [dict(b) for b in budgets]})
     
@@ -993,38 +1374,32 @@ def manage_budgets():
     budget_amount = float(data.get('budget_amount', 0))
     period = data.get('period', 'monthly')
     
-    conn.execute('INSERT INTO budgets (user_id, category, budget_amount, period, start_date) VALUES (?, ?, ?, ?, ?)',
-                (user_id, category, budget_amount, period, datetime.now().strftime('%Y-%m-%d')))
-    conn.commit()
-    conn.close()
+    apply_write(user_id, execute('INSERT INTO budgets (user_id, category, budget_amount, period, start_date) VALUES (?, ?, ?, ?, ?)',
+                                 (user_id, category, budget_amount, period, datetime.now().strftime('%Y-%m-%d'))))
     return jsonify({'success': True, 'message': 'Budget created successfully'})
 
 @app.route('/api/spending-analysis', methods=['GET'])
 @login_required
+@cached_view('spending-analysis', args=('days',))
+@read_only
 def spending_analysis():
     """Get spending analysis by category"""
     user_id = session['user_id']
     days = int(request.args.get('days', 30))
     conn = get_db_connection()
     
-    accounts = conn.execute('SELECT id FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
-    account_ids = [acc['id'] for acc in accounts]
-    
+    accounts = conn.execute(USER_ACCOUNT_IDS_SQL, (user_id,)).fetchall()
+    result = build_spending_analysis(conn, user_id, [acc['id'] for acc in accounts], days)
+    conn.close()
+    return jsonify(result)
+
+def build_spending_analysis(conn, user_id, account_ids, days):
+    """Spending by category over the last ``days`` days, with budget status"""
     if not account_ids:
-        conn.close()
-        return jsonify({'analysis': {}})
+        return {'analysis': {}}
     
-    placeholders = ','.join('?' * len(account_ids))
     since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-    
-    transactions = conn.execute(f'''
-        SELECT category, transaction_type, SUM(amount) as total 
-        FROM transactions 
-        WHERE account_id IN ({placeholders}) 
-        AND created_at >= ? 
-        AND transaction_type IN ('payment', 'withdrawal')
-        GROUP BY category, transaction_type
-    ''', account_ids + [since_date]).fetchall()
+    transactions = spending_by_category(conn, account_ids, since_date)
     
     analysis = {}
     total_spent = 0
@@ -1035,26 +1410,89 @@ def spending_analysis():
         total_spent += trans['total']
     
     # Get budgets for comparison
-    budgets = conn.execute('SELECT category, budget_amount FROM budgets WHERE user_id = ?', (user_id,)).fetchall()
-    budget_dict = {b['category']: b['budget_amount'] for b in budgets}
+    budget_status = evaluate_budgets(conn, user_id)
+    budget_dict = {b['category']: b['budget_amount'] for b in budget_status}
     
-    conn.close()
-    return jsonify({
+    return {
         'analysis': analysis,
         'total_spent': total_spent,
         'budgets': budget_dict,
+        'budget_status': budget_status,
         'period_days': days
+    }
+
+DASHBOARD_SECTIONS = ('accounts', 'budgets', 'goals', 'investments', 'spending_analysis')
+
+@app.route('/api/dashboard', methods=['GET'])
+@login_required
+@cached_view('dashboard', args=('sections', 'days'))
+@read_only
+def dashboard():
+    """Accounts, budgets, goals, investments and spending analysis in one consistent read"""
+    user_id = session['user_id']
+    sections = [name.strip() for name in request.args.get('sections', '').split(',') if name.strip()]
+    sections = sections or list(DASHBOARD_SECTIONS)
+    unknown = [name for name in sections if name not in DASHBOARD_SECTIONS]
+    if unknown:
+        return jsonify({'error': f"Unknown sections: {', '.join(unknown)}",
+                        'sections': list(DASHBOARD_SECTIONS)}), 400
+    try:
+        days = int(request.args.get('days', 30))
+    except ValueError:
+        return jsonify({'error': 'days must be an integer'}), 400
+    
+    conn = get_db_connection()
+    # One read transaction: every section sees the same snapshot
+    if not conn.in_transaction:
+        conn.execute('BEGIN')
+    result = {}
+    accounts = None
+    if 'accounts' in sections or 'spending_analysis' in sections:
+        accounts = conn.execute(USER_ACCOUNTS_SQL, (user_id,)).fetchall()
+    if 'accounts' in sections:
+        result['accounts'] = [dict(acc) for acc in accounts]
+    if 'budgets' in sections:
+        budgets = conn.execute(USER_BUDGETS_SQL, (user_id,)).fetchall()
+        result['budgets'] = [dict(b) for b in budgets]
+    if 'goals' in sections:
+        goals = conn.execute(USER_GOALS_SQL, (user_id,)).fetchall()
+        result['goals'] = [dict(g) for g in goals]
+    if 'investments' in sections:
+        investments = conn.execute(USER_INVESTMENTS_SQL, (user_id,)).fetchall()
+        result['investments'] = [dict(inv) for inv in investments]
+    if 'spending_analysis' in sections:
+        result['spending_analysis'] = build_spending_analysis(conn, user_id, [acc['id'] for acc in accounts], days)
+    conn.commit()
+    conn.close()
+    return jsonify(result)
+
+@app.route('/api/budgets/status', methods=['GET'])
+@login_required
+@read_only
+def budget_status():
+    """Get spending against every budget for its current period"""
+    user_id = session['user_id']
+    conn = get_db_connection()
+    budgets = evaluate_budgets(conn, user_id)
+    conn.close()
+    
+    return jsonify({
+        'budgets': budgets,
+        'total_budgeted': round(sum(b['budget_amount'] for b in budgets), 2),
+        'total_spent': round(sum(b['spent'] for b in budgets), 2),
+        'over_budget_count': len([b for b in budgets if b['over_budget']])
     })
 
 @app.route('/api/goals', methods=['GET', 'POST'])
 @login_required
+@read_only
 def manage_goals():
     """Get or create savings goals"""
     user_id = session['user_id']
-    conn = get_db_connection()
     
     if request.method == 'GET':
-        goals = conn.execute('SELECT * FROM savings_goals WHERE user_id = ?', (user_id,)).fetchall()
+        conn = get_db_connection()
+        goals = conn.execute(USER_GOALS_SQL, (user_id,)).fetchall()
         conn.close()
         return jsonify({'goals': [dict(g) for g in goals]})
     
@@ -1064,21 +1502,20 @@ def manage_goals():
     target_amount = float(data.get('target_amount', 0))
     target_date = data.get('target_date')
     
-    conn.execute('INSERT INTO savings_goals (user_id, goal_name, target_amount, target_date) VALUES (?, ?, ?, ?)',
-                (user_id, goal_name, target_amount, target_date))
-    conn.commit()
-    conn.close()
+    apply_write(user_id, execute('INSERT INTO savings_goals (user_id, goal_name, target_amount, target_date) VALUES (?, ?, ?, ?)',
+                                 (user_id, goal_name, target_amount, target_date)))
     return jsonify({'success': True, 'message': 'Goal created successfully'})
 
 @app.route('/api/investments', methods=['GET', 'POST'])
 @login_required
+@read_only
 def manage_investments():
     """Get or add investments"""
     user_id = session['user_id']
-    conn = get_db_connection()
     
     if request.method == 'GET':
-        investments = conn.execute('SELECT * FROM investments WHERE user_id = ?', (user_id,)).fetchall()
+        conn = get_db_connection()
+        investments = conn.execute(USER_INVESTMENTS_SQL, (user_id,)).fetchall()
         conn.close()
         return jsonify({'investments': [dict(inv) for inv in investments]})
     
@@ -1090,98 +1527,140 @@ def manage_investments():
     current_value = data.get('current_value', amount)
     description = data.get('description', '')
     
-    conn.execute('INSERT INTO investments (user_id, investment_type, amount, purchase_date, current_value, description) VALUES (?, ?, ?, ?, ?, ?)',
-                (user_id, investment_type, amount, purchase_date, current_value, description))
-    conn.commit()
-    conn.close()
+    apply_write(user_id, execute('INSERT INTO investments (user_id, investment_type, amount, purchase_date, current_value, description) VALUES (?, ?, ?, ?, ?, ?)',
+                                 (user_id, investment_type, amount, purchase_date, current_value, description)))
     return jsonify({'success': True, 'message': 'Investment added successfully'})
 
 @app.route('/api/financial-report', methods=['GET'])
 @login_required
+@cached_view('financial-report', args=('currency',))
+@read_only
 def financial_report():
     """Get comprehensive financial report"""
     user_id = session['user_id']
+    currency = (request.args.get('currency') or app.config['REPORTING_CURRENCY']).strip().upper()
+    matrix = exchange_rates.matrix()
     conn = get_db_connection()
     
     # Get all accounts
-    accounts = conn.execute('SELECT * FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
-    total_balance = sum(acc['balance'] for acc in accounts)
+    accounts = conn.execute(USER_ACCOUNTS_SQL, (user_id,)).fetchall()
+    balances_by_currency = {}
+    for acc in accounts:
+        balances_by_currency[acc['currency']] = balances_by_currency.get(acc['currency'], 0) + acc['balance']
     
-    # Get total investments
+    # Get total investments (valued in US dollars)
     investments = conn.execute('SELECT SUM(current_value) as total FROM investments WHERE user_id = ?', (user_id,)).fetchone()
-    total_investments = investments['total'] or 0
+    
+    try:
+        total_balance = round(convert_balances(accounts, currency, matrix), 2)
+        total_investments = round((investments['total'] or 0) * matrix.rate(BASE_CURRENCY, currency), 2)
+    except CurrencyError as e:
+        conn.close()
+        return jsonify({'error': str(e), 'currencies': list(matrix.currencies)}), 400
     
     # Get spending this month
-    month_start = datetime.now().replace(day=1).strftime('%Y-%m-%d')
     account_ids = [acc['id'] for acc in accounts]
-    placeholders = ','.join('?' * len(account_ids)) if account_ids else '0'
-    
-    monthly_spending = conn.execute(f'''
-        SELECT SUM(amount) as total FROM transactions 
-        WHERE account_id IN ({placeholders}) 
-        AND transaction_type IN ('payment', 'withdrawal')
-        AND created_at >= ?
-    ''', account_ids + [month_start] if account_ids else [month_start]).fetchone()
+    monthly_spending = spending_since_month(conn, account_ids, datetime.now().strftime('%Y-%m'))
     
     # Get goals progress
-    goals = conn.execute('SELECT * FROM savings_goals WHERE user_id = ?', (user_id,)).fetchall()
+    goals = conn.execute(USER_GOALS_SQL, (user_id,)).fetchall()
     
     conn.close()
     return jsonify({
+        'currency': currency,
+        'rates_as_of': matrix.as_of,
         'total_balance': total_balance,
+        'balances_by_currency': {code: round(amount, 2) for code, amount in balances_by_currency.items()},
         'total_investments': total_investments,
-        'net_worth': total_balance + total_investments,
-        'monthly_spending': monthly_spending['total'] or 0,
+        'net_worth': round(total_balance + total_investments, 2),
+        'monthly_spending': monthly_spending,
         'accounts_count': len(accounts),
         'goals': [dict(g) for g in goals]
     })
 
 @app.route('/api/transactions', methods=['GET'])
 @login_required
+@read_only
 def get_transactions():
-    """Get transactions with filtering"""
+    """Get transactions with filtering, newest first, one page at a time"""
     user_id = session['user_id']
     account_number = request.args.get('account')
     category = request.args.get('category')
     days = int(request.args.get('days', 30))
     
+    try:
+        limit = page_size(request.args.get('limit'))
+        cursor = decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid pagination parameters'}), 400
+    
     conn = get_db_connection()
     
-    query = '''
-        SELECT t.*, a.account_number, a.account_type 
-        FROM transactions t
-        JOIN accounts a ON t.account_id = a.id
-        WHERE a.user_id = ?
-    '''
     params = [user_id]
     
     if account_number:
-        query += ' AND a.account_number = ?'
         params.append(account_number)
     
     if category:
-        query += ' AND t.category = ?'
         params.append(category)
     
     since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-    query += ' AND t.created_at >= ? ORDER BY t.created_at DESC'
     params.append(since_date)
     
-    transactions = conn.execute(query, params).fetchall()
+    if cursor:
+        params.extend(cursor)
+    
+    params.append(limit + 1)
+    
+    query = transactions_listing_sql(bool(account_number), bool(category), bool(cursor))
+    transactions, next_cursor = paginate(conn.execute(query, params).fetchall(), limit)
     conn.close()
     
-    return jsonify({'transactions': [dict(t) for t in transactions]})
+    return jsonify({'transactions': [dict(t) for t in transactions], 'next_cursor': next_cursor})
+
+EXPORT_BATCH_SIZE = 1000
+
+@app.route('/api/import-transactions', methods=['POST'])
+@login_required
+def import_statement():
+    """Bulk-import a CSV, OFX or QIF bank statement into one of the user's accounts"""
+    user_id = session['user_id']
+    account_number = request.args.get('account') or request.form.get('account')
+    upload = request.files.get('file')
+    fmt = (request.args.get('format') or request.form.get('format')
+           or detect_format(upload.filename if upload else None) or 'csv').lower()
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({'success': False, 'message': f"format must be one of {', '.join(IMPORT_FORMATS)}"}), 400
+    
+    conn = get_db_connection()
+    account = conn.execute('SELECT id FROM accounts WHERE account_number = ? AND user_id = ?',
+                           (account_number, user_id)).fetchone()
+    if not account:
+        conn.close()
+        return jsonify({'success': False, 'message': 'Account not found'}), 404
+    
+    # Parse straight off the upload (or raw body) without reading it into memory
+    lines = io.TextIOWrapper(upload.stream if upload else request.stream, encoding='utf-8-sig', newline='')
+    try:
+        summary = import_transactions(conn, account['id'], lines, fmt)
+    except (ImportFormatError, UnicodeDecodeError) as e:
+        conn.close()
+        return jsonify({'success': False, 'message': f'Could not read statement: {e}'}), 400
+    conn.close()
+    response_cache.bump(user_id)
+    return jsonify({'success': True, **summary})
 
 @app.route('/api/export-transactions', methods=['GET'])
 @login_required
+@read_only
 def export_transactions():
-    """Export transactions as CSV"""
-    from flask import Response
+    """Export transactions as CSV, streamed in batches (optionally gzipped)"""
     user_id = session['user_id']
     days = int(request.args.get('days', 30))
+    compress = request.args.get('compress') == 'gzip'
     
-    conn = get_db_connection()
-    accounts = conn.execute('SELECT id FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
+    conn = begin_snapshot(get_db_connection())
+    accounts = conn.execute(USER_ACCOUNT_IDS_SQL, (user_id,)).fetchall()
     account_ids = [acc['id'] for acc in accounts]
     
     if not account_ids:
@@ -1191,63 +1670,127 @@ def export_transactions():
     placeholders = ','.join('?' * len(account_ids))
     since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
     
-    transactions = conn.execute(f'''
-        SELECT t.*, a.account_number 
-        FROM transactions t
-        JOIN accounts a ON t.account_id = a.id
-        WHERE t.account_id IN ({placeholders}) AND t.created_at >= ?
-        ORDER BY t.created_at DESC
-    ''', account_ids + [since_date]).fetchall()
-    
-    conn.close()
-    
-    # Generate CSV
-    csv_data = "Date,Account,Type,Category,Amount,Description,Balance After\n"
-    for trans in transactions:
-        date = datetime.strptime(trans['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d')
-        csv_data += f"{date},{trans['account_number']},{trans['transaction_type']},{trans.get('category', 'N/A')},{trans['amount']},{trans.get('description', '')},{trans.get('balance_after', '')}\n"
+    def generate_rows():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['Date', 'Account', 'Type', 'Category', 'Amount', 'Description', 'Balance After'])
+        # Send the header before the query starts producing rows
+        yield buffer.getvalue()
+        
+        try:
+            cursor = conn.execute(f'''
+                SELECT t.created_at, a.account_number, t.transaction_type, t.category,
+                       t.amount, t.description, t.balance_after
+                FROM transactions t
+                JOIN accounts a ON t.account_id = a.id
+                WHERE t.account_id IN ({placeholders}) AND t.created_at >= ?
+                ORDER BY t.created_at DESC, t.id DESC
+            ''', account_ids + [since_date])
+            while True:
+                batch = cursor.fetchmany(EXPORT_BATCH_SIZE)
+                if not batch:
+                    break
+                buffer.seek(0)
+                buffer.truncate()
+                for trans in batch:
+                    writer.writerow([
+                        trans['created_at'][:10],
+                        trans['account_number'],
+                        trans['transaction_type'],
+                        trans['category'] or 'N/A',
+                        trans['amount'],
+                        trans['description'] or '',
+                        '' if trans['balance_after'] is None else trans['balance_after']
+                    ])
+                yield buffer.getvalue()
+        finally:
+            conn.close()
     
-    return Response(csv_data, mimetype='text/csv', 
-                   headers={'Content-Disposition': 'attachment; filename=transactions.csv'})
+    def generate_gzip():
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in generate_rows():
+            data = compressor.compress(chunk.encode('utf-8'))
+            if data:
+                yield data
+        yield compressor.flush()
+    
+    if compress:
+        return Response(stream_with_context(generate_gzip()), mimetype='application/gzip',
+                        headers={'Content-Disposition': 'attachment; filename=transactions.csv.gz'})
+    return Response(stream_with_context(generate_rows()), mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=transactions.csv'})
 
 @app.route('/api/loan-calculator', methods=['POST'])
 @login_required
 def loan_calculator():
-    """Calculate loan payments"""
-    data = request.json
-    principal = float(data.get('principal', 0))
-    annual_rate = float(data.get('annual_rate', 0))
-    term_years = int(data.get('term_years', 0))
-    
-    if principal <= 0 or annual_rate < 0 or term_years <= 0:
+    """Calculate loan payments, a full amortization schedule or a scenario grid"""
+    data = request.json or {}
+    mode = data.get('mode', 'summary')
+    if mode == 'grid':
+        return loan_scenario_grid(data)
+    if mode not in ('summary', 'amortization'):
+        return jsonify({'error': "mode must be 'summary', 'amortization' or 'grid'"}), 400
+    
+    try:
+        loan = Amortization(float(data.get('principal', 0)), float(data.get('annual_rate', 0)),
+                            int(data.get('term_years', 0)), float(data.get('extra_payment', 0) or 0))
+    except (LoanInputError, TypeError, ValueError):
         return jsonify({'error': 'Invalid parameters'}), 400
     
-    monthly_rate = (annual_rate / 100) / 12
-    num_payments = term_years * 12
-    
-    if monthly_rate == 0:
-        monthly_payment = principal / num_payments
-    else:
-        monthly_payment = principal * (monthly_rate * (1 + monthly_rate)**num_payments) / ((1 + monthly_rate)**num_payments - 1)
+    result = loan.summary()
+    if mode == 'summary':
+        return jsonify(result)
+    
+    if data.get('format') == 'csv':
+        def generate_schedule():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(['Period', 'Payment', 'Interest', 'Principal', 'Balance'])
+            for row in loan.rows():
+                writer.writerow([row['period'], row['payment'], row['interest'], row['principal'], row['balance']])
+                if buffer.tell() > 8192:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        
+        return Response(generate_schedule(), mimetype='text/csv',
+                        headers={'Content-Disposition': 'attachment; filename=amortization.csv'})
     
-    total_payment = monthly_payment * num_payments
-    total_interest = total_payment - principal
+    result['schedule'] = list(loan.rows())
+    return jsonify(result)
+
+def loan_scenario_grid(data):
+    """Evaluate every principal x rate x term x extra-payment combination in one call"""
+    def axis(plural, singular, cast, default=0):
+        values = data.get(plural, data.get(singular, default))
+        return [cast(value) for value in (values if isinstance(values, list) else [values])]
+    
+    try:
+        axes = (axis('principals', 'principal', float), axis('annual_rates', 'annual_rate', float),
+                axis('term_years', 'term_years', int), axis('extra_payments', 'extra_payment', float))
+        grid = loan_grid(*axes)
+    except LoanInputError as e:
+        return jsonify({'error': str(e)}), 400
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid parameters'}), 400
     
+    principals, annual_rates, term_years, extra_payments = axes
     return jsonify({
-        'principal': principal,
-        'annual_rate': annual_rate,
+        'principals': principals,
+        'annual_rates': annual_rates,
         'term_years': term_years,
-        'monthly_payment': round(monthly_payment, 2),
-        'total_payment': round(total_payment, 2),
-        'total_interest': round(total_interest, 2),
-        'num_payments': num_payments
+        'extra_payments': extra_payments,
+        'scenarios': list(grid_rows(principals, annual_rates, term_years, extra_payments, grid))
     })
 
 @app.route('/api/interest-calculator', methods=['POST'])
 @login_required
 def interest_calculator():
-    """Calculate compound interest"""
-    data = request.json
+    """Calculate compound interest, or simulate a distribution with mode=simulation"""
+    data = request.json or {}
+    if data.get('mode') == 'simulation':
+        return interest_simulation(data)
     principal = float(data.get('principal', 0))
     annual_rate = float(data.get('annual_rate', 0))
     years = int(data.get('years', 0))
@@ -1290,87 +1833,169 @@ def interest_calculator():
         'gain': round(future_value - total_contributed, 2)
     })
 
+def interest_simulation(data):
+    """Monte Carlo projection of savings, optionally against a savings goal"""
+    params = dict(data)
+    params.setdefault('expected_return', data.get('annual_rate', 0))
+    goal = None
+    if data.get('goal_id') is not None:
+        conn = get_db_connection()
+        goal = conn.execute('SELECT * FROM savings_goals WHERE id = ? AND user_id = ?',
+                            (data['goal_id'], session['user_id'])).fetchone()
+        conn.close()
+        if not goal:
+            return jsonify({'error': 'Goal not found'}), 404
+        params.setdefault('principal', goal['current_amount'])
+        params.setdefault('target_amount', goal['target_amount'])
+        if goal['target_date'] and 'years' not in data and 'months' not in data:
+            target = datetime.strptime(goal['target_date'][:10], '%Y-%m-%d')
+            now = datetime.now()
+            params['months'] = (target.year - now.year) * 12 + target.month - now.month
+    if 'months' not in params:
+        try:
+            params['months'] = int(data.get('years', 0)) * 12
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Invalid parameters'}), 400
+    
+    try:
+        params = validate_projection(params)
+    except ProjectionInputError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Results depend only on the parameters, so every user shares the entry
+    simulation_id = parameter_hash(params)
+    computed = []
+    
+    def compute():
+        computed.append(True)
+        return run_projection(params, get_simulation_executor())
+    
+    result = dict(response_cache.get_or_compute(None, 'interest-simulation', simulation_id, compute))
+    result['simulation_id'] = simulation_id
+    if goal:
+        result['goal'] = {'id': goal['id'], 'goal_name': goal['goal_name'], 'target_date': goal['target_date']}
+    resp = jsonify(result)
+    resp.headers['X-Cache'] = 'MISS' if computed else 'HIT'
+    return resp
+
+def rate_date_arg(value):
+    """Validate an optional as_of date argument, returning it as an ISO string"""
+    if not value:
+        return None
+    return datetime.strptime(str(value).strip(), '%Y-%m-%d').date().isoformat()
+
 @app.route('/api/currency-convert', methods=['GET'])
 def currency_convert():
     """Currency converter"""
-    amount = float(request.args.get('amount', 1))
+    try:
+        amount = float(request.args.get('amount', 1))
+        as_of = rate_date_arg(request.args.get('as_of'))
+    except ValueError:
+        return jsonify({'error': 'Invalid amount or as_of date (use YYYY-MM-DD)'}), 400
     from_currency = request.args.get('from', 'USD').upper()
     to_currency = request.args.get('to', 'EUR').upper()
     
-    rates = {
-        'USD': 1.0, 'EUR': 0.92, 'GBP': 0.79, 'JPY': 149.0,
-        'INR': 83.0, 'CAD': 1.35, 'AUD': 1.52, 'CNY': 7.24
-    }
-    
-    if from_currency not in rates or to_currency not in rates:
-        return jsonify({'error': 'Currency not supported'}), 400
-    
-    converted_amount = amount * (rates[to_currency] / rates[from_currency])
+    matrix = exchange_rates.matrix(as_of)
+    try:
+        rate = matrix.rate(from_currency, to_currency)
+    except CurrencyError:
+        return jsonify({'error': 'Currency not supported', 'currencies': list(matrix.currencies)}), 400
     
     return jsonify({
         'amount': amount,
         'from_currency': from_currency,
         'to_currency': to_currency,
-        'converted_amount': round(converted_amount, 2),
-        'rate': round(rates[to_currency] / rates[from_currency], 4)
+        'converted_amount': round(amount * rate, 2),
+        'rate': round(rate, 4),
+        'as_of': matrix.as_of
+    })
+
+@app.route('/api/currency-convert/batch', methods=['POST'])
+def currency_convert_batch():
+    """Convert many amounts in one request with one set of rates"""
+    data = request.json or {}
+    conversions = data.get('conversions')
+    if not isinstance(conversions, list) or not conversions:
+        return jsonify({'error': 'conversions must be a non-empty list'}), 400
+    if len(conversions) > CONVERT_MAX_BATCH:
+        return jsonify({'error': f'At most {CONVERT_MAX_BATCH} conversions per request'}), 400
+    default_to = str(data.get('to', 'USD')).upper()
+    try:
+        as_of = rate_date_arg(data.get('as_of'))
+        amounts = [float(item['amount']) for item in conversions]
+        from_currencies = [str(item.get('from', 'USD')).upper() for item in conversions]
+        to_currencies = [str(item.get('to') or default_to).upper() for item in conversions]
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return jsonify({'error': 'Each conversion needs a numeric amount; as_of must be YYYY-MM-DD'}), 400
+    
+    matrix = exchange_rates.matrix(as_of)
+    try:
+        converted, rates = matrix.convert(amounts, from_currencies, to_currencies)
+    except CurrencyError as e:
+        return jsonify({'error': str(e), 'currencies': list(matrix.currencies)}), 400
+    
+    result = {'as_of': matrix.as_of, 'count': len(amounts),
+              'results': [{'amount': amount, 'from_currency': from_currency, 'to_currency': to_currency,
+                           'converted_amount': round(value, 2), 'rate': round(rate, 4)}
+                          for amount, from_currency, to_currency, value, rate
+                          in zip(amounts, from_currencies, to_currencies, converted.tolist(), rates.tolist())]}
+    if len(set(to_currencies)) == 1:
+        result['to_currency'] = to_currencies[0]
+        result['total'] = round(float(converted.sum()), 2)
+    return jsonify(result)
+
+@app.route('/api/exchange-rates', methods=['GET'])
+def list_exchange_rates():
+    """Rates per US dollar in force on a date (default: newest)"""
+    try:
+        as_of = rate_date_arg(request.args.get('as_of'))
+    except ValueError:
+        return jsonify({'error': 'as_of must be YYYY-MM-DD'}), 400
+    matrix = exchange_rates.matrix(as_of)
+    return jsonify({
+        'base': BASE_CURRENCY,
+        'as_of': matrix.as_of,
+        'rates': matrix.rates(),
+        'dates': {code: rate_date for code, rate_date in matrix.dates.items() if rate_date}
     })
 
 @app.route('/api/expense-trends', methods=['GET'])
 @login_required
+@cached_view('expense-trends', args=('months', 'by_category'))
+@read_only
 def expense_trends():
     """Get spending trends over time"""
     user_id = session['user_id']
-    months = int(request.args.get('months', 6))
+    months = clamp_months(request.args.get('months', 6))
+    by_category = request.args.get('by_category', 'false') == 'true'
     
     conn = get_db_connection()
-    accounts = conn.execute('SELECT id FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
+    accounts = conn.execute(USER_ACCOUNT_IDS_SQL, (user_id,)).fetchall()
     account_ids = [acc['id'] for acc in accounts]
     
     if not account_ids:
         conn.close()
         return jsonify({'trends': []})
     
-    placeholders = ','.join('?' * len(account_ids))
-    trends = []
-    
-    for i in range(months - 1, -1, -1):
-        month_start = (datetime.now() - timedelta(days=30*i)).replace(day=1).strftime('%Y-%m-%d')
-        month_end = (datetime.now() - timedelta(days=30*(i-1))).replace(day=1).strftime('%Y-%m-%d') if i > 0 else datetime.now().strftime('%Y-%m-%d')
-        
-        result = conn.execute(f'''
-            SELECT COALESCE(SUM(amount), 0) as total 
-            FROM transactions 
-            WHERE account_id IN ({placeholders}) 
-            AND transaction_type IN ('payment', 'withdrawal')
-            AND created_at >= ? AND created_at < ?
-        ''', account_ids + [month_start, month_end]).fetchone()
-        
-        trends.append({
-            'month': month_start[:7],
-            'total': result['total'],
-            'month_name': datetime.strptime(month_start[:7], '%Y-%m').strftime('%B %Y')
-        })
-    
+    trends, categories = monthly_expense_trends(conn, account_ids, months, by_category=by_category)
     conn.close()
-    return jsonify({'trends': trends, 'months_analyzed': months})
+    
+    result = {'trends': trends, 'months_analyzed': months}
+    if by_category:
+        result['categories'] = categories
+    return jsonify(result)
 
 @app.route('/api/alerts', methods=['GET', 'POST'])
 @login_required
+@read_only
 def manage_alerts():
     """Get or create alerts"""
     user_id = session['user_id']
-    conn = get_db_connection()
     
     if request.method == 'GET':
         unread_only = request.args.get('unread_only', 'false') == 'true'
-        query = 'SELECT * FROM alerts WHERE user_id = ?'
-        params = [user_id]
-        
-        if unread_only:
-            query += ' AND is_read = 0'
-        
-        query += ' ORDER BY created_at DESC LIMIT 50'
-        alerts = conn.execute(query, params).fetchall()
+        conn = get_db_connection()
+        alerts = conn.execute(alerts_sql(unread_only), (user_id,)).fetchall()
         conn.close()
         return jsonify({'alerts': [dict(a) for a in alerts]})
     
@@ -1378,10 +2003,8 @@ def manage_alerts():
     alert_type = data.get('alert_type', 'info')
     message = data.get('message', '')
     
-    conn.execute('INSERT INTO alerts (user_id, alert_type, message) VALUES (?, ?, ?)',
-                (user_id, alert_type, message))
-    conn.commit()
-    conn.close()
+    apply_write(user_id, execute('INSERT INTO alerts (user_id, alert_type, message) VALUES (?, ?, ?)',
+                                 (user_id, alert_type, message)))
     return jsonify({'success': True, 'message': 'Alert created'})
 
 @app.route('/api/alerts/<int:alert_id>/read', methods=['POST'])
@@ -1389,44 +2012,39 @@ def manage_alerts():
 def mark_alert_read(alert_id):
     """Mark alert as read"""
     user_id = session['user_id']
-    conn = get_db_connection()
-    conn.execute('UPDATE alerts SET is_read = 1 WHERE id = ? AND user_id = ?', (alert_id, user_id))
-    conn.commit()
-    conn.close()
+    apply_write(user_id, execute('UPDATE alerts SET is_read = 1 WHERE id = ? AND user_id = ?', (alert_id, user_id)))
     return jsonify({'success': True})
 
 @app.route('/api/search-transactions', methods=['GET'])
 @login_required
+@read_only
 def search_transactions():
-    """Search transactions by description"""
+    """Full-text search over descriptions, categories and tags, one page at a time"""
     user_id = session['user_id']
-    query = request.args.get('q', '').lower()
-    limit = int(request.args.get('limit', 50))
+    query = request.args.get('q', '')
+    sort = request.args.get('sort', 'recent')
+    if sort not in ('recent', 'relevance'):
+        return jsonify({'error': 'sort must be recent or relevance'}), 400
+    
+    try:
+        limit = page_size(request.args.get('limit'))
+        cursor = decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid pagination parameters'}), 400
     
     conn = get_db_connection()
-    accounts = conn.execute('SELECT id FROM accounts WHERE user_id = ?', (user_id,)).fetchall()
+    accounts = conn.execute(USER_ACCOUNT_IDS_SQL, (user_id,)).fetchall()
     account_ids = [acc['id'] for acc in accounts]
     
-    if not account_ids:
-        conn.close()
-        return jsonify({'transactions': []})
-    
-    placeholders = ','.join('?' * len(account_ids))
-    transactions = conn.execute(f'''
-        SELECT t.*, a.account_number 
-        FROM transactions t
-        JOIN accounts a ON t.account_id = a.id
-        WHERE t.account_id IN ({placeholders}) 
-        AND LOWER(t.description) LIKE ?
-        ORDER BY t.created_at DESC
-        LIMIT ?
-    ''', account_ids + [f'%{query}%', limit]).fetchall()
-    
+    transactions, next_cursor = search_index(conn, account_ids, query, limit, cursor, sort)
     conn.close()
-    return jsonify({'transactions': [dict(t) for t in transactions]})
+    for trans in transactions:
+        trans.pop('rank', None)
+    return jsonify({'transactions': transactions, 'next_cursor': next_cursor})
 
 @app.route('/api/account-statement', methods=['GET'])
 @login_required
+@read_only
 def account_statement():
     """Generate account statement"""
     user_id = session['user_id']
@@ -1437,39 +2055,45 @@ def account_statement():
     if not start_date:
         start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
     
-    conn = get_db_connection()
+    try:
+        limit = page_size(request.args.get('limit'))
+        cursor = decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({'error': 'Invalid pagination parameters'}), 400
+    
+    conn = begin_snapshot(get_db_connection())
     
     if account_number:
-        account = conn.execute('SELECT * FROM accounts WHERE account_number = ? AND user_id = ?', 
+        account = conn.execute(ACCOUNT_BY_NUMBER_SQL, 
                              (account_number, user_id)).fetchone()
         if not account:
             conn.close()
             return jsonify({'error': 'Account not found'}), 404
         account_id = account['id']
     else:
-        account = conn.execute('SELECT * FROM accounts WHERE user_id = ?', (user_id,)).fetchone()
+        account = conn.execute(USER_ACCOUNTS_SQL, (user_id,)).fetchone()
         if not account:
             conn.close()
             return jsonify({'error': 'No account found'}), 404
         account_id = account['id']
         account_number = account['account_number']
     
-    opening_balance = conn.execute('''
-        SELECT balance_after FROM transactions 
-        WHERE account_id = ? AND created_at < ?
-        ORDER BY created_at DESC LIMIT 1
-    ''', (account_id, start_date)).fetchone()
+    opening_balance = conn.execute(STATEMENT_OPENING_BALANCE_SQL, (account_id, start_date)).fetchone()
     
     opening_balance = opening_balance['balance_after'] if opening_balance else account['balance']
+    period_end = end_date + ' 23:59:59'
     
-    transactions = conn.execute('''
-        SELECT * FROM transactions 
-        WHERE account_id = ? AND created_at >= ? AND created_at <= ?
-        ORDER BY created_at ASC
-    ''', (account_id, start_date, end_date + ' 23:59:59')).fetchall()
+    totals = conn.execute(STATEMENT_TOTALS_SQL, (account_id, start_date, period_end)).fetchone()
     
-    total_deposits = sum(t['amount'] for t in transactions if t['transaction_type'] in ['deposit', 'transfer_in'])
-    total_withdrawals = sum(t['amount'] for t in transactions if t['transaction_type'] in ['withdrawal', 'payment', 'transfer_out'])
+    params = [account_id, start_date, period_end]
+    if cursor:
+        params.extend(cursor)
+    
+    transactions = conn.execute(statement_page_sql(bool(cursor)), params + [limit + 1]).fetchall()
+    transactions, next_cursor = paginate(transactions, limit)
+    
+    total_deposits = totals['total_deposits']
+    total_withdrawals = totals['total_withdrawals']
     closing_balance = account['balance']
     
     conn.close()
@@ -1482,89 +2106,57 @@ def account_statement():
         'total_deposits': total_deposits,
         'total_withdrawals': total_withdrawals,
         'transactions': [dict(t) for t in transactions],
-        'transaction_count': len(transactions)
+        'transaction_count': totals['transaction_count'],
+        'next_cursor': next_cursor
     })
 
 @app.route('/api/debt-payoff', methods=['POST'])
 @login_required
 def debt_payoff_calculator():
-    """Calculate debt payoff strategies"""
-    data = request.json
-    debts = data.get('debts', [])
-    monthly_payment = float(data.get('monthly_payment', 0))
+    """Compare debt payoff strategies, paying all minimums and rolling freed payments over"""
+    data = request.json or {}
+    debts = data.get('debts')
     strategy = data.get('strategy', 'snowball')
-    
+    custom_order = data.get('custom_order')
+    try:
+        monthly_payment = float(data.get('monthly_payment', 0))
+    except (TypeError, ValueError):
+        monthly_payment = 0
+    
+    if data.get('use_saved_debts') or debts is None:
+        conn = get_db_connection()
+        debts = load_user_debts(conn, session['user_id'])
+        conn.close()
     if not debts or monthly_payment <= 0:
         return jsonify({'error': 'Invalid parameters'}), 400
     
-    if strategy == 'snowball':
-        sorted_debts = sorted(debts, key=lambda x: x['balance'])
-    else:
-        sorted_debts = sorted(debts, key=lambda x: x.get('interest_rate', 0), reverse=True)
-    
-    total_months = 0
-    total_interest = 0
-    payoff_plan = []
-    remaining_payment = monthly_payment
-    
-    for debt in sorted_debts:
-        balance = debt['balance']
-        min_payment = debt.get('minimum_payment', 0)
-        interest_rate = debt.get('interest_rate', 0) / 100 / 12
-        
-        months = 0
-        interest_paid = 0
-        
-        while balance > 0.01 and months < 600:
-            monthly_interest = balance * interest_rate
-            interest_paid += monthly_interest
-            balance += monthly_interest
-            
-            payment = min(remaining_payment, balance) if remaining_payment > 0 else min_payment
-            balance -= payment
-            months += 1
-            
-            if balance <= 0.01:
-                remaining_payment = payment - balance
-                balance = 0
-        
-        payoff_plan.append({
-            'debt_name': debt['name'],
-            'months': months,
-            'total_paid': debt['balance'] + interest_paid,
-            'interest_paid': interest_paid
-        })
-        
-        total_months += months
-        total_interest += interest_paid
-        
-        if remaining_payment <= 0:
-            break
-    
-    return jsonify({
-        'strategy': strategy,
-        'monthly_payment': monthly_payment,
-        'total_months': total_months,
-        'total_years': round(total_months / 12, 1),
-        'total_interest': round(total_interest, 2),
-        'payoff_plan': payoff_plan
-    })
+    strategies = data.get('strategies') or ['snowball', 'avalanche'] + (['custom'] if custom_order else [])
+    if strategy not in strategies:
+        strategies = [strategy] + list(strategies)
+    try:
+        result = simulate_payoff(debts, monthly_payment, strategies, custom_order)
+    except DebtInputError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    comparison = {name: result.summary(name) for name in result.strategies}
+    response = dict(comparison[strategy])
+    response['comparison'] = comparison
+    response['recommended'] = min(comparison, key=lambda name: (not comparison[name]['debt_free'],
+                                                                comparison[name]['total_interest']))
+    if data.get('include_schedule'):
+        response['schedule'] = list(result.schedule(strategy))
+    return jsonify(response)
 
 @app.route('/api/recurring-transactions', methods=['GET', 'POST'])
 @login_required
+@read_only
 def manage_recurring_transactions():
     """Get or create recurring transactions"""
     user_id = session['user_id']
     conn = get_db_connection()
     
     if request.method == 'GET':
-        recurring = conn.execute('''
-            SELECT rt.*, a.account_number 
-            FROM recurring_transactions rt
-            JOIN accounts a ON rt.account_id = a.id
-            WHERE rt.user_id = ? AND rt.is_active = 1
-            ORDER BY rt.next_date
-        ''', (user_id,)).fetchall()
+        recurring = conn.execute(ACTIVE_RECURRING_SQL, (user_id,)).fetchall()
         conn.close()
         return jsonify({'recurring_transactions': [dict(r) for r in recurring]})
     
@@ -1585,16 +2177,19 @@ def manage_recurring_transactions():
     
     conn.execute('''
         INSERT INTO recurring_transactions 
-        (user_id, account_id, description, amount, transaction_type, category, frequency, next_date)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (user_id, account_id, description, amount, transaction_type, category, frequency, next_date))
+        (user_id, account_id, description, amount, transaction_type, category, frequency, next_date, anchor_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (user_id, account_id, description, amount, transaction_type, category, frequency, next_date, next_date))
     
     conn.commit()
     conn.close()
+    response_cache.bump(user_id)
     return jsonify({'success': True, 'message': 'Recurring transaction created'})
 
 @app.route('/api/financial-calendar', methods=['GET'])
 @login_required
+@cached_view('financial-calendar', args=('month',))
+@read_only
 def financial_calendar():
     """Get financial calendar"""
     user_id = session['user_id']
@@ -1605,21 +2200,9 @@ def financial_calendar():
     next_month = (datetime.strptime(month_start, '%Y-%m-%d') + timedelta(days=32)).replace(day=1)
     month_end = (next_month - timedelta(days=1)).strftime('%Y-%m-%d')
     
-    bills = conn.execute('''
-        SELECT * FROM bills 
-        WHERE user_id = ? AND due_date >= ? AND due_date <= ?
-        ORDER BY due_date
-    ''', (user_id, month_start, month_end)).fetchall()
-    
-    recurring = conn.execute('''
-        SELECT * FROM recurring_transactions 
-        WHERE user_id = ? AND is_active = 1 AND next_date >= ? AND next_date <= ?
-    ''', (user_id, month_start, month_end)).fetchall()
-    
-    goals = conn.execute('''
-        SELECT * FROM savings_goals 
-        WHERE user_id = ? AND target_date >= ? AND target_date <= ?
-    ''', (user_id, month_start, month_end)).fetchall()
+    bills = conn.execute(CALENDAR_BILLS_SQL, (user_id, month_start, month_end)).fetchall()
+    recurring = conn.execute(CALENDAR_RECURRING_SQL, (user_id, month_start, month_end)).fetchall()
+    goals = conn.execute(CALENDAR_GOALS_SQL, (user_id, month_start, month_end)).fetchall()
     
     conn.close()
     
@@ -1659,6 +2242,123 @@ def financial_calendar():
         'goals_count': len([c for c in calendar if c['type'] == 'goal'])
     })
 
+# Endpoints that manage the session or stream, which a batch cannot run
+BATCH_EXCLUDED_ENDPOINTS = {'batch', 'login', 'logout', 'register', 'export_transactions', 'import_statement',
+                            'index', 'static'}
+
+def run_batch_item(item, parent_session):
+    """Dispatch one batch entry in-process and return (status, body)"""
+    if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+        return 400, {'error': 'Each request needs a path'}
+    method = str(item.get('method', 'GET')).upper()
+    builder = EnvironBuilder(path=item['path'], method=method, base_url=request.host_url,
+                             json=item.get('body') if method not in ('GET', 'HEAD') else None)
+    ctx = app.request_context(builder.get_environ())
+    ctx.session = parent_session
+    with ctx:
+        if not request.path.startswith('/api/') or request.endpoint in BATCH_EXCLUDED_ENDPOINTS:
+            return 400, {'error': f'{request.path} cannot be batched'}
+        # Dispatch without finalize_request: the response is not sent, so
+        # the shared session must not be saved once per item
+        try:
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    rv = app.dispatch_request()
+            except HTTPException as e:
+                return e.code, {'error': e.name}
+            except Exception as e:
+                rv = app.handle_user_exception(e)
+            resp = app.make_response(rv)
+        except Exception:
+            app.log_exception(sys.exc_info())
+            return 500, {'error': 'Internal server error'}
+        return resp.status_code, resp.get_json(silent=True) if resp.is_json else resp.get_data(as_text=True)
+
+@app.route('/api/batch', methods=['POST'])
+@login_required
+def batch():
+    """Run several API calls in one round trip on one connection"""
+    data = request.get_json(silent=True) or {}
+    items = data.get('requests')
+    atomic = bool(data.get('atomic', False))
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'requests must be a non-empty list'}), 400
+    if len(items) > app.config['BATCH_MAX_REQUESTS']:
+        return jsonify({'error': f"At most {app.config['BATCH_MAX_REQUESTS']} requests per batch"}), 400
+    
+    user_id = session['user_id']
+    parent_session = session._get_current_object()
+    conn = get_db_connection()
+    if atomic:
+        conn.execute('BEGIN IMMEDIATE')
+    g.shared_connection = SharedConnection(conn, defer_commit=atomic)
+    results = []
+    failed = False
+    try:
+        for item in items:
+            if failed and atomic:
+                results.append({'status': 424, 'body': {'error': 'Skipped after an earlier failure'}})
+                continue
+            status, body = run_batch_item(item, parent_session)
+            results.append({'status': status, 'body': body})
+            if status >= 400:
+                failed = True
+                if not atomic and conn.in_transaction:
+                    # Drop half-done writes of the failed call only
+                    conn.rollback()
+    finally:
+        g.shared_connection = None
+    
+    committed = None
+    if atomic:
+        committed = not failed
+        if committed:
+            conn.commit()
+        else:
+            conn.rollback()
+        # Handlers bumped the data version before the outcome was known;
+        # bump again so nothing cached in between survives
+        response_cache.bump(user_id)
+    conn.close()
+    
+    result = {'results': results}
+    if atomic:
+        result['committed'] = committed
+    return jsonify(result)
+
+def shard_stats():
+    """Pool and write queue counters of every shard opened so far"""
+    databases = {}
+    for shard in range(app.config['SHARDS']):
+        pools = {read: _shard_pools.get((shard, read)) for read in (False, True)}
+        databases[str(shard)] = {
+            'path': shard_path(app.config['DATABASE'], shard),
+            'db_pool': pools[False].stats() if pools[False] else None,
+            'db_read_pool': pools[True].stats() if pools[True] else None,
+            'write_queue': write_queues[shard].stats() if shard in write_queues else None,
+        }
+    return {'count': app.config['SHARDS'], 'databases': databases}
+
+@app.route('/api/metrics', methods=['GET'])
+@login_required
+def metrics():
+    """Get internal performance counters"""
+    main_queue = get_write_queue(MAIN_DATABASE)
+    return jsonify({
+        'db_pool': get_db_pool().stats(),
+        'db_read_pool': get_read_pool().stats(),
+        'latency': latency.stats(),
+        'response_cache': response_cache.stats(),
+        'password_hasher': password_hasher.stats(),
+        'scheduler': scheduler.stats(),
+        'exchange_rates': exchange_rates.stats(),
+        'ledger_writes': ledger_writes.stats(),
+        'write_queue': main_queue.stats() if main_queue is not None else {'enabled': False},
+        'shards': shard_stats()
+    })
+
 if __name__ == '__main__':
     init_db()
+    scheduler.start()
     app.run(debug=True, port=5000)
@@ -0,0 +1,277 @@
+"""
+Finance Assistant Bot - ASGI Entry Point
+========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Serves the Flask API from an ASGI server with request work on a dedicated executor.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+
+Run with:  uvicorn asgi:application --port 5000
+"""
+
+import asyncio
+import io
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app import app, init_db, scheduler
+
+# Chunks of a streamed response allowed in flight between the worker
+# thread and the event loop before the worker waits for the client
+_STREAM_BUFFER = 8
+
+# Read size of the request body stream handed to the app
+_BODY_BUFFER = 64 * 1024
+
+# Largest request body accepted; bigger ones are answered with 413
+MAX_BODY_SIZE = 32 * 1024 * 1024
+
+
+class ClientDisconnected(Exception):
+    """Raised in the worker thread when the client has gone away"""
+
+
+class AsgiAdapter:
+    """ASGI application running a WSGI app on a bounded thread pool.
+
+    Connections and keep-alive are handled by coroutines on the event
+    loop, so idle clients cost no thread. Each request is handed to one
+    executor thread, which runs the Flask view (all of its SQLite work
+    included) and its streamed response from start to finish, keeping
+    Flask's context locals and the pool's thread affinity intact. The
+    request body reaches the view as it reads it, up to ``max_body_size``
+    bytes. Because the views themselves are unchanged, every JSON contract
+    is identical to the threaded server.
+    """
+
+    def __init__(self, wsgi_app, max_workers=16, on_startup=None, max_body_size=MAX_BODY_SIZE):
+        self.wsgi_app = wsgi_app
+        self.max_workers = max_workers
+        self.max_body_size = max_body_size
+        self.on_startup = on_startup
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix='asgi-worker')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if self.on_startup:
+                    await asyncio.get_running_loop().run_in_executor(self.executor, self.on_startup)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        loop = asyncio.get_running_loop()
+        length = _content_length(scope)
+        if length is not None and length > self.max_body_size:
+            await _send_plain(send, 413, b'Request Entity Too Large')
+            return
+
+        queue = asyncio.Queue(_STREAM_BUFFER)
+        disconnected = threading.Event()
+
+        def put(message):
+            if disconnected.is_set():
+                raise ClientDisconnected()
+            asyncio.run_coroutine_threadsafe(queue.put(message), loop).result()
+
+        body = io.BufferedReader(RequestBody(receive, loop, self.max_body_size, disconnected), _BODY_BUFFER)
+        worker = loop.run_in_executor(self.executor, self._run, build_environ(scope, body, length), put)
+        get = None
+        try:
+            while True:
+                get = asyncio.ensure_future(queue.get())
+                await asyncio.wait((get, worker), return_when=asyncio.FIRST_COMPLETED)
+                if not get.done():
+                    # The worker ended without finishing the response. Its
+                    # exception is raised below, so the server answers 500
+                    # or drops the connection instead of leaving it hanging.
+                    get.cancel()
+                    break
+                message = get.result()
+                await send(message)
+                if message['type'] == 'http.response.body' and not message['more_body']:
+                    break
+        except BaseException:
+            disconnected.set()
+            if get is not None:
+                get.cancel()
+            while not worker.done():
+                while not queue.empty():
+                    queue.get_nowait()
+                await asyncio.sleep(0.01)
+            raise
+        await worker
+
+    def _run(self, environ, put):
+        """Run the WSGI app on the current executor thread"""
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response.get('sent'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                   for name, value in headers]
+
+        def send_start():
+            response['sent'] = True
+            put({'type': 'http.response.start', 'status': response['status'], 'headers': response['headers']})
+
+        try:
+            result = self.wsgi_app(environ, start_response)
+        except ClientDisconnected:
+            return
+        except Exception:
+            response.update(status=500, headers=[(b'content-type', b'text/plain')])
+            send_start()
+            put({'type': 'http.response.body', 'body': b'Internal Server Error', 'more_body': False})
+            raise
+        try:
+            for chunk in result:
+                if not chunk:
+                    continue
+                if not response.get('sent'):
+                    send_start()
+                put({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            if not response.get('sent'):
+                send_start()
+            put({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        except ClientDisconnected:
+            pass
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+
+class RequestBody(io.RawIOBase):
+    """wsgi.input that receives the request body from the event loop as the app reads it.
+
+    Nothing is buffered ahead of the reader, so a large statement upload
+    streams into the importer. Reading past ``limit`` bytes raises
+    RequestEntityTooLarge, which Flask turns into a 413 response.
+    """
+
+    def __init__(self, receive, loop, limit, disconnected):
+        self._receive = receive
+        self._loop = loop
+        self._limit = limit
+        self._disconnected = disconnected
+        self._chunk = memoryview(b'')
+        self._more = True
+        self.received = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._chunk and self._more:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message['type'] == 'http.disconnect':
+                self._disconnected.set()
+                raise ClientDisconnected()
+            self._chunk = memoryview(message.get('body', b''))
+            self._more = message.get('more_body', False)
+            self.received += len(self._chunk)
+            if self.received > self._limit:
+                self._more = False
+                self._chunk = memoryview(b'')
+                raise RequestEntityTooLarge()
+        count = min(len(buffer), len(self._chunk))
+        buffer[:count] = self._chunk[:count]
+        self._chunk = self._chunk[count:]
+        return count
+
+
+def _content_length(scope):
+    for name, value in scope.get('headers', []):
+        if name.lower() == b'content-length':
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+async def _send_plain(send, status, body):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'text/plain'), (b'content-length', str(len(body)).encode())]})
+    await send({'type': 'http.response.body', 'body': body, 'more_body': False})
+
+
+def build_environ(scope, body, content_length=None):
+    """Translate an ASGI HTTP scope into a WSGI environ reading the request from ``body``"""
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        # Without a Content-Length (chunked upload) read until the body ends
+        'wsgi.input_terminated': content_length is None,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    if content_length is not None:
+        environ['CONTENT_LENGTH'] = str(content_length)
+    if scope.get('client'):
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = scope['client'][0], str(scope['client'][1])
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+            continue
+        if name == 'CONTENT_LENGTH':
+            continue
+        key = f'HTTP_{name}'
+        if key in environ:
+            value = environ[key] + ('; ' if name == 'COOKIE' else ',') + value
+        environ[key] = value
+    return environ
+
+
+def startup():
+    init_db()
+    scheduler.start()
+
+
+application = AsgiAdapter(app,
+                          max_workers=int(os.environ.get('FINANCE_BOT_ASGI_WORKERS', app.config['DB_POOL_SIZE'])),
+                          on_startup=startup,
+                          max_body_size=int(os.environ.get('FINANCE_BOT_ASGI_MAX_BODY', MAX_BODY_SIZE)))
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(application, host='127.0.0.1', port=int(os.environ.get('PORT', 5000)))
@@ -0,0 +1,183 @@
+"""
+Finance Assistant Bot - Serving Mode Benchmark
+==============================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Holds many idle keep-alive clients against the threaded and ASGI servers.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 5099
+
+THREADED_SERVER = '''
+import sys
+sys.path.insert(0, {root!r})
+from werkzeug.serving import make_server
+import app
+app.init_db()
+make_server("127.0.0.1", {port}, app.app, threaded=True).serve_forever()
+'''
+
+
+def start_server(mode, tmp):
+    env = dict(os.environ, FINANCE_BOT_DB=os.path.join(tmp, 'bench.db'), FINANCE_BOT_SESSION_BACKEND='sqlite')
+    if mode == 'threaded':
+        command = [sys.executable, '-c', THREADED_SERVER.format(root=ROOT, port=PORT)]
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:application', '--port', str(PORT),
+                   '--log-level', 'warning', '--backlog', '8192']
+    return subprocess.Popen(command, cwd=ROOT if mode == 'asgi' else tmp, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def process_usage(pid):
+    """Return (threads, RSS in MB) of a process from /proc"""
+    fields = {}
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            name, _, value = line.partition(':')
+            fields[name] = value.strip()
+    return int(fields['Threads']), int(fields['VmRSS'].split()[0]) / 1024
+
+
+class Connection:
+    """Minimal HTTP/1.1 client over asyncio streams.
+
+    Keeps the socket open between requests and reconnects when the server
+    answers with ``Connection: close`` (the Werkzeug server always does).
+    """
+
+    def __init__(self, reader, writer, cookie=None):
+        self.reader = reader
+        self.writer = writer
+        self.cookie = cookie
+
+    @classmethod
+    async def open(cls, cookie=None):
+        reader, writer = await asyncio.open_connection('127.0.0.1', PORT)
+        return cls(reader, writer, cookie)
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection('127.0.0.1', PORT)
+        payload = json.dumps(body).encode() if body is not None else b''
+        head = [f'{method} {path} HTTP/1.1', f'Host: 127.0.0.1:{PORT}', f'Content-Length: {len(payload)}',
+                'Content-Type: application/json']
+        if self.cookie:
+            head.append(f'Cookie: {self.cookie}')
+        self.writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + payload)
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        length = 0
+        keep_alive = True
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+            elif name.lower() == 'set-cookie':
+                self.cookie = value.strip().split(';', 1)[0]
+            elif name.lower() == 'connection' and value.strip().lower() == 'close':
+                keep_alive = False
+        await self.reader.readexactly(length)
+        if not keep_alive:
+            self.close()
+        return int(status_line.split()[1])
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+async def wait_for_server(timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = await Connection.open()
+            conn.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError('server did not start')
+
+
+async def measure(pid, idle_clients, probes):
+    await wait_for_server()
+    login = await Connection.open()
+    await login.request('POST', '/api/login', {'username': 'demo', 'password': 'demo123'})
+    cookie = login.cookie
+
+    # Idle clients: connected, between requests. A thread-per-connection
+    # server parks a thread on each one waiting for its next request line.
+    started = time.perf_counter()
+    idle = []
+    for batch in range(0, idle_clients, 200):
+        idle.extend(await asyncio.gather(*[Connection.open(cookie)
+                                           for _ in range(min(200, idle_clients - batch))]))
+    await asyncio.sleep(1)
+    connect_seconds = time.perf_counter() - started
+    threads, rss = process_usage(pid)
+
+    samples = []
+    for _ in range(probes):
+        began = time.perf_counter()
+        await login.request('POST', '/api/chat', {'message': 'balance'})
+        samples.append((time.perf_counter() - began) * 1000)
+
+    # Every idle connection must still be usable
+    statuses = await asyncio.gather(*[conn.request('GET', '/api/account') for conn in idle],
+                                    return_exceptions=True)
+    alive = sum(1 for status in statuses if status == 200)
+    for conn in idle + [login]:
+        conn.close()
+    return {
+        'connect_s': connect_seconds, 'threads': threads, 'rss_mb': rss, 'alive': alive,
+        'probe_p50': statistics.median(samples), 'probe_max': max(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Threaded vs ASGI keep-alive capacity')
+    parser.add_argument('--clients', type=int, nargs='*', default=[100, 1000, 3000])
+    parser.add_argument('--probes', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f'{"mode":<9} {"idle":>6} {"alive":>6} {"threads":>8} {"rss MB":>7} {"open s":>7} '
+          f'{"chat p50 ms":>12} {"chat max ms":>12}')
+    for clients in args.clients:
+        for mode in ('threaded', 'asgi'):
+            with tempfile.TemporaryDirectory() as tmp:
+                server = start_server(mode, tmp)
+                try:
+                    r = asyncio.run(measure(server.pid, clients, args.probes))
+                finally:
+                    server.terminate()
+                    server.wait()
+            print(f'{mode:<9} {clients:>6} {r["alive"]:>6} {r["threads"]:>8} {r["rss_mb"]:>7.1f} '
+                  f'{r["connect_s"]:>7.2f} {r["probe_p50"]:>12.2f} {r["probe_max"]:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
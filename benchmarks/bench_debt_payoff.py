@@ -0,0 +1,109 @@
+"""
+Finance Assistant Bot - Debt Payoff Benchmark
+=============================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Times the vectorized payoff engine against a per-debt Python loop.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from debts import payoff_order, simulate_payoff  # noqa: E402
+
+
+def make_debts(count, seed=7):
+    rng = random.Random(seed)
+    debts = []
+    for i in range(count):
+        balance = round(rng.uniform(500, 40000), 2)
+        rate = round(rng.uniform(3, 29), 2)
+        # Minimums barely above the interest, as on most revolving credit
+        debts.append({'name': f'Debt {i + 1}', 'balance': balance, 'interest_rate': rate,
+                      'minimum_payment': round(balance * (rate / 1200 + 0.001), 2)})
+    return debts
+
+
+def python_payoff(debts, monthly_payment, strategy, max_months, custom_order=None):
+    """The same rollover simulation written as nested Python loops over months and debts"""
+    order = payoff_order(debts, strategy, custom_order)
+    balances = [debt['balance'] for debt in debts]
+    rates = [debt['interest_rate'] / 100 / 12 for debt in debts]
+    interest_paid = 0.0
+    for month in range(max_months):
+        if not any(balances):
+            break
+        payments = []
+        for i, balance in enumerate(balances):
+            interest = balance * rates[i]
+            interest_paid += interest
+            balances[i] = balance + interest
+            payments.append(min(debts[i]['minimum_payment'], balances[i]))
+        extra = monthly_payment - sum(payments)
+        for i in order:
+            share = min(extra, balances[i] - payments[i])
+            payments[i] += share
+            extra -= share
+        for i in range(len(balances)):
+            balances[i] -= payments[i]
+            if balances[i] < 0.005:
+                balances[i] = 0.0
+    return month, interest_paid
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Debt payoff engine benchmark')
+    parser.add_argument('--debts', type=int, default=50)
+    parser.add_argument('--years', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    debts = make_debts(args.debts)
+    months = args.years * 12
+    # Just above the minimums, so the schedule runs for most of the horizon
+    budget = round(sum(debt['minimum_payment'] for debt in debts) * 1.01, 2)
+    strategies = ['snowball', 'avalanche', 'custom']
+
+    vector_ms, result = timed(lambda: simulate_payoff(debts, budget, strategies, custom_order=[0, 1, 2],
+                                                      max_months=months), args.repeat)
+    python_ms, _ = timed(lambda: [python_payoff(debts, budget, strategy, months, custom_order=[0, 1, 2])
+                                  for strategy in strategies], max(1, args.repeat // 5))
+    schedule_ms, rows = timed(lambda: list(result.schedule('avalanche')), args.repeat)
+
+    print(f'{args.debts} debts x {args.years} years x {len(strategies)} strategies, budget {budget:.2f}/month')
+    print(f'{"engine":<28} {"median ms":>10}')
+    print(f'{"vectorized (one call)":<28} {vector_ms:>10.2f}')
+    print(f'{"python loops (3 runs)":<28} {python_ms:>10.2f}')
+    print(f'{"build one full schedule":<28} {schedule_ms:>10.2f}   ({len(rows)} months)')
+    for strategy in strategies:
+        summary = result.summary(strategy)
+        print(f'  {strategy:<10} months {summary["total_months"]:>4}  interest {summary["total_interest"]:>12,.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Finance Assistant Bot - Currency Conversion Benchmark
+=====================================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Times portfolio totals through the cross-rate matrix against per-amount conversions.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from currencies import RateMatrix  # noqa: E402
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exchange-rate matrix benchmark')
+    parser.add_argument('--currencies', type=int, default=40)
+    parser.add_argument('--amounts', type=int, nargs='*', default=[10, 1000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    codes = ['USD'] + [f'C{i:02d}' for i in range(1, args.currencies)]
+    per_base = [1.0] + [rng.uniform(0.1, 200) for _ in codes[1:]]
+    rates = dict(zip(codes, per_base))
+    build_ms, matrix = timed(lambda: RateMatrix(codes, per_base, ['2026-01-01'] * len(codes)), args.repeat)
+    print(f'{args.currencies} currencies, matrix build {build_ms:.3f} ms')
+    print(f'{"amounts":>8} {"matrix ms":>10} {"per-amount ms":>14} {"difference":>12}')
+    for count in args.amounts:
+        amounts = [rng.uniform(-5000, 50000) for _ in range(count)]
+        currencies = [rng.choice(codes) for _ in range(count)]
+        matrix_ms, total = timed(lambda: matrix.total(amounts, currencies, 'EUR' if 'EUR' in rates else 'C01'),
+                                 args.repeat)
+        # One dict lookup and division per amount, as the old endpoint worked it out
+        target = 'EUR' if 'EUR' in rates else 'C01'
+        loop_ms, expected = timed(lambda: sum(amount * (rates[target] / rates[currency])
+                                              for amount, currency in zip(amounts, currencies)), args.repeat)
+        print(f'{count:>8} {matrix_ms:>10.3f} {loop_ms:>14.3f} {abs(total - expected):>12.2e}')
+
+
+if __name__ == '__main__':
+    main()
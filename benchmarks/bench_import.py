@@ -0,0 +1,127 @@
+"""
+Finance Assistant Bot - Statement Import Benchmark
+==================================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Times a bulk CSV import against row-at-a-time inserts and reports peak memory.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DESCRIPTIONS = ['Grocery store', 'Coffee shop', 'Fuel station', 'Salary', 'Electric bill', 'Restaurant',
+                'Online order', 'Pharmacy', 'Gym membership', 'Bookshop']
+
+
+def write_statement(path, rows):
+    """Write a CSV statement of ``rows`` random transactions"""
+    rng = random.Random(42)
+    day = datetime(2024, 1, 1)
+    with open(path, 'w', newline='') as statement:
+        statement.write('Date,Description,Amount,Category\n')
+        for i in range(rows):
+            when = day + timedelta(seconds=i * 300)
+            amount = rng.uniform(-200, 50) if i % 30 else 2500.0
+            statement.write(f'{when:%Y-%m-%d %H:%M:%S},{rng.choice(DESCRIPTIONS)},{amount:.2f},Other\n')
+
+
+def fresh_database(tmp, name):
+    """Point the app at a new database with the demo user and return (app module, account id)"""
+    os.environ['FINANCE_BOT_DB'] = os.path.join(tmp, name)
+    import app as finance_app
+    finance_app.init_db()
+    with finance_app.app.app_context():
+        conn = finance_app.get_db_connection()
+        account_id = conn.execute("SELECT id FROM accounts WHERE account_number = 'ACC001234567'").fetchone()['id']
+        conn.close()
+    return finance_app, account_id
+
+
+def naive_import(conn, account_id, path):
+    """The per-row path the endpoint replaces: one INSERT, balance UPDATE and commit per line"""
+    from importer import parse_csv
+    with open(path, newline='') as lines:
+        for _, record in parse_csv(lines):
+            balance = conn.execute('SELECT balance FROM accounts WHERE id = ?', (account_id,)).fetchone()['balance']
+            balance += record['amount']
+            conn.execute('UPDATE accounts SET balance = ? WHERE id = ?', (balance, account_id))
+            conn.execute('''INSERT INTO transactions
+                            (account_id, transaction_type, amount, description, category, balance_after, created_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                         (account_id, record['transaction_type'], abs(record['amount']), record['description'],
+                          record['category'], balance, record['created_at']))
+            conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk statement import benchmark')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--naive-rows', type=int, default=5000,
+                        help='rows for the per-row baseline (it is much slower)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        path = os.path.join(tmp, 'statement.csv')
+        write_statement(path, args.rows)
+        finance_app, account_id = fresh_database(tmp, 'bench.db')
+        from importer import import_transactions
+
+        with finance_app.app.app_context():
+            conn = finance_app.get_db_connection()
+            started = time.perf_counter()
+            with open(path, newline='') as lines:
+                summary = import_transactions(conn, account_id, lines, 'csv')
+            elapsed = time.perf_counter() - started
+
+            started = time.perf_counter()
+            with open(path, newline='') as lines:
+                again = import_transactions(conn, account_id, lines, 'csv')
+            reimport = time.perf_counter() - started
+
+            # tracemalloc slows Python down a lot, so measure memory on a separate pass
+            other = conn.execute("SELECT id FROM accounts WHERE account_number = 'ACC001234568'").fetchone()['id']
+            tracemalloc.start()
+            with open(path, newline='') as lines:
+                import_transactions(conn, other, lines, 'csv')
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            drift = finance_app.verify_rollups(conn)
+            conn.close()
+
+        print(f'bulk import   {summary["imported"]:>7} rows  {elapsed:7.2f}s  '
+              f'{summary["imported"] / elapsed:>9.0f} rows/s  peak Python memory {peak / 1e6:.1f} MB')
+        print(f're-import     {again["duplicates"]:>7} dups  {reimport:7.2f}s  imported {again["imported"]}')
+        print(f'rollup drift  {len(drift)} buckets')
+
+        write_statement(path, args.naive_rows)
+        with finance_app.app.app_context():
+            conn = finance_app.get_db_connection()
+            started = time.perf_counter()
+            naive_import(conn, account_id, path)
+            naive = time.perf_counter() - started
+            conn.close()
+        print(f'per-row       {args.naive_rows:>7} rows  {naive:7.2f}s  {args.naive_rows / naive:>9.0f} rows/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Finance Assistant Bot - Loan Calculator Benchmark
+=================================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Times scenario grids and amortization schedules against per-scenario scalar loops.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from loans import Amortization, loan_grid  # noqa: E402
+
+
+def scalar_scenario(principal, annual_rate, term_years, extra):
+    """One scenario the way a client looping over the old endpoint works it out"""
+    rate = annual_rate / 100 / 12
+    periods = term_years * 12
+    if rate == 0:
+        payment = principal / periods
+    else:
+        payment = principal * (rate * (1 + rate) ** periods) / ((1 + rate) ** periods - 1)
+    balance, paid, count = principal, 0.0, 0
+    while balance > 1e-6:
+        interest = balance * rate
+        amount = min(payment + extra, balance + interest)
+        balance += interest - amount
+        paid += amount
+        count += 1
+    return payment, paid - principal, count
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Loan grid and amortization benchmark')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    principals = [50000 + 25000 * i for i in range(20)]
+    rates = [2 + 0.5 * i for i in range(16)]
+    terms = [10, 15, 20, 25, 30]
+    extras = [0, 100, 250, 500]
+    cells = len(principals) * len(rates) * len(terms) * len(extras)
+
+    grid_ms = timed(lambda: loan_grid(principals, rates, terms, extras), args.repeat)
+    scalar_ms = timed(lambda: [scalar_scenario(p, r, t, e) for p in principals for r in rates
+                               for t in terms for e in extras], 1)
+    schedule_ms = timed(lambda: list(Amortization(400000, 6.5, 30, 150).rows()), args.repeat * 10)
+
+    print(f'{"workload":<44} {"median ms":>10}')
+    print(f'{f"grid, {cells} scenarios, one call":<44} {grid_ms:>10.2f}')
+    print(f'{f"grid, {cells} scalar scenarios":<44} {scalar_ms:>10.2f}')
+    print(f'{"30-year schedule with extra payments":<44} {schedule_ms:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Finance Assistant Bot - Login Storm Load Test
+=============================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Measures chat and balance latency while many clients log in at once.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Client:
+    """Keep-alive JSON client holding the session cookie"""
+
+    def __init__(self, port):
+        self.conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        self.cookie = None
+
+    def request(self, method, path, body=None):
+        headers = {'Content-Type': 'application/json'}
+        if self.cookie:
+            headers['Cookie'] = self.cookie
+        self.conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+        resp = self.conn.getresponse()
+        resp.read()
+        cookie = resp.getheader('Set-Cookie')
+        if cookie:
+            self.cookie = cookie.split(';', 1)[0]
+        return resp.status
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def probe(port, seconds):
+    """Alternate chat 'balance' and /api/account calls, returning latencies in ms"""
+    client = Client(port)
+    client.request('POST', '/api/login', {'username': 'demo', 'password': 'demo123'})
+    samples = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        client.request('POST', '/api/chat', {'message': 'balance'})
+        client.request('GET', '/api/account')
+        samples.append((time.perf_counter() - started) * 500)
+    return samples
+
+
+def run_mode(seconds, stormers):
+    """Serve the app in this process and measure probe latency without and with a storm"""
+    sys.path.insert(0, ROOT)
+    from werkzeug.serving import make_server
+    import app as finance_app
+
+    finance_app.app.config['SESSION_FILE_DIR'] = os.path.join(os.getcwd(), 'flask_session')
+    finance_app.init_db()
+    server = make_server('127.0.0.1', 0, finance_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    baseline = probe(port, seconds)
+
+    stop = threading.Event()
+    logins = []
+
+    def storm():
+        client = Client(port)
+        while not stop.is_set():
+            status = client.request('POST', '/api/login', {'username': 'demo', 'password': 'demo123'})
+            logins.append(status)
+
+    threads = [threading.Thread(target=storm, daemon=True) for _ in range(stormers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+    loaded = probe(port, seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+
+    return {
+        'baseline_p50': statistics.median(baseline), 'baseline_p95': percentile(baseline, 0.95),
+        'storm_p50': statistics.median(loaded), 'storm_p95': percentile(loaded, 0.95),
+        'logins_ok': logins.count(200), 'logins_busy': logins.count(503),
+        'hasher': finance_app.password_hasher.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Login storm load test')
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--stormers', type=int, default=16)
+    parser.add_argument('--workers', type=int, nargs='*', default=[0, 1, 2],
+                        help='hash pool sizes to compare (0 = inline hashing)')
+    parser.add_argument('--mode', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.seconds, args.stormers)))
+        return
+
+    print(f'{args.stormers} concurrent login loops, probe = chat "balance" + GET /api/account (ms per call)')
+    print(f'{"hash workers":<13} {"base p50":>9} {"base p95":>9} {"storm p50":>10} {"storm p95":>10} '
+          f'{"logins":>7} {"503s":>6} {"max queue":>10}')
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, FINANCE_BOT_DB=os.path.join(tmp, 'bench.db'),
+                       FINANCE_BOT_PASSWORD_HASH_WORKERS=str(workers))
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), '--mode',
+                                     '--seconds', str(args.seconds), '--stormers', str(args.stormers)],
+                                    cwd=tmp, env=env, check=True, capture_output=True, text=True).stdout
+            r = json.loads(output.strip().splitlines()[-1])
+            label = 'inline' if workers == 0 else str(workers)
+            print(f'{label:<13} {r["baseline_p50"]:>9.2f} {r["baseline_p95"]:>9.2f} {r["storm_p50"]:>10.2f} '
+                  f'{r["storm_p95"]:>10.2f} {r["logins_ok"]:>7} {r["logins_busy"]:>6} '
+                  f'{r["hasher"]["max_queue_depth"]:>10}')
+
+
+if __name__ == '__main__':
+    main()
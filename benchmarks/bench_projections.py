@@ -0,0 +1,79 @@
+"""
+Finance Assistant Bot - Monte Carlo Projection Benchmark
+========================================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Times savings simulations inline and on a process pool, and checks seeded reproducibility.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from projections import run_projection, validate_projection  # noqa: E402
+
+
+def scalar_paths(params, paths):
+    """A few paths month by month in plain Python, for scale"""
+    import math
+    import random
+    rng = random.Random(params['seed'])
+    sigma = params['volatility'] / 100 / math.sqrt(12)
+    mu = math.log1p(params['expected_return'] / 100) / 12 - sigma ** 2 / 2
+    finals = []
+    for _ in range(paths):
+        value = params['principal']
+        for _ in range(params['months']):
+            value = value * math.exp(rng.gauss(mu, sigma)) + params['monthly_contribution']
+        finals.append(value)
+    return finals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo projection benchmark')
+    parser.add_argument('--paths', type=int, nargs='*', default=[10000, 50000, 200000])
+    parser.add_argument('--years', type=int, default=30)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f'{args.years}-year monthly projection, {args.workers} pool workers (cpu count {os.cpu_count()})')
+    print(f'{"paths":>7} {"inline s":>9} {"pool s":>8} {"same result":>12} {"p50 final":>12}')
+    with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        # Start the workers before timing anything
+        warm = validate_projection({'months': 12, 'paths': 20000, 'seed': 1})
+        run_projection(warm, executor)
+        for paths in args.paths:
+            params = validate_projection({'principal': 10000, 'monthly_contribution': 500,
+                                          'months': args.years * 12, 'expected_return': 7, 'volatility': 15,
+                                          'paths': paths, 'seed': 42, 'target_amount': 500000})
+            started = time.perf_counter()
+            inline = run_projection(params)
+            inline_s = time.perf_counter() - started
+            started = time.perf_counter()
+            pooled = run_projection(params, executor)
+            pool_s = time.perf_counter() - started
+            print(f'{paths:>7} {inline_s:>9.3f} {pool_s:>8.3f} {str(inline == pooled):>12} '
+                  f'{inline["percentiles"]["p50"]:>12,.0f}')
+
+    started = time.perf_counter()
+    scalar_paths(params, 1000)
+    print(f'plain Python, 1000 paths: {time.perf_counter() - started:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Finance Assistant Bot - Scheduler Throughput Benchmark
+======================================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Measures how fast the scheduler catches up on due recurring transactions and bills.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_mode(users, days, batch_size):
+    """Seed ``users`` users with due items ``days`` days behind, then run the scheduler twice"""
+    sys.path.insert(0, ROOT)
+    import app as finance_app
+    from scheduler import run_due
+
+    finance_app.init_db()
+    conn = finance_app.get_db_connection()
+    start = (date.today() - timedelta(days=days)).isoformat()
+    for user in range(users):
+        user_id = conn.execute("INSERT INTO users (username, email, password) VALUES (?, ?, 'x')",
+                               (f'user{user}', f'user{user}@example.com')).lastrowid
+        account_id = conn.execute('''INSERT INTO accounts (user_id, account_number, account_type, balance)
+                                     VALUES (?, ?, 'Checking', 1000000)''', (user_id, f'B{user:09d}')).lastrowid
+        conn.executemany('''INSERT INTO recurring_transactions
+                            (user_id, account_id, description, amount, transaction_type, category, frequency,
+                             next_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                         [(user_id, account_id, 'Salary', 2000, 'deposit', 'Income', 'monthly', start),
+                          (user_id, account_id, 'Gym', 30, 'payment', 'Health', 'weekly', start),
+                          (user_id, account_id, 'Coffee plan', 4, 'payment', 'Food & Dining', 'daily', start)])
+        conn.execute('''INSERT INTO bills (user_id, bill_type, amount, due_date, recurring)
+                        VALUES (?, 'Electricity', 90, ?, 1)''', (user_id, start))
+    conn.commit()
+
+    first = run_due(conn, batch_size=batch_size)
+    again = run_due(conn, batch_size=batch_size)
+    drift = finance_app.verify_rollups(conn)
+    conn.close()
+    return {'first': first, 'again': again, 'drift': len(drift)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scheduler catch-up throughput')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=30, help='how far behind the schedule is')
+    parser.add_argument('--batch-sizes', type=int, nargs='*', default=[1, 50, 200])
+    parser.add_argument('--mode', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--batch-size', type=int, default=200, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.users, args.days, args.batch_size)))
+        return
+
+    print(f'{args.users} users, 3 recurring transactions and 1 recurring bill each, {args.days} days behind')
+    print(f'{"batch":>6} {"posted":>8} {"bills":>6} {"batches":>8} {"seconds":>8} {"posts/s":>9} '
+          f'{"re-run s":>9} {"drift":>6}')
+    for batch_size in args.batch_sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, FINANCE_BOT_DB=os.path.join(tmp, 'bench.db'))
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), '--mode', '--users', str(args.users),
+                                     '--days', str(args.days), '--batch-size', str(batch_size)],
+                                    cwd=tmp, env=env, check=True, capture_output=True, text=True).stdout
+            r = json.loads(output.strip().splitlines()[-1])
+            first = r['first']
+            print(f'{batch_size:>6} {first["recurring_posted"]:>8} {first["bills_paid"]:>6} {first["batches"]:>8} '
+                  f'{first["seconds"]:>8.2f} {first["postings_per_second"]:>9.0f} {r["again"]["seconds"]:>9.3f} '
+                  f'{r["drift"]:>6}')
+
+
+if __name__ == '__main__':
+    main()
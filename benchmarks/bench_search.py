@@ -0,0 +1,97 @@
+"""
+Finance Assistant Bot - Search Benchmark
+========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Compares FTS5 transaction search with the LIKE substring scan.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import apply_migrations  # noqa: E402
+from search import _like_search, search_transactions  # noqa: E402
+
+MERCHANTS = ['Starbucks coffee', 'Grocery store', 'Shell fuel', 'Netflix subscription', 'Amazon order',
+             'Electricity bill', 'Uber ride', 'Pharmacy', 'Restaurant dinner', 'Gym membership',
+             'Bookstore', 'Hardware shop', 'Airline ticket', 'Hotel booking', 'Pet supplies']
+CATEGORIES = ['Food & Dining', 'Transportation', 'Shopping', 'Bills & Utilities', 'Entertainment',
+              'Healthcare', 'Travel']
+QUERIES = ['coffee', 'netflix', 'hotel', 'pharm', 'uber ride', 'zzzz']
+
+
+def build(path, rows, accounts):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = OFF')
+    apply_migrations(conn)
+    conn.execute("INSERT INTO users (username, email, password, full_name) VALUES ('bench', 'b@x', '', 'Bench')")
+    for i in range(accounts):
+        conn.execute("INSERT INTO accounts (user_id, account_number, account_type, balance) VALUES (1, ?, 'checking', 0)",
+                     (f'BENCH{i:06d}',))
+    rng = random.Random(42)
+
+    def generate():
+        for i in range(rows):
+            yield (rng.randint(1, accounts), 'payment', round(rng.uniform(1, 500), 2),
+                   f'{rng.choice(MERCHANTS)} #{rng.randint(1, 99999)}', rng.choice(CATEGORIES), 0,
+                   f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:00:00')
+
+    started = time.perf_counter()
+    conn.executemany('''INSERT INTO transactions
+                        (account_id, transaction_type, amount, description, category, balance_after, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)''', generate())
+    conn.commit()
+    print(f'loaded {rows} rows in {time.perf_counter() - started:.1f}s')
+    return conn
+
+
+def timed(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, len(result[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--accounts', type=int, default=4)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build(os.path.join(tmp, 'bench.db'), args.rows, args.accounts)
+        account_ids = list(range(1, args.accounts + 1))
+        print(f'{"query":<12} {"like ms":>10} {"fts ms":>10} {"fts rank ms":>12} {"speedup":>8}')
+        for query in QUERIES:
+            like_ms, _ = timed(lambda: _like_search(conn, account_ids, query, args.limit), args.repeat)
+            fts_ms, _ = timed(lambda: search_transactions(conn, account_ids, query, args.limit), args.repeat)
+            rank_ms, _ = timed(lambda: search_transactions(conn, account_ids, query, args.limit, sort='relevance'),
+                               args.repeat)
+            print(f'{query:<12} {like_ms:>10.2f} {fts_ms:>10.2f} {rank_ms:>12.2f} {like_ms / fts_ms:>7.1f}x')
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Finance Assistant Bot - Session Backend Benchmark
+=================================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Times the login_required fast path for each session backend.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_backend(requests):
+    """Measure one backend in this process (selected through the environment)"""
+    sys.path.insert(0, ROOT)
+    import app as finance_app
+    from flask import jsonify
+
+    app = finance_app.app
+    app.config['SESSION_FILE_DIR'] = os.path.join(os.getcwd(), 'flask_session')
+
+    @app.route('/bench/ping')
+    @finance_app.login_required
+    def bench_ping():
+        return jsonify({'ok': True})
+
+    finance_app.init_db()
+    client = app.test_client()
+
+    started = time.perf_counter()
+    for _ in range(requests // 10):
+        client.post('/api/login', json={'username': 'demo', 'password': 'demo123'})
+    login_us = (time.perf_counter() - started) / (requests // 10) * 1e6
+
+    for _ in range(100):
+        client.get('/bench/ping')
+    started = time.perf_counter()
+    for _ in range(requests):
+        assert client.get('/bench/ping').status_code == 200
+    ping_us = (time.perf_counter() - started) / requests * 1e6
+    return {'login_us': login_us, 'authenticated_us': ping_us}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Session backend benchmark')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--backend', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args.requests)))
+        return
+
+    print(f'{"backend":<12} {"login us":>10} {"auth req us":>12} {"auth req/s":>11}')
+    for backend in ('filesystem', 'sqlite', 'cookie'):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, FINANCE_BOT_SESSION_BACKEND=backend,
+                       FINANCE_BOT_DB=os.path.join(tmp, 'bench.db'))
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), '--backend', backend,
+                                     '--requests', str(args.requests)],
+                                    cwd=tmp, env=env, check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f'{backend:<12} {result["login_us"]:>10.1f} {result["authenticated_us"]:>12.1f} '
+                  f'{1e6 / result["authenticated_us"]:>11.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Finance Assistant Bot - Shard Scaling Benchmark
+===============================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Transfer throughput from several processes as users are spread over more shard files.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import ConnectionPool  # noqa: E402
+from ledger import LedgerError, WriteRetry, transfer  # noqa: E402
+from migrations import apply_migrations  # noqa: E402
+from shards import MAIN_DATABASE, assign_shard, lookup_shard, shard_path  # noqa: E402
+
+OPENING_BALANCE = 1000.0
+
+
+def setup(database, shards, users):
+    """Create the main database and ``shards`` shard files with two accounts per user"""
+    conns = {shard: sqlite3.connect(shard_path(database, shard)) for shard in [MAIN_DATABASE, *range(shards)]}
+    for conn in conns.values():
+        conn.execute('PRAGMA journal_mode = WAL')
+        apply_migrations(conn)
+    directory = conns[MAIN_DATABASE]
+    for user in range(users):
+        user_id = directory.execute('INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+                                    (f'bench{user}', f'bench{user}@x', 'x')).lastrowid
+        shard = assign_shard(directory, user_id, shards)
+        conns[shard].executemany('''INSERT INTO accounts (user_id, account_number, account_type, balance)
+                                    VALUES (?, ?, 'Checking', ?)''',
+                                 [(user_id, f'B{user_id}-{i}', OPENING_BALANCE) for i in range(2)])
+    for conn in conns.values():
+        conn.commit()
+        conn.close()
+
+
+def worker(database, shards, users, profile, seconds, seed):
+    """Transfer between a random user's accounts until time is up; returns commits per shard"""
+    directory = ConnectionPool(database, profile=profile, max_connections=1, read_only=True).acquire()
+    pools = {shard: ConnectionPool(shard_path(database, shard), profile=profile, max_connections=1)
+             for shard in range(shards)}
+    retry = WriteRetry(attempts=20)
+    rng = random.Random(seed)
+    commits = dict.fromkeys(pools, 0)
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        user_id = rng.randrange(users) + 1
+        # What get_db_connection does per request: find the user's shard first
+        shard = lookup_shard(directory, user_id)
+        conn = pools[shard].acquire()
+        source, target = rng.sample((f'B{user_id}-0', f'B{user_id}-1'), 2)
+        try:
+            retry.run(conn, lambda conn: transfer(conn, user_id, source, target, 1.0))
+            commits[shard] += 1
+        except LedgerError:
+            pass
+        conn.close()
+    for pool in pools.values():
+        pool.close()
+    return commits
+
+
+def _worker_args(args):
+    return worker(*args)
+
+
+def run(shards, processes, users, profile, seconds, directory):
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        database = os.path.join(tmp, 'bench.db')
+        setup(database, shards, users)
+        jobs = [(database, shards, users, profile, seconds, i) for i in range(processes)]
+        with multiprocessing.get_context('spawn').Pool(processes) as pool:
+            results = pool.map(_worker_args, jobs)
+        per_shard = [sum(result[shard] for result in results) for shard in range(shards)]
+    return sum(per_shard) / seconds, [count / seconds for count in per_shard]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write throughput against the number of shards')
+    parser.add_argument('--shards', type=int, nargs='*', default=[1, 2, 4])
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--users', type=int, default=256)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--profile', default='durable', help='PRAGMA profile; durable syncs every commit')
+    parser.add_argument('--dir', default=None, help='directory for the databases (pick one on the real disk)')
+    args = parser.parse_args()
+
+    # Shards only add throughput while there are cores and disk bandwidth
+    # left over; on a single core every process shares the same CPU.
+    print(f'{args.processes} processes on {os.cpu_count()} CPUs, {args.users} users, '
+          f'profile {args.profile}, {args.seconds:g}s per run')
+    print(f'{"shards":>6} {"commits/s":>10} {"speedup":>8}  per shard/s')
+    baseline = None
+    for shards in args.shards:
+        total, per_shard = run(shards, args.processes, args.users, args.profile, args.seconds, args.dir)
+        baseline = baseline or total
+        print(f'{shards:>6} {total:>10.0f} {total / baseline:>7.2f}x  '
+              f'{" ".join(f"{count:.0f}" for count in per_shard)}')
+
+
+if __name__ == '__main__':
+    main()
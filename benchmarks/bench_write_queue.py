@@ -0,0 +1,107 @@
+"""
+Finance Assistant Bot - Group Commit Benchmark
+==============================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Small-write throughput with one commit per write against the group-commit writer queue.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import ConnectionPool  # noqa: E402
+from ledger import WriteRetry  # noqa: E402
+from migrations import apply_migrations  # noqa: E402
+from writer import WriteQueue, execute  # noqa: E402
+
+INSERT_ALERT = 'INSERT INTO alerts (user_id, alert_type, message) VALUES (?, ?, ?)'
+
+
+def run(path, profile, threads, seconds, queued, batch_size, window):
+    pool = ConnectionPool(path, profile=profile, max_connections=threads + 1)
+    writes = WriteQueue(pool.acquire, batch_size=batch_size, window=window) if queued else None
+    retry = WriteRetry(attempts=20)
+    latencies = [[] for _ in range(threads)]
+    deadline = time.monotonic() + seconds
+
+    def client(index):
+        conn = None if queued else pool.acquire()
+        samples = latencies[index]
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            if queued:
+                writes.submit(execute(INSERT_ALERT, (1, 'info', f'client {index}'))).result()
+            else:
+                # What each endpoint does today: its own transaction and commit
+                retry.run(conn, execute(INSERT_ALERT, (1, 'info', f'client {index}')))
+            samples.append(time.perf_counter() - started)
+        if conn is not None:
+            conn.close()
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=client, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    stats = writes.stats() if queued else None
+    if queued:
+        writes.stop()
+    pool.close()
+    samples = sorted(sample for client_samples in latencies for sample in client_samples)
+    return {
+        'writes': len(samples),
+        'per_second': len(samples) / elapsed,
+        'p50_ms': statistics.median(samples) * 1000,
+        'p99_ms': samples[int(len(samples) * 0.99)] * 1000,
+        'avg_batch': stats['avg_batch'] if stats else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Group-commit writer benchmark')
+    parser.add_argument('--threads', type=int, nargs='*', default=[1, 8, 32])
+    parser.add_argument('--seconds', type=float, default=3)
+    parser.add_argument('--profile', default='durable', help='PRAGMA profile; durable syncs every commit')
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--window-ms', type=float, default=0)
+    parser.add_argument('--dir', default=None, help='directory for the database (pick one on the real disk)')
+    args = parser.parse_args()
+
+    print(f'profile {args.profile}, batch size {args.batch_size}, window {args.window_ms:g} ms')
+    print(f'{"threads":>7} {"mode":<14} {"writes/s":>9} {"p50 ms":>8} {"p99 ms":>8} {"avg batch":>10}')
+    for threads in args.threads:
+        for queued in (False, True):
+            with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+                path = os.path.join(tmp, 'bench.db')
+                conn = sqlite3.connect(path)
+                apply_migrations(conn)
+                conn.close()
+                result = run(path, args.profile, threads, args.seconds, queued, args.batch_size,
+                             args.window_ms / 1000)
+            mode = 'group commit' if queued else 'commit each'
+            print(f'{threads:>7} {mode:<14} {result["per_second"]:>9.0f} {result["p50_ms"]:>8.2f} '
+                  f'{result["p99_ms"]:>8.2f} {result["avg_batch"]:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+Finance Assistant Bot - Read/Write Split Stress Test
+====================================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Streams a large transaction export while transfers keep committing and checks neither holds up the other.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import csv
+import io
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def seed(path, user_id, rows):
+    """Give the demo user ``rows`` past transactions spread over the last year"""
+    conn = sqlite3.connect(path)
+    accounts = [row[0] for row in conn.execute('SELECT id FROM accounts WHERE user_id = ? ORDER BY id', (user_id,))]
+    rng = random.Random(7)
+    now = datetime.now()
+    conn.executemany('''INSERT INTO transactions (account_id, transaction_type, amount, description, category,
+                                                  created_at, balance_after)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                     [(rng.choice(accounts), rng.choice(('deposit', 'withdrawal', 'payment')),
+                       round(rng.uniform(1, 200), 2), f'Seeded {i}', 'Shopping',
+                       (now - timedelta(days=1, seconds=rng.randrange(364 * 86400))).strftime('%Y-%m-%d %H:%M:%S'),
+                       None)
+                      for i in range(rows)])
+    conn.commit()
+    count = conn.execute('''SELECT COUNT(*) FROM transactions t JOIN accounts a ON t.account_id = a.id
+                            WHERE a.user_id = ?''', (user_id,)).fetchone()[0]
+    conn.close()
+    return count
+
+
+def login(finance_app):
+    client = finance_app.app.test_client()
+    resp = client.post('/api/login', json={'username': 'demo', 'password': 'demo123'})
+    assert resp.status_code == 200, resp.data
+    return client
+
+
+def export(finance_app, chunk_delay, result):
+    """Stream the CSV export like a slow client, tallying what it contains"""
+    client = login(finance_app)
+    started = time.perf_counter()
+    resp = client.get('/api/export-transactions?days=3650', buffered=False)
+    # The view has run its first query, so the snapshot was taken by now
+    result['opened'] = time.perf_counter()
+    text = io.StringIO()
+    for chunk in resp.response:
+        text.write(chunk.decode() if isinstance(chunk, bytes) else chunk)
+        time.sleep(chunk_delay)
+    resp.close()
+    rows = list(csv.DictReader(io.StringIO(text.getvalue())))
+    result.update({
+        'seconds': time.perf_counter() - started,
+        'rows': len(rows),
+        'transfers_in': sum(1 for row in rows if row['Type'] == 'transfer_in'),
+        'transfers_out': sum(1 for row in rows if row['Type'] == 'transfer_out'),
+    })
+
+
+def transfers(finance_app, accounts, ready, stop, samples, failures):
+    """Move money back and forth between two accounts until ``stop`` is set"""
+    client = login(finance_app)
+    ready.wait()
+    rng = random.Random(threading.get_ident())
+    while not stop.is_set():
+        source, target = rng.sample(accounts, 2)
+        started = time.perf_counter()
+        resp = client.post('/api/transfer', json={'from_account': source, 'to_account': target, 'amount': 1})
+        samples.append((time.perf_counter() - started, started))
+        if resp.status_code != 200:
+            failures.append(resp.status_code)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Large export against concurrent transfers')
+    parser.add_argument('--rows', type=int, default=200000, help='transactions to export')
+    parser.add_argument('--writers', type=int, default=4, help='threads posting transfers')
+    parser.add_argument('--chunk-delay', type=float, default=0.005,
+                        help='seconds the export client waits per chunk, as a slow download would')
+    parser.add_argument('--warmup', type=float, default=1.0, help='seconds of transfers before the export')
+    parser.add_argument('--profile', default='default', help='PRAGMA profile; legacy uses a rollback journal')
+    parser.add_argument('--read-pool', type=int, default=4, help='read-only pool size; 0 reads on the writer pool')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ['FINANCE_BOT_DB'] = os.path.join(tmp, 'split.db')
+    os.environ['FINANCE_BOT_DB_PROFILE'] = args.profile
+    os.environ['FINANCE_BOT_DB_READ_POOL_SIZE'] = str(args.read_pool)
+    import app as finance_app
+
+    finance_app.app.config['SESSION_FILE_DIR'] = os.path.join(tmp, 'flask_session')
+    finance_app.init_db()
+    conn = sqlite3.connect(os.environ['FINANCE_BOT_DB'])
+    user_id = conn.execute("SELECT id FROM users WHERE username = 'demo'").fetchone()[0]
+    conn.close()
+    before = seed(os.environ['FINANCE_BOT_DB'], user_id, args.rows)
+    client = login(finance_app)
+    accounts = [acc['account_number'] for acc in client.get('/api/accounts').get_json()['accounts']]
+
+    samples, failures, result = [], [], {}
+    ready = threading.Barrier(args.writers + 1)
+    stop = threading.Event()
+    writers = [threading.Thread(target=transfers, args=(finance_app, accounts, ready, stop, samples, failures))
+               for _ in range(args.writers)]
+    for writer in writers:
+        writer.start()
+    ready.wait()
+    time.sleep(args.warmup)
+    export_started = time.perf_counter()
+    baseline = sum(1 for _, started in samples if started >= export_started - args.warmup) / args.warmup
+    export(finance_app, args.chunk_delay, result)
+    export_finished = time.perf_counter()
+    stop.set()
+    for writer in writers:
+        writer.join()
+
+    during = sorted(elapsed for elapsed, started in samples if export_started <= started < export_finished)
+    # Transfers add two rows each. Those done before the request must be in
+    # the export; those started after its snapshot was taken must not be.
+    least = before + 2 * sum(1 for elapsed, started in samples if started + elapsed < export_started)
+    most = before + 2 * sum(1 for elapsed, started in samples if started < result['opened'])
+    problems = []
+    if not least <= result['rows'] <= most:
+        problems.append(f"export has {result['rows']} rows, expected {least} to {most} from its snapshot")
+    if result['transfers_in'] != result['transfers_out']:
+        problems.append(f"export split a transfer: {result['transfers_out']} out, {result['transfers_in']} in")
+    if not during:
+        problems.append('no transfer committed while the export was streaming')
+    if failures:
+        problems.append(f'{len(failures)} transfers failed, statuses {sorted(set(failures))}')
+
+    print(f'profile {args.profile}, read pool {args.read_pool}, {args.writers} writers, '
+          f'{result["rows"]} rows exported in {result["seconds"]:.1f}s')
+    print(f'transfers/s before the export {baseline:.0f}, during it '
+          f'{len(during) / (export_finished - export_started):.0f} ({len(during)} transfers)')
+    if during:
+        print(f'transfer latency during the export: p50 {statistics.median(during) * 1000:.1f} ms, '
+              f'p99 {during[int(len(during) * 0.99)] * 1000:.1f} ms, max {during[-1] * 1000:.1f} ms')
+    for problem in problems:
+        print(f'FAIL: {problem}')
+    if problems:
+        raise SystemExit(1)
+    print('OK: transfers kept committing and the export read one consistent snapshot')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+Finance Assistant Bot - Transfer Stress Test
+============================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Hammers transfers and bill payments from many threads and processes and checks no update is lost.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import ConnectionPool  # noqa: E402
+from ledger import LedgerError, WriteRetry, is_busy, pay_bill, transfer  # noqa: E402
+from migrations import apply_migrations  # noqa: E402
+
+OPENING_BALANCE = 1000.0
+BILL_AMOUNT = 25.0
+
+
+def seed(path, accounts, bills):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode = WAL')
+    apply_migrations(conn)
+    user_id = conn.execute("INSERT INTO users (username, email, password) VALUES ('stress', 'stress@x', 'x')").lastrowid
+    conn.executemany('''INSERT INTO accounts (user_id, account_number, account_type, balance)
+                        VALUES (?, ?, 'Checking', ?)''',
+                     [(user_id, f'S{i:06d}', OPENING_BALANCE) for i in range(accounts)])
+    conn.executemany('''INSERT INTO bills (user_id, bill_type, amount, due_date) VALUES (?, ?, ?, '2026-01-01')''',
+                     [(user_id, f'Bill {i}', BILL_AMOUNT) for i in range(bills)])
+    conn.commit()
+    conn.close()
+    return user_id
+
+
+def legacy_transfer(conn, user_id, from_number, to_number, amount):
+    """The read-modify-write transfer that ledger.transfer replaced, for comparison"""
+    from_acc = conn.execute('SELECT * FROM accounts WHERE account_number = ? AND user_id = ?',
+                            (from_number, user_id)).fetchone()
+    to_acc = conn.execute('SELECT * FROM accounts WHERE account_number = ? AND user_id = ?',
+                          (to_number, user_id)).fetchone()
+    if from_acc['balance'] < amount:
+        raise LedgerError('Insufficient balance')
+    conn.execute('UPDATE accounts SET balance = ? WHERE id = ?', (from_acc['balance'] - amount, from_acc['id']))
+    conn.execute('UPDATE accounts SET balance = ? WHERE id = ?', (to_acc['balance'] + amount, to_acc['id']))
+    conn.execute('''INSERT INTO transactions (account_id, transaction_type, amount, description, category)
+                    VALUES (?, 'transfer_out', ?, 'stress', 'Transfer')''', (from_acc['id'], amount))
+    conn.execute('''INSERT INTO transactions (account_id, transaction_type, amount, description, category)
+                    VALUES (?, 'transfer_in', ?, 'stress', 'Transfer')''', (to_acc['id'], amount))
+    conn.commit()
+
+
+def worker(path, user_id, accounts, bills, threads, seconds, legacy, busy_timeout, seed_value):
+    """Run ``threads`` threads of random transfers (and bill payments) for ``seconds``; returns counters"""
+    pool = ConnectionPool(path, max_connections=threads, busy_timeout=busy_timeout)
+    retry = WriteRetry()
+    counts = {'transfers': 0, 'bills_paid': 0, 'refused': 0, 'busy_errors': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def run(index):
+        rng = random.Random(seed_value * 1000 + index)
+        local = dict.fromkeys(counts, 0)
+        conn = pool.acquire()
+        while time.monotonic() < deadline:
+            try:
+                if bills and rng.random() < 0.05:
+                    retry.run(conn, lambda conn: pay_bill(conn, user_id, f'Bill {rng.randrange(bills)}'))
+                    local['bills_paid'] += 1
+                    continue
+                source, target = rng.sample(range(accounts), 2)
+                amount = round(rng.uniform(1, 50), 2)
+                if legacy:
+                    legacy_transfer(conn, user_id, f'S{source:06d}', f'S{target:06d}', amount)
+                else:
+                    retry.run(conn, lambda conn: transfer(conn, user_id, f'S{source:06d}', f'S{target:06d}', amount))
+                local['transfers'] += 1
+            except LedgerError:
+                local['refused'] += 1
+            except sqlite3.OperationalError as e:
+                if not is_busy(e):
+                    raise
+                if conn.in_transaction:
+                    conn.rollback()
+                local['busy_errors'] += 1
+        conn.close()
+        with lock:
+            for key, value in local.items():
+                counts[key] += value
+
+    pool_threads = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for thread in pool_threads:
+        thread.start()
+    for thread in pool_threads:
+        thread.join()
+    pool.close()
+    counts.update({'busy_retries': retry.stats()['busy_retries']})
+    return counts
+
+
+def _worker_args(args):
+    return worker(*args)
+
+
+def check(path, accounts, bills, counts):
+    """Compare balances with the ledger; returns a list of problems"""
+    conn = sqlite3.connect(path)
+    problems = []
+    total = conn.execute('SELECT SUM(balance) FROM accounts').fetchone()[0]
+    paid = conn.execute("SELECT COUNT(*) FROM bills WHERE status = 'paid'").fetchone()[0]
+    expected_total = accounts * OPENING_BALANCE - paid * BILL_AMOUNT
+    if abs(total - expected_total) > 0.005:
+        problems.append(f'money not conserved: {total:.2f} held, {expected_total:.2f} expected')
+    rows = conn.execute('''
+        SELECT a.account_number, a.balance,
+               ? + COALESCE(SUM(CASE WHEN t.transaction_type = 'transfer_in' THEN t.amount ELSE -t.amount END), 0)
+        FROM accounts a LEFT JOIN transactions t ON t.account_id = a.id
+        GROUP BY a.id''', (OPENING_BALANCE,)).fetchall()
+    drifted = [(number, balance, ledger) for number, balance, ledger in rows if abs(balance - ledger) > 0.005]
+    if drifted:
+        problems.append(f'{len(drifted)} accounts disagree with their transactions, e.g. {drifted[0]}')
+    negative = conn.execute('SELECT COUNT(*) FROM accounts WHERE balance < 0').fetchone()[0]
+    if negative:
+        problems.append(f'{negative} accounts overdrawn')
+    recorded = conn.execute("SELECT COUNT(*) FROM transactions WHERE transaction_type = 'transfer_out'").fetchone()[0]
+    if recorded != counts['transfers']:
+        problems.append(f"{counts['transfers']} transfers reported, {recorded} recorded")
+    if paid != counts['bills_paid']:
+        problems.append(f"{counts['bills_paid']} bills reported paid, {paid} marked paid")
+    conn.close()
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent transfer stress test')
+    parser.add_argument('--accounts', type=int, default=20, help='fewer accounts means more contention')
+    parser.add_argument('--bills', type=int, default=200)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8, help='threads per process')
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--busy-timeout', type=float, default=5.0,
+                        help='SQLite busy timeout in seconds; make it tiny to exercise the retries')
+    parser.add_argument('--legacy', action='store_true', help='run the old read-modify-write transfer instead')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'stress.db')
+        user_id = seed(path, args.accounts, 0 if args.legacy else args.bills)
+        bills = 0 if args.legacy else args.bills
+        jobs = [(path, user_id, args.accounts, bills, args.threads, args.seconds, args.legacy,
+                 args.busy_timeout, i)
+                for i in range(args.processes)]
+        started = time.perf_counter()
+        with multiprocessing.get_context('spawn').Pool(args.processes) as pool:
+            results = pool.map(_worker_args, jobs)
+        elapsed = time.perf_counter() - started
+        counts = {key: sum(result[key] for result in results) for key in results[0]}
+        problems = check(path, args.accounts, bills, counts)
+
+    mode = 'legacy read-modify-write' if args.legacy else 'conditional updates in BEGIN IMMEDIATE'
+    print(f'{mode}: {args.processes} processes x {args.threads} threads on {args.accounts} accounts, '
+          f'{args.seconds:g}s, busy timeout {args.busy_timeout:g}s')
+    print(f"transfers {counts['transfers']} ({counts['transfers'] / elapsed:.0f}/s), "
+          f"bills paid {counts['bills_paid']}, refused {counts['refused']}, "
+          f"busy retries {counts['busy_retries']}, busy errors {counts['busy_errors']}")
+    for problem in problems:
+        print(f'FAIL: {problem}')
+    if problems:
+        raise SystemExit(1)
+    print('OK: no lost updates, money conserved, every account matches its transactions')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Finance Assistant Bot - Budget Evaluation
+=========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Period-aware budget spending evaluated for all budgets of a user at once.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import calendar
+from datetime import date, datetime, timedelta
+
+# Length of each budget period in months (weekly is handled in days)
+PERIOD_MONTHS = {
+    'monthly': 1,
+    'quarterly': 3,
+    'yearly': 12,
+}
+
+SPENDING_TYPES = ('payment', 'withdrawal')
+
+
+def add_months(day, months):
+    """Shift a date by whole months, clamping to the end of shorter months"""
+    month_index = day.month - 1 + months
+    year = day.year + month_index // 12
+    month = month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def current_period(period, start_date, today):
+    """Return the [start, end) window of ``period`` that contains ``today``.
+
+    Periods are anchored at the budget's ``start_date``; before the budget
+    starts its first period is returned. Unknown periods count as monthly.
+    """
+    if period == 'weekly':
+        offset = max((today - start_date).days, 0) // 7
+        period_start = start_date + timedelta(days=7 * offset)
+        return period_start, period_start + timedelta(days=7)
+
+    step = PERIOD_MONTHS.get(period, 1)
+    if today <= start_date:
+        return start_date, add_months(start_date, step)
+    months = (today.year - start_date.year) * 12 + today.month - start_date.month
+    offset = months // step
+    period_start = add_months(start_date, offset * step)
+    if period_start > today:
+        offset -= 1
+        period_start = add_months(start_date, offset * step)
+    return period_start, add_months(start_date, (offset + 1) * step)
+
+
+def _parse_date(value):
+    return datetime.strptime(value[:10], '%Y-%m-%d').date()
+
+
+def evaluate_budgets(conn, user_id, today=None):
+    """Compute spent, remaining and percent for every budget of a user.
+
+    The budgets are read once, each one's current period window is worked
+    out in Python, and the spending for all windows is summed by a single
+    grouped query over the user's daily spending rollups.
+    """
+    today = today or date.today()
+    budgets = conn.execute('SELECT * FROM budgets WHERE user_id = ? ORDER BY id', (user_id,)).fetchall()
+    if not budgets:
+        return []
+
+    windows = []
+    for budget in budgets:
+        period_start, period_end = current_period(budget['period'], _parse_date(budget['start_date']), today)
+        if budget['end_date']:
+            period_end = min(period_end, _parse_date(budget['end_date']) + timedelta(days=1))
+        windows.append((budget, period_start, period_end))
+
+    values = ','.join(['(?, ?, ?, ?)'] * len(windows))
+    params = []
+    for budget, period_start, period_end in windows:
+        params += [budget['id'], budget['category'], period_start.isoformat(), period_end.isoformat()]
+    type_placeholders = ','.join('?' * len(SPENDING_TYPES))
+    rows = conn.execute(f'''
+        WITH windows (budget_id, category, period_start, period_end) AS (VALUES {values})
+        SELECT w.budget_id, COALESCE(SUM(r.total), 0) AS spent
+        FROM windows w
+        LEFT JOIN transaction_rollups r
+            ON r.account_id IN (SELECT id FROM accounts WHERE user_id = ?)
+            AND r.bucket_type = 'day'
+            AND r.bucket >= w.period_start AND r.bucket < w.period_end
+            AND r.category = w.category
+            AND r.transaction_type IN ({type_placeholders})
+        GROUP BY w.budget_id
+    ''', params + [user_id, *SPENDING_TYPES]).fetchall()
+    spent_by_budget = {row['budget_id']: row['spent'] for row in rows}
+
+    results = []
+    for budget, period_start, period_end in windows:
+        spent = spent_by_budget.get(budget['id'], 0)
+        amount = budget['budget_amount']
+        remaining = amount - spent
+        results.append({
+            'id': budget['id'],
+            'category': budget['category'],
+            'period': budget['period'],
+            'budget_amount': amount,
+            'period_start': period_start.isoformat(),
+            'period_end': (period_end - timedelta(days=1)).isoformat(),
+            'spent': round(spent, 2),
+            'remaining': round(remaining, 2),
+            'percent': round(spent / amount * 100, 1) if amount > 0 else 0,
+            'over_budget': remaining < 0,
+        })
+    return results
@@ -0,0 +1,122 @@
+"""
+Finance Assistant Bot - Response Cache
+======================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Per-user LRU/TTL cache for computed responses, invalidated by data versions.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """In-process LRU cache with a TTL, keyed per user and data version.
+
+    Every entry key includes the user's current data version. Write paths
+    call ``bump(user_id)`` after committing, which moves the user to a new
+    version so none of their older entries can be hit again; those entries
+    simply age out of the LRU. The versions live in this process only, so
+    run one worker process per database when the cache is enabled.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60.0, disabled=()):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._disabled = set(disabled)
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._bumps = 0
+
+    def enabled(self, endpoint):
+        return self.max_entries > 0 and endpoint not in self._disabled
+
+    def disable(self, endpoint):
+        """Stop caching ``endpoint`` and drop what is cached for it"""
+        with self._lock:
+            self._disabled.add(endpoint)
+            for key in [key for key in self._entries if key[1] == endpoint]:
+                del self._entries[key]
+
+    def enable(self, endpoint):
+        with self._lock:
+            self._disabled.discard(endpoint)
+
+    def version(self, user_id):
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def bump(self, user_id):
+        """Invalidate everything cached for ``user_id``"""
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            self._bumps += 1
+
+    def get_or_compute(self, user_id, endpoint, args, compute):
+        """Return the cached value for the key, calling ``compute`` on a miss.
+
+        ``args`` must be hashable and already normalised (e.g. parsed ints
+        rather than raw query strings) so equivalent requests share an entry.
+        ``compute`` may return None to signal an uncacheable result.
+        """
+        if not self.enabled(endpoint):
+            return compute()
+        with self._lock:
+            key = (user_id, endpoint, args, self._versions.get(user_id, 0))
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+                self._expirations += 1
+            self._misses += 1
+
+        value = compute()
+        if value is None:
+            return value
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the current size"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'invalidations': self._bumps,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'disabled': sorted(self._disabled),
+            }
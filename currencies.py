@@ -0,0 +1,322 @@
+"""
+Finance Assistant Bot - Exchange Rates
+======================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Dated exchange rates from a local feed, served from a precomputed cross-rate matrix.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import bisect
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+
+# Every stored rate is units of the currency per one unit of BASE_CURRENCY
+BASE_CURRENCY = 'USD'
+FEED_FORMATS = ('csv', 'json')
+MAX_BATCH = 10000
+# Matrices for past dates are kept for repeated historical lookups
+HISTORY_CACHE_SIZE = 64
+
+
+class RateFeedError(ValueError):
+    """Raised for a rate feed file that cannot be read"""
+
+
+class CurrencyError(ValueError):
+    """Raised when a currency has no rate on the requested date"""
+
+    def __init__(self, currencies, as_of=None):
+        self.currencies = sorted(set(currencies))
+        message = f"No exchange rate for {', '.join(self.currencies)}"
+        if as_of:
+            message += f' on {as_of}'
+        super().__init__(message)
+
+
+def _feed_row(currency, as_of, rate, line):
+    currency = str(currency or '').strip().upper()
+    if len(currency) != 3 or not currency.isalpha():
+        raise RateFeedError(f'line {line}: invalid currency {currency!r}')
+    try:
+        as_of = date.fromisoformat(str(as_of).strip()).isoformat()
+        rate = float(rate)
+    except (TypeError, ValueError):
+        raise RateFeedError(f'line {line}: invalid date or rate')
+    if not rate > 0:
+        raise RateFeedError(f'line {line}: rate must be positive')
+    return currency, as_of, rate
+
+
+def read_feed(path):
+    """Read a rate feed file into a list of (currency, as_of, rate) rows.
+
+    CSV feeds have ``as_of,currency,rate`` columns. JSON feeds are one
+    snapshot or a list of them, each ``{"base": "USD", "as_of":
+    "2026-01-01", "rates": {"EUR": 0.92, ...}}``. Rates are quoted per
+    one unit of the base currency, which must be BASE_CURRENCY.
+    """
+    fmt = os.path.splitext(path)[1].lower().lstrip('.')
+    if fmt not in FEED_FORMATS:
+        raise RateFeedError(f"Unsupported feed format {fmt!r}; expected one of {', '.join(FEED_FORMATS)}")
+    rows = []
+    with open(path, encoding='utf-8-sig', newline='') as feed:
+        if fmt == 'csv':
+            reader = csv.DictReader(feed)
+            missing = {'as_of', 'currency', 'rate'} - set(reader.fieldnames or ())
+            if missing:
+                raise RateFeedError(f"Feed is missing columns: {', '.join(sorted(missing))}")
+            for line, record in enumerate(reader, 2):
+                rows.append(_feed_row(record['currency'], record['as_of'], record['rate'], line))
+        else:
+            try:
+                snapshots = json.load(feed)
+            except ValueError as e:
+                raise RateFeedError(f'Invalid JSON feed: {e}')
+            for line, snapshot in enumerate(snapshots if isinstance(snapshots, list) else [snapshots], 1):
+                if not isinstance(snapshot, dict) or not isinstance(snapshot.get('rates'), dict):
+                    raise RateFeedError(f'snapshot {line}: expected an object with rates')
+                if str(snapshot.get('base', BASE_CURRENCY)).upper() != BASE_CURRENCY:
+                    raise RateFeedError(f'snapshot {line}: rates must be quoted against {BASE_CURRENCY}')
+                for currency, rate in snapshot['rates'].items():
+                    rows.append(_feed_row(currency, snapshot.get('as_of'), rate, line))
+    return rows
+
+
+def load_rates(conn, rows):
+    """Upsert feed rows into the exchange_rates table in one transaction"""
+    loaded_at = time.time()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.executemany('''INSERT INTO exchange_rates (currency, as_of, rate, loaded_at) VALUES (?, ?, ?, ?)
+                            ON CONFLICT (currency, as_of) DO UPDATE
+                            SET rate = excluded.rate, loaded_at = excluded.loaded_at''',
+                         [(currency, as_of, rate, loaded_at) for currency, as_of, rate in rows])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(rows)
+
+
+class RateMatrix:
+    """Cross rates between every known currency on one date.
+
+    ``cross[i, j]`` converts one unit of currency ``i`` into currency
+    ``j``; it is built once, so a conversion is an index lookup and a
+    multiply however many amounts are converted together.
+    """
+
+    def __init__(self, currencies, per_base, dates):
+        self.currencies = tuple(currencies)
+        self.index = {currency: i for i, currency in enumerate(self.currencies)}
+        self.per_base = np.asarray(per_base, dtype=float)
+        # Date of the rate used for each currency; the base currency has none
+        self.dates = dict(zip(self.currencies, dates))
+        self.as_of = max((d for d in dates if d), default=None)
+        self.cross = self.per_base[None, :] / self.per_base[:, None]
+        self.cross.flags.writeable = False
+
+    def indices(self, codes):
+        """Matrix positions of a sequence of upper-case currency codes"""
+        index = self.index
+        try:
+            return np.fromiter((index[code] for code in codes), dtype=np.intp, count=len(codes))
+        except KeyError:
+            raise CurrencyError([code for code in set(codes) if code not in index], self.as_of)
+
+    def rate(self, from_currency, to_currency):
+        i, j = self.indices([from_currency, to_currency])
+        return float(self.cross[i, j])
+
+    def convert(self, amounts, from_currencies, to_currencies):
+        """Convert amounts element-wise; returns (converted amounts, rates applied).
+
+        ``to_currencies`` may be a single code for the whole batch.
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        rows = self.indices(from_currencies)
+        if isinstance(to_currencies, str):
+            rates = self.cross[rows, self.indices([to_currencies])[0]]
+        else:
+            rates = self.cross[rows, self.indices(to_currencies)]
+        return amounts * rates, rates
+
+    def total(self, amounts, currencies, to_currency):
+        """Sum amounts held in mixed currencies as ``to_currency``.
+
+        Amounts are summed per currency first, so each currency is
+        converted once whatever the number of amounts.
+        """
+        column = self.cross[:, self.indices([to_currency])[0]]
+        sums = np.bincount(self.indices(currencies), weights=np.asarray(amounts, dtype=float),
+                           minlength=len(self.currencies))
+        return float(sums @ column)
+
+    def rates(self):
+        """Rate of every currency per one unit of BASE_CURRENCY"""
+        return dict(zip(self.currencies, self.per_base.tolist()))
+
+
+class ExchangeRates:
+    """Serves rate matrices from the exchange_rates table, reloading on change.
+
+    At most every ``refresh_interval`` seconds the feed file is checked
+    for a new modification time (and loaded into the table if it has
+    one) and the table is checked for rows loaded by another process.
+    The matrices are only rebuilt when one of those changed.
+    ``on_change`` is called after a rebuild so cached totals can be
+    dropped.
+    """
+
+    def __init__(self, get_connection, feed_path=None, refresh_interval=30.0, on_change=None):
+        self.get_connection = get_connection
+        self.feed_path = feed_path
+        self.refresh_interval = refresh_interval
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        # Held by the one thread reading the feed and table
+        self._reload_lock = threading.Lock()
+        self._checked_at = None
+        self._feed_mtime = None
+        self._version = None
+        self._history = {}
+        self._current = RateMatrix([BASE_CURRENCY], [1.0], [None])
+        self._past = OrderedDict()
+        self._refreshes = 0
+        self._feed_loads = 0
+        self._builds = 0
+        self._last_error = None
+
+    def load_feed(self, path=None):
+        """Load a feed file into the table now and rebuild; returns the row count"""
+        rows = read_feed(path or self.feed_path)
+        conn = self.get_connection()
+        try:
+            count = load_rates(conn, rows)
+        finally:
+            conn.close()
+        with self._lock:
+            self._feed_loads += 1
+        self.refresh(force=True)
+        return count
+
+    def refresh(self, force=False):
+        """Pick up feed and table changes; returns True when the matrices were rebuilt.
+
+        The feed and the table are read outside the lock, so requests keep
+        converting with the current matrices meanwhile; one thread reloads
+        at a time and the others skip the check.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.refresh_interval:
+                return False
+            self._checked_at = now
+            self._refreshes += 1
+        if not self._reload_lock.acquire(blocking=force):
+            return False
+        try:
+            history, version = self._read()
+        except (OSError, RateFeedError, sqlite3.Error) as e:
+            # Keep serving the last good rates
+            with self._lock:
+                self._last_error = f'{type(e).__name__}: {e}'
+                if isinstance(e, sqlite3.Error):
+                    # A locked or busy database is retried on the next call
+                    self._checked_at = None
+            return False
+        finally:
+            self._reload_lock.release()
+        if history is None:
+            return False
+        with self._lock:
+            self._history = history
+            self._version = version
+            self._past.clear()
+            self._current = self._build(None)
+        if self.on_change is not None:
+            self.on_change()
+        return True
+
+    def _read(self):
+        """Load a changed feed and read the table; returns (None, None) if nothing changed"""
+        conn = self.get_connection()
+        try:
+            if self.feed_path and os.path.exists(self.feed_path):
+                mtime = os.stat(self.feed_path).st_mtime_ns
+                if mtime != self._feed_mtime:
+                    load_rates(conn, read_feed(self.feed_path))
+                    self._feed_mtime = mtime
+                    with self._lock:
+                        self._feed_loads += 1
+            version = tuple(conn.execute('SELECT COUNT(*), MAX(loaded_at) FROM exchange_rates').fetchone())
+            if version == self._version:
+                return None, None
+            history = {}
+            for row in conn.execute('SELECT currency, as_of, rate FROM exchange_rates ORDER BY currency, as_of'):
+                dates, rates = history.setdefault(row['currency'], ([], []))
+                dates.append(row['as_of'])
+                rates.append(row['rate'])
+        finally:
+            conn.close()
+        return history, version
+
+    def _build(self, as_of):
+        """Matrix from each currency's latest rate on or before ``as_of`` (None for the newest)"""
+        currencies, per_base, dates = [BASE_CURRENCY], [1.0], [None]
+        for currency, (rate_dates, rates) in sorted(self._history.items()):
+            position = len(rate_dates) if as_of is None else bisect.bisect_right(rate_dates, as_of)
+            if not position or currency == BASE_CURRENCY:
+                continue
+            currencies.append(currency)
+            per_base.append(rates[position - 1])
+            dates.append(rate_dates[position - 1])
+        self._builds += 1
+        return RateMatrix(currencies, per_base, dates)
+
+    def matrix(self, as_of=None):
+        """Rate matrix for ``as_of`` (an ISO date string), or the newest rates"""
+        self.refresh()
+        with self._lock:
+            if as_of is None:
+                return self._current
+            matrix = self._past.get(as_of)
+            if matrix is None:
+                matrix = self._past[as_of] = self._build(as_of)
+                while len(self._past) > HISTORY_CACHE_SIZE:
+                    self._past.popitem(last=False)
+            else:
+                self._past.move_to_end(as_of)
+            return matrix
+
+    def stats(self):
+        """Return the loaded rate set and refresh counters"""
+        with self._lock:
+            return {
+                'currencies': len(self._current.currencies),
+                'as_of': self._current.as_of,
+                'feed': self.feed_path,
+                'refresh_interval': self.refresh_interval,
+                'refreshes': self._refreshes,
+                'feed_loads': self._feed_loads,
+                'matrix_builds': self._builds,
+                'cached_dates': len(self._past),
+                'last_error': self._last_error,
+            }
@@ -0,0 +1,280 @@
+"""
+Finance Assistant Bot - Database Connection Pool
+================================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Pooled, PRAGMA-tuned SQLite connections shared by all request handlers.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import pathlib
+import sqlite3
+import threading
+import time
+from collections import deque
+
+# PRAGMA profiles applied to every new pooled connection.
+# cache_size is negative to express KiB rather than pages.
+PRAGMA_PROFILES = {
+    'default': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 134217728,
+        'temp_store': 'MEMORY',
+    },
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 134217728,
+        'temp_store': 'MEMORY',
+    },
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    },
+    'legacy': {},
+}
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its pool"""
+
+    pool = None
+    # Bumped on every checkout, so a stale holder can tell it no longer owns the connection
+    lease = 0
+
+    def close(self):
+        """Return the connection to the pool instead of closing it"""
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+
+    def really_close(self):
+        """Close the underlying SQLite handle"""
+        super().close()
+
+
+class SharedConnection:
+    """Lends one pooled connection to several handlers in turn.
+
+    close() is a no-op so each handler can keep its usual
+    acquire/close pattern; the owner releases the real connection. With
+    ``defer_commit`` handler commits are ignored too, leaving the owner to
+    commit or roll back the whole unit of work.
+    """
+
+    def __init__(self, conn, defer_commit=False):
+        self._conn = conn
+        self.defer_commit = defer_commit
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        pass
+
+    def commit(self):
+        if not self.defer_commit:
+            self._conn.commit()
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections with per-thread affinity.
+
+    A thread gets back the connection it used last whenever that connection
+    is idle, so its page cache and prepared-statement cache stay warm. Other
+    idle connections are shared so short-lived worker threads still reuse
+    them. New connections are opened up to ``max_connections``; beyond that
+    callers wait up to ``timeout`` seconds for a release.
+
+    A ``read_only`` pool opens the database with ``mode=ro`` and
+    ``PRAGMA query_only``. In WAL mode its connections read from a
+    snapshot and never take the write lock, so long reads cannot hold up
+    writers. The database must already exist.
+    """
+
+    def __init__(self, database, profile='default', max_connections=16,
+                 cached_statements=256, timeout=10.0, busy_timeout=5.0, read_only=False):
+        if profile not in PRAGMA_PROFILES:
+            raise ValueError(f'Unknown PRAGMA profile: {profile}')
+        self.database = database
+        self.profile = profile
+        self.max_connections = max_connections
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self.busy_timeout = busy_timeout
+        self.read_only = read_only
+
+        self._lock = threading.Condition()
+        self._idle = deque()
+        self._all = set()
+        self._local = threading.local()
+        self._closed = False
+
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _connect(self):
+        """Open and configure a new pooled connection"""
+        if self.read_only:
+            target = f'{pathlib.Path(self.database).absolute().as_uri()}?mode=ro'
+        else:
+            target = self.database
+        conn = sqlite3.connect(target,
+                               timeout=self.busy_timeout,
+                               factory=PooledConnection,
+                               check_same_thread=False,
+                               cached_statements=self.cached_statements,
+                               uri=self.read_only)
+        conn.row_factory = sqlite3.Row
+        for pragma, value in PRAGMA_PROFILES[self.profile].items():
+            # The journal mode belongs to the database file; writers set it
+            if self.read_only and pragma == 'journal_mode':
+                continue
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        if self.read_only:
+            conn.execute('PRAGMA query_only = 1')
+        conn.pool = self
+        return conn
+
+    def acquire(self):
+        """Check out a connection, preferring this thread's previous one"""
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError('Connection pool is closed')
+
+            preferred = getattr(self._local, 'conn', None)
+            if preferred is not None and preferred in self._idle:
+                self._idle.remove(preferred)
+                return self._checkout(preferred)
+
+            if self._idle:
+                return self._checkout(self._idle.pop())
+
+            if len(self._all) < self.max_connections:
+                # Reserve the slot before connecting outside the lock
+                placeholder = object()
+                self._all.add(placeholder)
+                self.misses += 1
+            else:
+                placeholder = None
+                started = time.perf_counter()
+                deadline = started + self.timeout
+                self.waits += 1
+                while not self._idle:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0 or not self._lock.wait(remaining):
+                        if self._idle:
+                            break
+                        self.timeouts += 1
+                        self._record_wait(time.perf_counter() - started)
+                        raise PoolTimeoutError('Timed out waiting for a database connection')
+                self._record_wait(time.perf_counter() - started)
+                return self._checkout(self._idle.pop())
+
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._all.discard(placeholder)
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self._all.discard(placeholder)
+            self._all.add(conn)
+            return self._checkout(conn, hit=False)
+
+    def _checkout(self, conn, hit=True):
+        # Called with the lock held
+        conn.lease += 1
+        self._local.conn = conn
+        if hit:
+            self.hits += 1
+        return conn
+
+    def _record_wait(self, elapsed):
+        self.wait_time_total += elapsed
+        self.wait_time_max = max(self.wait_time_max, elapsed)
+
+    def release(self, conn, lease=None):
+        """Return a connection to the idle set, discarding uncommitted work.
+
+        With ``lease`` (the connection's lease when it was handed out) the
+        call is ignored once the connection has been checked out again,
+        so a late second release cannot take it from its new holder.
+        """
+        with self._lock:
+            if conn not in self._all or conn in self._idle:
+                return
+            if lease is not None and conn.lease != lease:
+                return
+            if self._closed:
+                self._all.discard(conn)
+                conn.really_close()
+                return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            with self._lock:
+                self._all.discard(conn)
+                self._lock.notify()
+            conn.really_close()
+            return
+        with self._lock:
+            self._idle.append(conn)
+            self._lock.notify()
+
+    def close(self):
+        """Close every idle connection and refuse further checkouts"""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                conn = self._idle.pop()
+                self._all.discard(conn)
+                conn.really_close()
+            self._lock.notify_all()
+
+    def stats(self):
+        """Return pool counters as a plain dict"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'database': self.database,
+                'profile': self.profile,
+                'read_only': self.read_only,
+                'max_connections': self.max_connections,
+                'open_connections': len(self._all),
+                'idle_connections': len(self._idle),
+                'in_use': len(self._all) - len(self._idle),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / requests, 4) if requests else 0.0,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'wait_time_total_ms': round(self.wait_time_total * 1000, 3),
+                'wait_time_max_ms': round(self.wait_time_max * 1000, 3),
+            }
@@ -0,0 +1,202 @@
+"""
+Finance Assistant Bot - Debt Payoff Engine
+==========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Vectorized month-by-month debt payoff simulation with rollover across strategies.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import numpy as np
+
+STRATEGIES = ('snowball', 'avalanche', 'custom')
+MAX_MONTHS = 600
+# The simulation keeps a months x strategies x debts history per quantity
+MAX_DEBTS = 100
+# Balances below half a cent count as paid off
+PAID_OFF = 0.005
+
+
+class DebtInputError(ValueError):
+    """Raised when the debts or payment cannot be simulated"""
+
+
+def normalize_debts(debts):
+    """Validate request debts into dicts with name, balance, interest_rate and minimum_payment"""
+    if not isinstance(debts, (list, tuple)):
+        raise DebtInputError('debts must be a list')
+    if len(debts) > MAX_DEBTS:
+        raise DebtInputError(f'At most {MAX_DEBTS} debts can be simulated at once')
+    normalized = []
+    for index, debt in enumerate(debts):
+        try:
+            balance = float(debt['balance'])
+            rate = float(debt.get('interest_rate', 0) or 0)
+            minimum = float(debt.get('minimum_payment', 0) or 0)
+        except (KeyError, TypeError, ValueError):
+            raise DebtInputError(f'Debt {index + 1} needs a numeric balance')
+        if balance < 0 or rate < 0 or minimum < 0:
+            raise DebtInputError(f'Debt {index + 1} has a negative value')
+        normalized.append({'name': str(debt.get('name') or f'Debt {index + 1}'), 'balance': balance,
+                           'interest_rate': rate, 'minimum_payment': minimum})
+    return normalized
+
+
+def load_user_debts(conn, user_id):
+    """Return the user's stored debts in the request format"""
+    rows = conn.execute('''SELECT debt_name, current_balance, interest_rate, minimum_payment
+                           FROM debts WHERE user_id = ? ORDER BY id''', (user_id,)).fetchall()
+    return [{'name': row['debt_name'], 'balance': row['current_balance'], 'interest_rate': row['interest_rate'],
+             'minimum_payment': row['minimum_payment']} for row in rows]
+
+
+def payoff_order(debts, strategy, custom_order=None):
+    """Return debt indexes in the order extra money is applied.
+
+    Snowball targets the smallest balance, avalanche the highest rate.
+    A custom order lists debt names or indexes; debts it leaves out
+    follow in avalanche order.
+    """
+    indexes = range(len(debts))
+    if strategy == 'snowball':
+        return sorted(indexes, key=lambda i: (debts[i]['balance'], -debts[i]['interest_rate']))
+    avalanche = sorted(indexes, key=lambda i: (-debts[i]['interest_rate'], debts[i]['balance']))
+    if strategy == 'avalanche':
+        return avalanche
+    if strategy != 'custom':
+        raise DebtInputError(f"strategy must be one of {', '.join(STRATEGIES)}")
+    names = {debt['name']: i for i, debt in enumerate(debts)}
+    chosen = []
+    for item in custom_order or []:
+        index = item if isinstance(item, int) else names.get(item)
+        if index is None or not 0 <= index < len(debts) or index in chosen:
+            raise DebtInputError(f'Unknown or repeated debt in custom_order: {item!r}')
+        chosen.append(index)
+    return chosen + [i for i in avalanche if i not in chosen]
+
+
+class PayoffResult:
+    """Simulated schedules for several strategies over the same debts.
+
+    ``balances``, ``payments`` and ``interest`` have shape
+    (months, strategies, debts). Summaries are computed from them up
+    front; month-by-month schedules are only built when iterated.
+    """
+
+    def __init__(self, debts, strategies, monthly_payment, balances, payments, interest, paid_off_month):
+        self.debts = debts
+        self.strategies = strategies
+        self.monthly_payment = monthly_payment
+        self.balances = balances
+        self.payments = payments
+        self.interest = interest
+        self.paid_off_month = paid_off_month
+
+    def summary(self, strategy):
+        s = self.strategies.index(strategy)
+        paid_off = self.paid_off_month[s]
+        interest = self.interest[:, s, :].sum(axis=0)
+        debt_free = bool((paid_off >= 0).all())
+        total_months = int(paid_off.max()) if debt_free else len(self.balances)
+        plan = []
+        for d in np.argsort(np.where(paid_off >= 0, paid_off, len(self.balances) + 1), kind='stable'):
+            debt = self.debts[d]
+            plan.append({
+                'debt_name': debt['name'],
+                'months': int(paid_off[d]) if paid_off[d] >= 0 else None,
+                'paid_off': bool(paid_off[d] >= 0),
+                'total_paid': round(float(self.payments[:, s, d].sum()), 2),
+                'interest_paid': round(float(interest[d]), 2),
+            })
+        return {
+            'strategy': strategy,
+            'monthly_payment': self.monthly_payment,
+            'debt_free': debt_free,
+            'total_months': total_months,
+            'total_years': round(total_months / 12, 1),
+            'total_interest': round(float(interest.sum()), 2),
+            'total_paid': round(float(self.payments[:, s, :].sum()), 2),
+            'payoff_plan': plan,
+        }
+
+    def schedule(self, strategy):
+        """Yield one dict per simulated month for ``strategy``"""
+        s = self.strategies.index(strategy)
+        last = self.summary(strategy)['total_months']
+        names = [debt['name'] for debt in self.debts]
+        for month in range(last):
+            payments, interest, balances = self.payments[month, s], self.interest[month, s], self.balances[month, s]
+            yield {
+                'month': month + 1,
+                'payment': round(float(payments.sum()), 2),
+                'interest': round(float(interest.sum()), 2),
+                'remaining_balance': round(float(balances.sum()), 2),
+                'debts': [{'name': name, 'payment': round(float(p), 2), 'interest': round(float(i), 2),
+                           'balance': round(float(b), 2)}
+                          for name, p, i, b in zip(names, payments, interest, balances) if p or b],
+            }
+
+
+def simulate_payoff(debts, monthly_payment, strategies=('snowball', 'avalanche'), custom_order=None,
+                    max_months=MAX_MONTHS):
+    """Simulate paying ``monthly_payment`` a month across all debts at once.
+
+    Each month every open debt accrues interest and receives its minimum
+    payment. Whatever is left of the budget goes to debts in strategy
+    order, so a paid-off debt's minimum rolls over to the next target.
+    Strategies are rows and debts are columns of the same arrays, so one
+    pass of the month loop advances every strategy together.
+    """
+    debts = normalize_debts(debts)
+    if not debts:
+        raise DebtInputError('No debts to simulate')
+    minimums = np.array([debt['minimum_payment'] for debt in debts])
+    if monthly_payment < minimums.sum() - PAID_OFF:
+        raise DebtInputError(f'monthly_payment must cover the minimum payments ({minimums.sum():.2f})')
+    strategies = list(dict.fromkeys(strategies))
+    order = np.array([payoff_order(debts, strategy, custom_order) for strategy in strategies])
+
+    # Work in priority order: column 0 of each strategy row is its first
+    # target, so the month loop needs no gathers or scatters
+    balance = np.array([debt['balance'] for debt in debts])[order]
+    rates = (np.array([debt['interest_rate'] for debt in debts]) / 100 / 12)[order]
+    minimums = minimums[order]
+    balance[balance < PAID_OFF] = 0.0
+    paid_off_month = np.where(balance == 0, 0, -1)
+    history = np.zeros((3, max_months) + balance.shape)
+    history_balance, history_payment, history_interest = history
+
+    months = 0
+    while months < max_months and balance.any():
+        interest = np.multiply(balance, rates, out=history_interest[months])
+        balance += interest
+        payment = np.minimum(minimums, balance, out=history_payment[months])
+        # Spread the rest of the budget over the remaining balances in order
+        remaining = balance - payment
+        ahead = np.cumsum(remaining, axis=1)
+        ahead -= remaining
+        left = monthly_payment - payment.sum(axis=1)
+        payment += np.clip(left[:, None] - ahead, 0, remaining)
+        balance -= payment
+        balance[balance < PAID_OFF] = 0.0
+        months += 1
+        paid_off_month[(paid_off_month < 0) & (balance == 0)] = months
+        history_balance[months - 1] = balance
+
+    # Back to the caller's debt order
+    restore = np.argsort(order, axis=1)
+
+    def unpermute(values):
+        return np.take_along_axis(values, np.broadcast_to(restore, values.shape), axis=-1)
+
+    return PayoffResult(debts, strategies, monthly_payment, unpermute(history_balance[:months]),
+                        unpermute(history_payment[:months]), unpermute(history_interest[:months]),
+                        unpermute(paid_off_month))
@@ -0,0 +1,319 @@
+"""
+Finance Assistant Bot - Statement Import
+========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Streaming CSV/OFX/QIF statement parsers and a chunked, deduplicating bulk insert.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import csv
+import hashlib
+import re
+from datetime import datetime
+from itertools import islice
+
+IMPORT_FORMATS = ('csv', 'ofx', 'qif')
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 20
+
+CREDIT_TYPES = ('deposit', 'transfer_in')
+# The same types as an SQL list for IN (...) clauses
+CREDIT_TYPES_SQL = ', '.join(f"'{transaction_type}'" for transaction_type in CREDIT_TYPES)
+TRANSACTION_TYPES = ('deposit', 'withdrawal', 'payment', 'transfer_in', 'transfer_out')
+
+_DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', "%m/%d'%y", '%Y%m%d%H%M%S', '%Y%m%d')
+
+# Accepted CSV header names for each field (compared lower-cased)
+_CSV_COLUMNS = {
+    'date': ('date', 'transaction date', 'posted date', 'posting date'),
+    'description': ('description', 'memo', 'payee', 'details', 'name'),
+    'amount': ('amount',),
+    'debit': ('debit', 'money out'),
+    'credit': ('credit', 'money in'),
+    'type': ('type', 'transaction type'),
+    'category': ('category',),
+}
+
+_OFX_TAG_RE = re.compile(r'<(/?)(\w+)>([^<\r\n]*)')
+
+
+class ImportFormatError(ValueError):
+    """Raised when a statement cannot be parsed at all"""
+
+
+def add_import_hash_column(conn):
+    """Add transactions.import_hash unless it is already there"""
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(transactions)')]
+    if 'import_hash' not in columns:
+        conn.execute('ALTER TABLE transactions ADD COLUMN import_hash TEXT')
+
+
+def detect_format(filename):
+    """Guess the statement format from a file name (None if unknown)"""
+    extension = (filename or '').rsplit('.', 1)[-1].lower()
+    if extension in ('ofx', 'qfx'):
+        return 'ofx'
+    if extension in IMPORT_FORMATS:
+        return extension
+    return None
+
+
+def parse_date(value):
+    """Normalise a statement date to 'YYYY-MM-DD HH:MM:SS'"""
+    value = value.strip()
+    if value[4:5] == '-':
+        # ISO dates (the common case) parse far faster than through strptime
+        try:
+            return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            pass
+    # OFX timestamps may carry fractions and a timezone: 20260105120000.000[-5:EST]
+    if value[:8].isdigit():
+        value = value.split('.', 1)[0].split('[', 1)[0]
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            continue
+    raise ValueError(f'Unrecognised date: {value!r}')
+
+
+def parse_amount(value):
+    """Parse '1,234.50', '(12.00)' or '-$12' into a signed float"""
+    text = value.strip().replace(',', '').replace('$', '')
+    negative = text.startswith('(') and text.endswith(')')
+    if negative:
+        text = text[1:-1]
+    amount = float(text)
+    return -amount if negative else amount
+
+
+def _record(date, amount, description, category=None, transaction_type=None):
+    """Build a normalised record from raw statement fields"""
+    signed = parse_amount(amount) if isinstance(amount, str) else amount
+    if transaction_type not in TRANSACTION_TYPES:
+        transaction_type = 'deposit' if signed >= 0 else 'withdrawal'
+    elif transaction_type not in CREDIT_TYPES:
+        signed = -abs(signed)
+    else:
+        signed = abs(signed)
+    return {
+        'created_at': parse_date(date),
+        'amount': signed,
+        'description': (description or '').strip() or 'Imported transaction',
+        'category': (category or '').strip() or 'Other',
+        'transaction_type': transaction_type,
+    }
+
+
+def parse_csv(lines):
+    """Yield (line number, record or error) from CSV text lines.
+
+    A signed ``Amount`` column, or separate ``Debit``/``Credit`` columns,
+    is accepted. A ``Type`` column holding one of the ledger's
+    transaction types overrides the sign, so files written by the CSV
+    export can be imported back.
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    names = [name.strip().lower() for name in header]
+    columns = {}
+    for field, aliases in _CSV_COLUMNS.items():
+        for index, name in enumerate(names):
+            if name in aliases:
+                columns[field] = index
+                break
+    if 'date' not in columns or not ('amount' in columns or 'debit' in columns or 'credit' in columns):
+        raise ImportFormatError('CSV needs a Date column and an Amount (or Debit/Credit) column')
+
+    def cell(row, field):
+        index = columns.get(field)
+        return row[index] if index is not None and index < len(row) else ''
+
+    for row in reader:
+        if not any(value.strip() for value in row):
+            continue
+        try:
+            if 'amount' in columns:
+                amount = parse_amount(cell(row, 'amount'))
+            else:
+                credit, debit = cell(row, 'credit').strip(), cell(row, 'debit').strip()
+                amount = parse_amount(credit) if credit else -abs(parse_amount(debit))
+            yield reader.line_num, _record(cell(row, 'date'), amount, cell(row, 'description'),
+                                           cell(row, 'category'), cell(row, 'type').strip().lower())
+        except (ValueError, IndexError) as e:
+            yield reader.line_num, str(e)
+
+
+def parse_ofx(lines):
+    """Yield (line number, record or error) for each <STMTTRN> of an OFX file"""
+    fields = None
+    started = 0
+    for line_number, line in enumerate(lines, 1):
+        for closing, tag, value in _OFX_TAG_RE.findall(line):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                if not closing:
+                    fields, started = {}, line_number
+                    continue
+                if fields is not None:
+                    yield started, _ofx_record(fields)
+                fields = None
+            elif fields is not None and not closing and value.strip():
+                fields[tag] = value.strip()
+    if fields:
+        yield started, _ofx_record(fields)
+
+
+def _ofx_record(fields):
+    try:
+        description = fields.get('NAME') or fields.get('PAYEE') or ''
+        if fields.get('MEMO') and fields['MEMO'] != description:
+            description = f"{description} {fields['MEMO']}".strip()
+        return _record(fields['DTPOSTED'], fields['TRNAMT'], description)
+    except (KeyError, ValueError) as e:
+        return f'Invalid OFX transaction: {e}'
+
+
+def parse_qif(lines):
+    """Yield (line number, record or error) for each '^'-terminated QIF entry"""
+    fields = {}
+    started = None
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if not line or line.startswith('!'):
+            continue
+        code, value = line[0], line[1:]
+        if code == '^':
+            if fields:
+                yield started, _qif_record(fields)
+            fields, started = {}, None
+            continue
+        if started is None:
+            started = line_number
+        fields.setdefault(code, value)
+    if fields:
+        yield started, _qif_record(fields)
+
+
+def _qif_record(fields):
+    try:
+        description = fields.get('P') or fields.get('M') or ''
+        return _record(fields['D'], fields.get('T') or fields['U'], description, fields.get('L'))
+    except (KeyError, ValueError) as e:
+        return f'Invalid QIF entry: {e}'
+
+
+PARSERS = {'csv': parse_csv, 'ofx': parse_ofx, 'qif': parse_qif}
+
+
+def import_transactions(conn, account_id, lines, fmt, chunk_size=IMPORT_CHUNK_SIZE):
+    """Stream a statement into ``account_id`` inside one write transaction.
+
+    Rows are inserted ``chunk_size`` at a time with executemany. Each one
+    carries an import hash of (date, amount, description, occurrence), and
+    a unique index on (account_id, import_hash) turns re-imports and
+    overlapping statements into no-ops. Once everything is in,
+    balance_after is recomputed in (created_at, id) order from the
+    earliest imported date, and the account balance is moved by the net
+    imported amount in one UPDATE.
+
+    Returns a summary dict; rolls back and re-raises on failure.
+    """
+    parser = PARSERS[fmt]
+    summary = {'imported': 0, 'duplicates': 0, 'skipped': 0, 'errors': []}
+    occurrences = {}
+    earliest = None
+    net = 0.0
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        account = conn.execute('SELECT balance FROM accounts WHERE id = ?', (account_id,)).fetchone()
+        records = parser(lines)
+        while True:
+            chunk = []
+            for line_number, record in islice(records, chunk_size):
+                if isinstance(record, str):
+                    summary['skipped'] += 1
+                    if len(summary['errors']) < MAX_REPORTED_ERRORS:
+                        summary['errors'].append({'line': line_number, 'error': record})
+                    continue
+                key = f"{record['created_at']}|{record['amount']:.2f}|{record['description']}"
+                digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+                occurrence = occurrences.get(digest, 0)
+                occurrences[digest] = occurrence + 1
+                import_hash = hashlib.blake2b(f'{key}|{occurrence}'.encode('utf-8'), digest_size=16).hexdigest()
+                chunk.append((account_id, record['transaction_type'], abs(record['amount']), record['description'],
+                              record['category'], record['created_at'], import_hash, record['amount']))
+            if not chunk:
+                break
+
+            # rowcount sums sqlite3_changes() per row, so trigger writes are not counted
+            inserted = conn.executemany('''INSERT OR IGNORE INTO transactions
+                                           (account_id, transaction_type, amount, description, category,
+                                            created_at, import_hash)
+                                           VALUES (?, ?, ?, ?, ?, ?, ?)''', [row[:7] for row in chunk]).rowcount
+            summary['imported'] += inserted
+            summary['duplicates'] += len(chunk) - inserted
+            if inserted == len(chunk):
+                net += sum(row[7] for row in chunk)
+                first = min(row[5] for row in chunk)
+                earliest = first if earliest is None or first < earliest else earliest
+            elif inserted:
+                # Some rows were duplicates: find out which ones went in
+                placeholders = ','.join('?' * len(chunk))
+                landed = conn.execute(f'''SELECT import_hash FROM transactions
+                                          WHERE account_id = ? AND import_hash IN ({placeholders})
+                                          AND balance_after IS NULL''',
+                                      [account_id] + [row[6] for row in chunk]).fetchall()
+                landed = {row['import_hash'] for row in landed}
+                for row in chunk:
+                    if row[6] in landed:
+                        net += row[7]
+                        earliest = row[5] if earliest is None or row[5] < earliest else earliest
+
+        if summary['imported']:
+            recompute_balances(conn, account_id, earliest, account['balance'], net)
+        new_balance = round(account['balance'] + net, 2)
+        conn.execute('UPDATE accounts SET balance = ? WHERE id = ?', (new_balance, account_id))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    summary['balance'] = new_balance
+    return summary
+
+
+def recompute_balances(conn, account_id, since, current_balance, net):
+    """Rewrite balance_after for every row of the account from ``since`` on"""
+    signed = f"CASE WHEN transaction_type IN ({CREDIT_TYPES_SQL}) THEN amount ELSE -amount END"
+    before = conn.execute('''SELECT balance_after FROM transactions
+                             WHERE account_id = ? AND created_at < ? AND balance_after IS NOT NULL
+                             ORDER BY created_at DESC, id DESC LIMIT 1''', (account_id, since)).fetchone()
+    if before is not None:
+        opening = before['balance_after']
+    else:
+        # No earlier history: back the opening balance out of the final one
+        total = conn.execute(f'SELECT COALESCE(SUM({signed}), 0) AS total FROM transactions WHERE account_id = ?',
+                             (account_id,)).fetchone()['total']
+        opening = current_balance + net - total
+    conn.execute(f'''
+        WITH running AS (
+            SELECT id, ? + SUM({signed}) OVER (ORDER BY created_at, id) AS balance
+            FROM transactions
+            WHERE account_id = ? AND created_at >= ?
+        )
+        UPDATE transactions SET balance_after = round(running.balance, 2)
+        FROM running WHERE transactions.id = running.id
+    ''', (opening, account_id, since))
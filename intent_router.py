@@ -0,0 +1,153 @@
+"""
+Finance Assistant Bot - Chat Intent Router
+==========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Compiled keyword matcher that dispatches chat messages to intent handlers.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+
+class IntentRouter:
+    """Registry of chat intents matched in a single pass over the message.
+
+    Every keyword of every intent is compiled into one trie-shaped regular
+    expression that reports the longest keyword starting at each position.
+    Any shorter keyword matching at the same position is a prefix of that
+    one, so each keyword is scored with the best priority among its
+    prefixes. The lowest score over the scan is therefore the same intent
+    an ordered chain of ``any(word in message ...)`` tests would pick.
+    """
+
+    def __init__(self, default=None):
+        self._intents = {}
+        self._default = default
+        self._pattern = None
+        self._keyword_intent = {}
+
+    def intent(self, name, priority, keywords, access='write'):
+        """Decorator registering a handler for ``keywords``.
+
+        ``access`` is 'read' for handlers that never write, so they can be
+        given a read-only database connection.
+        """
+        if access not in ('read', 'write'):
+            raise ValueError(f'Unknown access mode: {access}')
+
+        def decorator(func):
+            if name in self._intents:
+                raise ValueError(f'Intent already registered: {name}')
+            self._intents[name] = (priority, tuple(keywords), func, access)
+            self._pattern = None
+            return func
+        return decorator
+
+    def default(self, func):
+        """Decorator registering the handler used when nothing matches"""
+        self._default = func
+        return func
+
+    def _compile(self):
+        keyword_priority = {}
+        for name, (priority, keywords, _, _) in self._intents.items():
+            for keyword in keywords:
+                if keyword not in keyword_priority or priority < keyword_priority[keyword][0]:
+                    keyword_priority[keyword] = (priority, name)
+        self._keyword_intent = {
+            keyword: min(best for other, best in keyword_priority.items()
+                         if keyword.startswith(other))
+            for keyword in keyword_priority
+        }
+        trie = {}
+        for keyword in keyword_priority:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = True
+        self._pattern = re.compile('(?=(' + _trie_regex(trie) + '))')
+
+    def route(self, message):
+        """Return the name of the intent for ``message`` (None if unmatched)"""
+        if self._pattern is None:
+            self._compile()
+        best = None
+        for match in self._pattern.finditer(message):
+            candidate = self._keyword_intent[match.group(1)]
+            if best is None or candidate < best:
+                best = candidate
+        return best[1] if best else None
+
+    def dispatch(self, message, *args):
+        """Route ``message`` and call the matching handler"""
+        name = self.route(message)
+        if name is None:
+            return self._default(message, *args)
+        return self._intents[name][2](message, *args)
+
+    def handler(self, name):
+        """Return the handler for ``name`` (the default handler for None)"""
+        return self._default if name is None else self._intents[name][2]
+
+    def access(self, name):
+        """Return 'read' or 'write' for ``name``; the default handler only reads"""
+        return 'read' if name is None else self._intents[name][3]
+
+
+def _trie_regex(node):
+    """Build a regex from a character trie, preferring the longest match"""
+    branches = [re.escape(char) + _trie_regex(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        body = '(?:' + body + ')?'
+    return body
+
+
+class StageTimer:
+    """Thread-safe count/total/max latency counters per named stage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    @contextmanager
+    def time(self, stage):
+        """Context manager recording the elapsed time of ``stage``"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def record(self, stage, elapsed):
+        with self._lock:
+            count, total, worst = self._stages.get(stage, (0, 0.0, 0.0))
+            self._stages[stage] = (count + 1, total + elapsed, max(worst, elapsed))
+
+    def stats(self):
+        """Return per-stage counters in milliseconds"""
+        with self._lock:
+            return {
+                stage: {
+                    'count': count,
+                    'total_ms': round(total * 1000, 3),
+                    'avg_ms': round(total * 1000 / count, 4) if count else 0.0,
+                    'max_ms': round(worst * 1000, 3),
+                }
+                for stage, (count, total, worst) in self._stages.items()
+            }
@@ -0,0 +1,208 @@
+"""
+Finance Assistant Bot - Ledger Writes
+=====================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Atomic transfers and bill payments with retry on a busy database.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+BUSY_RETRIES = 5
+BUSY_BASE_DELAY = 0.01
+BUSY_MAX_DELAY = 0.5
+
+# Balances only ever move through these statements. The WHERE clause makes
+# the debit and its funds check one step, so no read-modify-write window
+# exists for a concurrent writer to slip into.
+DEBIT_SQL = 'UPDATE accounts SET balance = balance - ? WHERE id = ? AND balance >= ? RETURNING balance'
+CREDIT_SQL = 'UPDATE accounts SET balance = balance + ? WHERE id = ? RETURNING balance'
+BILL_BY_TYPE_SQL = 'SELECT id, amount FROM bills WHERE user_id = ? AND bill_type = ? AND status = ?'
+FIRST_ACCOUNT_SQL = 'SELECT id FROM accounts WHERE user_id = ? ORDER BY id LIMIT 1'
+RECORD_SQL = '''INSERT INTO transactions (account_id, transaction_type, amount, description, category, balance_after)
+                VALUES (?, ?, ?, ?, ?, ?)'''
+
+
+class LedgerError(Exception):
+    """A write that was refused; ``status`` is the HTTP status to answer with"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class InsufficientFundsError(LedgerError):
+    def __init__(self, required, available):
+        super().__init__('Insufficient balance', 400)
+        self.required = required
+        self.available = available
+
+
+def is_busy(error):
+    """True for SQLITE_BUSY / SQLITE_LOCKED, which are worth retrying"""
+    code = getattr(error, 'sqlite_errorcode', None)
+    if code is not None:
+        return code & 0xff in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return 'locked' in str(error) or 'busy' in str(error)
+
+
+class WriteRetry:
+    """Runs a unit of work in one BEGIN IMMEDIATE transaction, retrying when busy.
+
+    BEGIN IMMEDIATE takes the write lock before anything is read, so a
+    unit never has to upgrade a read lock (the case SQLite answers with
+    an immediate SQLITE_BUSY). If the lock still cannot be had within
+    the connection's busy timeout, the unit is rolled back and retried
+    up to ``attempts`` times, sleeping a random 0..base * 2**n seconds
+    (capped at ``max_delay``) in between so contending writers spread out.
+    """
+
+    def __init__(self, attempts=BUSY_RETRIES, base_delay=BUSY_BASE_DELAY, max_delay=BUSY_MAX_DELAY):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._units = 0
+        self._retries = 0
+        self._gave_up = 0
+        self._refused = 0
+
+    def run(self, conn, work):
+        """Call ``work(conn)`` atomically and return its result.
+
+        Inside a transaction the caller already owns (an atomic batch) the
+        unit runs under a savepoint instead, is not retried and is left
+        for the owner to commit.
+        """
+        if conn.in_transaction:
+            return self._run_nested(conn, work)
+        for attempt in range(self.attempts + 1):
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                result = work(conn)
+                conn.commit()
+            except sqlite3.OperationalError as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                if not is_busy(e) or attempt == self.attempts:
+                    if is_busy(e):
+                        with self._lock:
+                            self._gave_up += 1
+                    raise
+                with self._lock:
+                    self._retries += 1
+                time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+                continue
+            except LedgerError:
+                conn.rollback()
+                with self._lock:
+                    self._refused += 1
+                raise
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+            with self._lock:
+                self._units += 1
+            return result
+
+    def _run_nested(self, conn, work):
+        conn.execute('SAVEPOINT ledger_write')
+        try:
+            result = work(conn)
+        except Exception as e:
+            conn.execute('ROLLBACK TO ledger_write')
+            conn.execute('RELEASE ledger_write')
+            if isinstance(e, LedgerError):
+                with self._lock:
+                    self._refused += 1
+            raise
+        conn.execute('RELEASE ledger_write')
+        with self._lock:
+            self._units += 1
+        return result
+
+    def stats(self):
+        """Return committed, refused and retried unit counters"""
+        with self._lock:
+            return {
+                'committed': self._units,
+                'refused': self._refused,
+                'busy_retries': self._retries,
+                'busy_gave_up': self._gave_up,
+                'attempts': self.attempts,
+            }
+
+
+def transfer(conn, user_id, from_number, to_number, amount):
+    """Move ``amount`` between two of a user's accounts; call inside :meth:`WriteRetry.run`.
+
+    Accounts are always updated in ascending id order, so two transfers
+    between the same pair in opposite directions take their row locks in
+    the same order on any engine that locks rows.
+    """
+    accounts = {row['account_number']: row for row in conn.execute(
+        'SELECT id, account_number FROM accounts WHERE user_id = ? AND account_number IN (?, ?)',
+        (user_id, from_number, to_number))}
+    if from_number not in accounts or to_number not in accounts:
+        raise LedgerError('Account not found', 404)
+    from_id = accounts[from_number]['id']
+    to_id = accounts[to_number]['id']
+
+    balances = {}
+    for account_id in sorted({from_id, to_id}):
+        if account_id == from_id:
+            balances['from'] = _debit(conn, from_id, amount)
+        if account_id == to_id:
+            balances['to'] = conn.execute(CREDIT_SQL, (amount, to_id)).fetchall()[0]['balance']
+    conn.execute(RECORD_SQL, (from_id, 'transfer_out', amount, f'Transfer to {to_number}', 'Transfer',
+                              balances['from']))
+    conn.execute(RECORD_SQL, (to_id, 'transfer_in', amount, f'Transfer from {from_number}', 'Transfer',
+                              balances['to']))
+    return {'amount': amount, 'from_balance': balances['from'], 'to_balance': balances['to']}
+
+
+def pay_bill(conn, user_id, bill_type):
+    """Pay the user's pending ``bill_type`` bill from their first account.
+
+    The bill is claimed with a conditional status update before the
+    account is debited, so two concurrent payments cannot both pay it.
+    Order of writes: bills, then accounts.
+    """
+    bill = conn.execute(BILL_BY_TYPE_SQL, (user_id, bill_type, 'pending')).fetchone()
+    if not bill:
+        raise LedgerError(f'No pending {bill_type} bill found.', 404)
+    account = conn.execute(FIRST_ACCOUNT_SQL, (user_id,)).fetchone()
+    if not account:
+        raise LedgerError('Account not found', 404)
+    claimed = conn.execute('UPDATE bills SET status = ?, paid_at = ? WHERE id = ? AND status = ?',
+                           ('paid', datetime.now().strftime('%Y-%m-%d %H:%M:%S'), bill['id'], 'pending'))
+    if not claimed.rowcount:
+        raise LedgerError(f'The {bill_type} bill has already been paid.', 409)
+    balance = _debit(conn, account['id'], bill['amount'])
+    conn.execute(RECORD_SQL, (account['id'], 'payment', bill['amount'], f'{bill_type} bill payment', 'Utilities',
+                              balance))
+    return {'bill_id': bill['id'], 'amount': bill['amount'], 'balance': balance}
+
+
+def _debit(conn, account_id, amount):
+    # fetchall() runs the statement to completion before anything else is executed
+    rows = conn.execute(DEBIT_SQL, (amount, account_id, amount)).fetchall()
+    if not rows:
+        available = conn.execute('SELECT balance FROM accounts WHERE id = ?', (account_id,)).fetchone()['balance']
+        raise InsufficientFundsError(amount, available)
+    return rows[0]['balance']
@@ -0,0 +1,200 @@
+"""
+Finance Assistant Bot - Loan Amortization
+=========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Vectorized annuity kernel for amortization schedules and loan scenario grids.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+MAX_TERM_YEARS = 50
+GRID_MAX_CELLS = 50000
+
+
+class LoanInputError(ValueError):
+    """Raised for loan parameters that cannot be evaluated"""
+
+
+# At most 601 floats a row, so the cache stays near 1.2 MB
+@lru_cache(maxsize=256)
+def _growth_row(monthly_rate, periods):
+    row = np.power(1.0 + monthly_rate, np.arange(periods + 1))
+    row.flags.writeable = False
+    return row
+
+
+def growth_table(monthly_rates, periods):
+    """Return (1 + r) ** k for k = 0..periods, one row per monthly rate.
+
+    A schedule reads its payment and every balance from one such row.
+    Rows are cached per (rate, periods), so advisors re-running the same
+    loans reuse them.
+    """
+    return np.stack([_growth_row(float(rate), int(periods)) for rate in np.atleast_1d(monthly_rates)])
+
+
+def monthly_rates(annual_rates):
+    return np.asarray(annual_rates, dtype=float) / 100 / 12
+
+
+def payment_factors(rates, periods, growth=None):
+    """Level payment per unit of principal, shape (rates, periods).
+
+    Without ``growth`` rows only the needed powers are computed, so a
+    large grid never builds a full row per rate.
+    """
+    rates = np.atleast_1d(rates)
+    periods = np.atleast_1d(periods)
+    if growth is None:
+        compounded = np.power(1.0 + rates[:, None], periods[None, :])
+    else:
+        compounded = growth[:, periods]
+    rate = rates[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(rate == 0, 1.0 / periods, rate * compounded / (compounded - 1))
+
+
+def payoff(principal, rate, payment):
+    """Periods and total paid to clear ``principal`` paying ``payment`` a period.
+
+    Closed form, broadcast over all arguments. The last payment is only
+    what is left, so extra payments shorten the loan instead of
+    overpaying it.
+    """
+    principal, rate, payment = np.broadcast_arrays(*(np.asarray(value, dtype=float)
+                                                     for value in (principal, rate, payment)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exact = np.where(rate == 0, principal / payment,
+                         -np.log1p(-principal * rate / payment) / np.log1p(rate))
+        periods = np.maximum(np.ceil(exact - 1e-9), 1)
+        compounded = np.power(1 + rate, periods - 1)
+        before_last = np.where(rate == 0, principal - payment * (periods - 1),
+                               principal * compounded - payment * (compounded - 1) / rate)
+    last = before_last * (1 + rate)
+    return periods.astype(int), payment * (periods - 1) + last
+
+
+def validate_loan(principal, annual_rate, term_years, extra_payment=0.0):
+    if principal <= 0 or annual_rate < 0 or not 0 < term_years <= MAX_TERM_YEARS or extra_payment < 0:
+        raise LoanInputError('Invalid parameters')
+
+
+class Amortization:
+    """Per-period schedule of one loan, held as arrays and rendered lazily"""
+
+    def __init__(self, principal, annual_rate, term_years, extra_payment=0.0):
+        validate_loan(principal, annual_rate, term_years, extra_payment)
+        self.principal = principal
+        self.annual_rate = annual_rate
+        self.term_years = term_years
+        self.extra_payment = extra_payment
+        self.num_payments = term_years * 12
+
+        rate = float(monthly_rates(annual_rate))
+        growth = growth_table(rate, self.num_payments)[0]
+        self.monthly_payment = float(payment_factors(rate, self.num_payments, growth[None, :])[0, 0] * principal)
+        payment = self.monthly_payment + extra_payment
+        periods, _ = payoff(principal, rate, payment)
+        periods = int(periods)
+
+        # Balance after k payments: P(1+r)^k - A((1+r)^k - 1)/r
+        compounded = growth[:periods + 1]
+        if rate:
+            balance = principal * compounded - payment * (compounded - 1) / rate
+        else:
+            balance = principal - payment * np.arange(periods + 1)
+        self.interest = balance[:-1] * rate
+        self.payments = np.full(periods, payment)
+        self.payments[-1] = balance[-2] + self.interest[-1]
+        self.principal_paid = self.payments - self.interest
+        self.balances = np.maximum(balance[1:], 0.0)
+        self.balances[-1] = 0.0
+
+    def summary(self):
+        total_payment = float(self.payments.sum())
+        summary = {
+            'principal': self.principal,
+            'annual_rate': self.annual_rate,
+            'term_years': self.term_years,
+            'monthly_payment': round(self.monthly_payment, 2),
+            'total_payment': round(total_payment, 2),
+            # Clamped: a 0% loan can come out a rounding error below zero
+            'total_interest': round(max(total_payment - self.principal, 0.0), 2),
+            'num_payments': self.num_payments,
+            'payoff_payments': len(self.payments),
+        }
+        if self.extra_payment:
+            scheduled_interest = self.monthly_payment * self.num_payments - self.principal
+            summary['extra_payment'] = self.extra_payment
+            summary['interest_saved'] = round(max(scheduled_interest - (total_payment - self.principal), 0.0), 2)
+        return summary
+
+    def rows(self):
+        """Yield one dict per payment"""
+        for period, (payment, interest, principal, balance) in enumerate(
+                zip(self.payments.tolist(), self.interest.tolist(), self.principal_paid.tolist(),
+                    self.balances.tolist()), 1):
+            yield {'period': period, 'payment': round(payment, 2), 'interest': round(interest, 2),
+                   'principal': round(principal, 2), 'balance': round(balance, 2)}
+
+
+def loan_grid(principals, annual_rates, term_years, extra_payments=(0.0,)):
+    """Evaluate every principal x rate x term x extra-payment combination at once.
+
+    Returns a dict of arrays shaped (principals, rates, terms, extras).
+    """
+    principals = np.asarray(principals, dtype=float)
+    rates = monthly_rates(annual_rates)
+    terms = np.asarray(term_years, dtype=int)
+    extras = np.asarray(extra_payments, dtype=float)
+    cells = principals.size * rates.size * terms.size * extras.size
+    if not cells:
+        raise LoanInputError('Every grid axis needs at least one value')
+    if cells > GRID_MAX_CELLS:
+        raise LoanInputError(f'Grid has {cells} scenarios; the limit is {GRID_MAX_CELLS}')
+    if ((principals <= 0).any() or (rates < 0).any() or (extras < 0).any()
+            or (terms <= 0).any() or (terms > MAX_TERM_YEARS).any()):
+        raise LoanInputError('Invalid parameters')
+
+    periods = terms * 12
+    scheduled = principals[:, None, None] * payment_factors(rates, periods)             # (P, R, T)
+    payment = scheduled[..., None] + extras                                              # (P, R, T, E)
+    payoff_periods, total_paid = payoff(principals[:, None, None, None], rates[None, :, None, None], payment)
+    scheduled_interest = scheduled * periods - principals[:, None, None]
+    total_interest = total_paid - principals[:, None, None, None]
+    return {
+        'monthly_payment': scheduled,
+        'total_interest': np.maximum(total_interest, 0.0),
+        'payoff_payments': payoff_periods,
+        'interest_saved': np.maximum(scheduled_interest[..., None] - total_interest, 0.0),
+    }
+
+
+def grid_rows(principals, annual_rates, term_years, extra_payments, grid):
+    """Flatten a :func:`loan_grid` result into one dict per scenario"""
+    for p, principal in enumerate(principals):
+        for r, annual_rate in enumerate(annual_rates):
+            for t, term in enumerate(term_years):
+                for e, extra in enumerate(extra_payments):
+                    yield {
+                        'principal': principal,
+                        'annual_rate': annual_rate,
+                        'term_years': term,
+                        'extra_payment': extra,
+                        'monthly_payment': round(float(grid['monthly_payment'][p, r, t]), 2),
+                        'total_interest': round(float(grid['total_interest'][p, r, t, e]), 2),
+                        'payoff_payments': int(grid['payoff_payments'][p, r, t, e]),
+                        'interest_saved': round(float(grid['interest_saved'][p, r, t, e]), 2),
+                    }
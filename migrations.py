@@ -0,0 +1,407 @@
+"""
+Finance Assistant Bot - Schema Migrations
+=========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Versioned, idempotent schema migrations and query-plan checks.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import re
+
+import queries
+from analytics import CATEGORY_SPENDING_SQL, MONTH_SPENDING_SQL, MONTHLY_TRENDS_SQL, rebuild_rollups, spending_query
+from importer import add_import_hash_column
+from ledger import BILL_BY_TYPE_SQL, FIRST_ACCOUNT_SQL
+from scheduler import DUE_BILLS_SQL, DUE_RECURRING_SQL, add_anchor_date_column
+from search import create_fts_index
+from shards import USER_SHARD_SQL, USER_TABLES
+
+# Ordered list of (version, description, steps). A step is either an SQL
+# statement or a callable taking the connection. Every step must be safe to
+# re-run so a database created before versioning can be brought forward.
+MIGRATIONS = [
+    (1, 'Baseline schema', [
+        # Users table
+        '''CREATE TABLE IF NOT EXISTS users
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      username TEXT UNIQUE NOT NULL,
+                      email TEXT UNIQUE NOT NULL,
+                      password TEXT NOT NULL,
+                      full_name TEXT,
+                      phone TEXT,
+                      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''',
+
+        # Accounts table
+        '''CREATE TABLE IF NOT EXISTS accounts
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id INTEGER NOT NULL,
+                      account_number TEXT UNIQUE NOT NULL,
+                      account_type TEXT NOT NULL,
+                      balance REAL DEFAULT 0.0,
+                      currency TEXT DEFAULT 'USD',
+                      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                      FOREIGN KEY (user_id) REFERENCES users (id))''',
+
+        # Transactions table
+        '''CREATE TABLE IF NOT EXISTS transactions
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      account_id INTEGER NOT NULL,
+                      transaction_type TEXT NOT NULL,
+                      amount REAL NOT NULL,
+                      description TEXT,
+                      category TEXT DEFAULT 'Other',
+                      balance_after REAL,
+                      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                      FOREIGN KEY (account_id) REFERENCES accounts (id))''',
+
+        # Bills table
+        '''CREATE TABLE IF NOT EXISTS bills
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id INTEGER NOT NULL,
+                      bill_type TEXT NOT NULL,
+                      amount REAL NOT NULL,
+                      due_date DATE NOT NULL,
+                      status TEXT DEFAULT 'pending',
+                      paid_at TIMESTAMP,
+                      recurring INTEGER DEFAULT 0,
+                      FOREIGN KEY (user_id) REFERENCES users (id))''',
+
+        # Budgets table
+        '''CREATE TABLE IF NOT EXISTS budgets
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id INTEGER NOT NULL,
+                      category TEXT NOT NULL,
+                      budget_amount REAL NOT NULL,
+                      period TEXT DEFAULT 'monthly',
+                      start_date DATE NOT NULL,
+                      end_date DATE,
+                      FOREIGN KEY (user_id) REFERENCES users (id))''',
+
+        # Savings goals table
+        '''CREATE TABLE IF NOT EXISTS savings_goals
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id INTEGER NOT NULL,
+                      goal_name TEXT NOT NULL,
+                      target_amount REAL NOT NULL,
+                      current_amount REAL DEFAULT 0.0,
+                      target_date DATE,
+                      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                      FOREIGN KEY (user_id) REFERENCES users (id))''',
+
+        # Investment accounts table
+        '''CREATE TABLE IF NOT EXISTS investments
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id INTEGER NOT NULL,
+                      investment_type TEXT NOT NULL,
+                      amount REAL NOT NULL,
+                      purchase_date DATE NOT NULL,
+                      current_value REAL,
+                      description TEXT,
+                      FOREIGN KEY (user_id) REFERENCES users (id))''',
+
+        # Account alerts table
+        '''CREATE TABLE IF NOT EXISTS alerts
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id INTEGER NOT NULL,
+                      alert_type TEXT NOT NULL,
+                      message TEXT NOT NULL,
+                      is_read INTEGER DEFAULT 0,
+                      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                      FOREIGN KEY (user_id) REFERENCES users (id))''',
+
+        # Loans table
+        '''CREATE TABLE IF NOT EXISTS loans
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id INTEGER NOT NULL,
+                      loan_name TEXT NOT NULL,
+                      principal_amount REAL NOT NULL,
+                      interest_rate REAL NOT NULL,
+                      loan_term_months INTEGER NOT NULL,
+                      monthly_payment REAL,
+                      remaining_balance REAL,
+                      start_date DATE NOT NULL,
+                      status TEXT DEFAULT 'active',
+                      FOREIGN KEY (user_id) REFERENCES users (id))''',
+
+        # Debts table
+        '''CREATE TABLE IF NOT EXISTS debts
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id INTEGER NOT NULL,
+                      debt_name TEXT NOT NULL,
+                      total_amount REAL NOT NULL,
+                      current_balance REAL NOT NULL,
+                      interest_rate REAL DEFAULT 0.0,
+                      minimum_payment REAL DEFAULT 0.0,
+                      due_date INTEGER DEFAULT 1,
+                      FOREIGN KEY (user_id) REFERENCES users (id))''',
+
+        # Recurring transactions table
+        '''CREATE TABLE IF NOT EXISTS recurring_transactions
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id INTEGER NOT NULL,
+                      account_id INTEGER NOT NULL,
+                      description TEXT NOT NULL,
+                      amount REAL NOT NULL,
+                      transaction_type TEXT NOT NULL,
+                      category TEXT,
+                      frequency TEXT NOT NULL,
+                      next_date DATE NOT NULL,
+                      end_date DATE,
+                      is_active INTEGER DEFAULT 1,
+                      FOREIGN KEY (user_id) REFERENCES users (id),
+                      FOREIGN KEY (account_id) REFERENCES accounts (id))''',
+
+        # Custom categories table
+        '''CREATE TABLE IF NOT EXISTS custom_categories
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id INTEGER NOT NULL,
+                      category_name TEXT NOT NULL,
+                      parent_category TEXT,
+                      color TEXT,
+                      icon TEXT,
+                      FOREIGN KEY (user_id) REFERENCES users (id))''',
+
+        # Transaction tags table
+        '''CREATE TABLE IF NOT EXISTS transaction_tags
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      transaction_id INTEGER NOT NULL,
+                      tag_name TEXT NOT NULL,
+                      FOREIGN KEY (transaction_id) REFERENCES transactions (id))''',
+    ]),
+    (2, 'Secondary indexes for hot query paths', [
+        # Covers the per-account date-range listings and the spending
+        # aggregations (type, category and amount are read from the index)
+        '''CREATE INDEX IF NOT EXISTS idx_transactions_account_created
+           ON transactions (account_id, created_at, transaction_type, category, amount)''',
+        'CREATE INDEX IF NOT EXISTS idx_accounts_user ON accounts (user_id)',
+        'CREATE INDEX IF NOT EXISTS idx_bills_user_status_due ON bills (user_id, status, due_date)',
+        'CREATE INDEX IF NOT EXISTS idx_bills_user_due ON bills (user_id, due_date)',
+        'CREATE INDEX IF NOT EXISTS idx_budgets_user ON budgets (user_id, category)',
+        'CREATE INDEX IF NOT EXISTS idx_savings_goals_user_target ON savings_goals (user_id, target_date)',
+        'CREATE INDEX IF NOT EXISTS idx_investments_user ON investments (user_id)',
+        'CREATE INDEX IF NOT EXISTS idx_alerts_user_read_created ON alerts (user_id, is_read, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_loans_user ON loans (user_id)',
+        'CREATE INDEX IF NOT EXISTS idx_debts_user ON debts (user_id)',
+        '''CREATE INDEX IF NOT EXISTS idx_recurring_user_active_next
+           ON recurring_transactions (user_id, is_active, next_date)''',
+        'CREATE INDEX IF NOT EXISTS idx_custom_categories_user ON custom_categories (user_id)',
+        'CREATE INDEX IF NOT EXISTS idx_transaction_tags_transaction ON transaction_tags (transaction_id)',
+    ]),
+    (3, 'Spending rollups maintained by triggers', [
+        # One row per (account, day or month bucket, category, type)
+        '''CREATE TABLE IF NOT EXISTS transaction_rollups
+           (account_id INTEGER NOT NULL,
+            bucket_type TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            category TEXT NOT NULL,
+            transaction_type TEXT NOT NULL,
+            total REAL NOT NULL DEFAULT 0,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (account_id, bucket_type, bucket, category, transaction_type))
+           WITHOUT ROWID''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_insert
+           AFTER INSERT ON transactions
+           BEGIN
+               INSERT INTO transaction_rollups VALUES
+                   (NEW.account_id, 'day', substr(NEW.created_at, 1, 10), COALESCE(NEW.category, 'Other'),
+                    NEW.transaction_type, NEW.amount, 1),
+                   (NEW.account_id, 'month', substr(NEW.created_at, 1, 7), COALESCE(NEW.category, 'Other'),
+                    NEW.transaction_type, NEW.amount, 1)
+               ON CONFLICT (account_id, bucket_type, bucket, category, transaction_type)
+               DO UPDATE SET total = total + excluded.total, count = count + 1;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_delete
+           AFTER DELETE ON transactions
+           BEGIN
+               UPDATE transaction_rollups SET total = total - OLD.amount, count = count - 1
+               WHERE account_id = OLD.account_id AND category = COALESCE(OLD.category, 'Other')
+               AND transaction_type = OLD.transaction_type
+               AND ((bucket_type = 'day' AND bucket = substr(OLD.created_at, 1, 10))
+                    OR (bucket_type = 'month' AND bucket = substr(OLD.created_at, 1, 7)));
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_update
+           AFTER UPDATE OF account_id, transaction_type, amount, category, created_at ON transactions
+           BEGIN
+               UPDATE transaction_rollups SET total = total - OLD.amount, count = count - 1
+               WHERE account_id = OLD.account_id AND category = COALESCE(OLD.category, 'Other')
+               AND transaction_type = OLD.transaction_type
+               AND ((bucket_type = 'day' AND bucket = substr(OLD.created_at, 1, 10))
+                    OR (bucket_type = 'month' AND bucket = substr(OLD.created_at, 1, 7)));
+               INSERT INTO transaction_rollups VALUES
+                   (NEW.account_id, 'day', substr(NEW.created_at, 1, 10), COALESCE(NEW.category, 'Other'),
+                    NEW.transaction_type, NEW.amount, 1),
+                   (NEW.account_id, 'month', substr(NEW.created_at, 1, 7), COALESCE(NEW.category, 'Other'),
+                    NEW.transaction_type, NEW.amount, 1)
+               ON CONFLICT (account_id, bucket_type, bucket, category, transaction_type)
+               DO UPDATE SET total = total + excluded.total, count = count + 1;
+           END''',
+        rebuild_rollups,
+    ]),
+    (4, 'Full-text index for transaction search', [
+        create_fts_index,
+    ]),
+    (5, 'Server-side session table', [
+        '''CREATE TABLE IF NOT EXISTS sessions
+                     (id TEXT PRIMARY KEY,
+                      data TEXT NOT NULL,
+                      expires_at INTEGER NOT NULL) WITHOUT ROWID''',
+        'CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)',
+    ]),
+    (6, 'Import hashes for statement deduplication', [
+        add_import_hash_column,
+        '''CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_import_hash
+           ON transactions (account_id, import_hash) WHERE import_hash IS NOT NULL''',
+    ]),
+    (7, 'Scheduler occurrence ledger and due-date indexes', [
+        # One row per posted occurrence of a recurring transaction or bill
+        '''CREATE TABLE IF NOT EXISTS scheduled_postings
+                     (source TEXT NOT NULL,
+                      source_id INTEGER NOT NULL,
+                      occurrence DATE NOT NULL,
+                      transaction_id INTEGER,
+                      posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                      PRIMARY KEY (source, source_id, occurrence)) WITHOUT ROWID''',
+        '''CREATE INDEX IF NOT EXISTS idx_recurring_due
+           ON recurring_transactions (next_date) WHERE is_active = 1''',
+        """CREATE INDEX IF NOT EXISTS idx_bills_recurring_due
+           ON bills (due_date) WHERE recurring = 1 AND status = 'pending'""",
+    ]),
+    (8, 'Dated exchange rates', [
+        # Units of the currency per one US dollar, one row per feed date
+        '''CREATE TABLE IF NOT EXISTS exchange_rates
+                     (currency TEXT NOT NULL,
+                      as_of DATE NOT NULL,
+                      rate REAL NOT NULL CHECK (rate > 0),
+                      loaded_at REAL NOT NULL,
+                      PRIMARY KEY (currency, as_of)) WITHOUT ROWID''',
+    ]),
+    (9, 'User shard placement', [
+        # Main database only: the shard holding each user's data (-1 is the
+        # main database); users without a row have never been moved
+        '''CREATE TABLE IF NOT EXISTS user_shards
+                     (user_id INTEGER PRIMARY KEY,
+                      shard INTEGER NOT NULL,
+                      moving_to INTEGER,
+                      moved_from INTEGER)''',
+        # Every database: users whose data was moved away. Inserts for them
+        # from a request that still routed here fail instead of being lost.
+        'CREATE TABLE IF NOT EXISTS moved_users (user_id INTEGER PRIMARY KEY)',
+        *[f'''CREATE TRIGGER IF NOT EXISTS trg_{table}_moved_user
+              BEFORE INSERT ON {table}
+              WHEN EXISTS (SELECT 1 FROM moved_users WHERE user_id = NEW.user_id)
+              BEGIN
+                  SELECT RAISE(ABORT, 'user was moved to another shard');
+              END''' for table in USER_TABLES],
+    ]),
+    (10, 'Recurring transaction anchor dates', [
+        # The date occurrences are counted from, so month-end clamping
+        # in one month does not carry into the next
+        add_anchor_date_column,
+    ]),
+]
+
+
+def get_schema_version(conn):
+    """Return the highest applied migration version (0 for a new database)"""
+    conn.execute('''CREATE TABLE IF NOT EXISTS schema_version
+                    (version INTEGER PRIMARY KEY,
+                     description TEXT NOT NULL,
+                     applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(conn, target=None):
+    """Apply pending migrations in order, each in its own transaction.
+
+    Returns the list of versions applied by this call.
+    """
+    current = get_schema_version(conn)
+    conn.commit()
+    applied = []
+    for version, description, steps in MIGRATIONS:
+        if version <= current or (target is not None and version > target):
+            continue
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Another process may have applied it while we waited for the lock
+            done = conn.execute('SELECT 1 FROM schema_version WHERE version = ?', (version,)).fetchone()
+            if not done:
+                for step in steps:
+                    if callable(step):
+                        step(conn)
+                    else:
+                        conn.execute(step)
+                conn.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                             (version, description))
+                applied.append(version)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return applied
+
+
+# Queries issued by the API endpoints, chat handlers and background jobs,
+# taken from the constants those code paths run. Parameters only need the
+# right shape; EXPLAIN does not execute them.
+HOT_QUERIES = {
+    'login': (queries.USER_BY_USERNAME_SQL, ('demo',)),
+    'register_exists': (queries.USER_EXISTS_SQL, ('demo', 'demo@x')),
+    'user_by_id': (queries.USER_BY_ID_SQL, (1,)),
+    'user_accounts': (queries.USER_ACCOUNTS_SQL, (1,)),
+    'user_account_ids': (queries.USER_ACCOUNT_IDS_SQL, (1,)),
+    'account_by_number': (queries.ACCOUNT_BY_NUMBER_SQL, ('ACC', 1)),
+    'recent_transactions': (queries.RECENT_TRANSACTIONS_SQL, (1,)),
+    'transactions_listing': (queries.transactions_listing_sql(cursor=True),
+                             (1, '2026-01-01', '2026-02-01', 10, 51)),
+    'transactions_listing_filtered': (queries.transactions_listing_sql(True, True, True),
+                                      (1, 'ACC', 'Food', '2026-01-01', '2026-02-01', 10, 51)),
+    'spending_by_category': spending_query(CATEGORY_SPENDING_SQL, (1, 2), '2026-01-01'),
+    'monthly_spending': spending_query(MONTH_SPENDING_SQL, (1, 2), '2026-01'),
+    'spending_trends': spending_query(MONTHLY_TRENDS_SQL, (1, 2), '2026-01'),
+    'statement_range': (queries.statement_page_sql(cursor=True),
+                        (1, '2026-01-01', '2026-02-01', '2026-01-15', 10, 51)),
+    'statement_totals': (queries.STATEMENT_TOTALS_SQL, (1, '2026-01-01', '2026-02-01')),
+    'statement_opening_balance': (queries.STATEMENT_OPENING_BALANCE_SQL, (1, '2026-01-01')),
+    'pending_bills': (queries.PENDING_BILLS_SQL, (1, 'pending')),
+    'bill_by_type': (BILL_BY_TYPE_SQL, (1, 'Electricity', 'pending')),
+    'calendar_bills': (queries.CALENDAR_BILLS_SQL, (1, '2026-01-01', '2026-01-31')),
+    'calendar_recurring': (queries.CALENDAR_RECURRING_SQL, (1, '2026-01-01', '2026-01-31')),
+    'calendar_goals': (queries.CALENDAR_GOALS_SQL, (1, '2026-01-01', '2026-01-31')),
+    'user_budgets': (queries.USER_BUDGETS_SQL, (1,)),
+    'user_goals': (queries.USER_GOALS_SQL, (1,)),
+    'user_investments': (queries.USER_INVESTMENTS_SQL, (1,)),
+    'alerts': (queries.alerts_sql(unread_only=True), (1,)),
+    'recurring_active': (queries.ACTIVE_RECURRING_SQL, (1,)),
+    'scheduler_due_recurring': (DUE_RECURRING_SQL, ('2026-01-01', '2025-12-01', 0, 200)),
+    'scheduler_due_bills': (DUE_BILLS_SQL, ('2026-01-01', '2025-12-01', 0, 200)),
+    'user_first_account': (FIRST_ACCOUNT_SQL, (1,)),
+    'user_shard': (USER_SHARD_SQL, (1,)),
+}
+
+_SCAN_RE = re.compile(r'^SCAN (\w+)\b(?! USING (COVERING )?INDEX)')
+
+
+def find_table_scans(conn, queries=None):
+    """Run EXPLAIN QUERY PLAN over the hot queries and report full table scans.
+
+    Returns a list of (query name, plan detail) tuples; empty means every
+    query is served by an index.
+    """
+    offenders = []
+    for name, (sql, params) in (queries or HOT_QUERIES).items():
+        for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall():
+            detail = row[3]
+            if _SCAN_RE.match(detail):
+                offenders.append((name, detail))
+    return offenders
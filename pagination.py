@@ -0,0 +1,60 @@
+"""
+Finance Assistant Bot - Keyset Pagination
+=========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Opaque keyset cursors, e.g. (created_at, id), for paging through transactions.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import base64
+import binascii
+import json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Parse a requested page size, capped at MAX_PAGE_SIZE"""
+    if value in (None, ''):
+        return default
+    size = int(value)
+    if size <= 0:
+        raise ValueError('Page size must be positive')
+    return min(size, MAX_PAGE_SIZE)
+
+
+def encode_cursor(row, key=('created_at', 'id')):
+    """Build the opaque cursor pointing just past ``row`` in ``key`` order"""
+    raw = json.dumps([row[column] for column in key], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Return the (sort value, id) pair of a cursor, or None for no cursor"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        sort_value, row_id = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(sort_value, (str, int, float)) or not isinstance(row_id, int):
+        raise ValueError('Invalid cursor')
+    return sort_value, row_id
+
+
+def paginate(rows, limit, key=('created_at', 'id')):
+    """Split ``limit + 1`` fetched rows into a page and its next cursor"""
+    if len(rows) > limit:
+        return rows[:limit], encode_cursor(rows[limit - 1], key)
+    return rows, None
@@ -0,0 +1,148 @@
+"""
+Finance Assistant Bot - Password Hashing
+========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Bounded worker pool for password hashing with configurable cost and rehash on login.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+
+class HasherBusyError(RuntimeError):
+    """Raised when the hashing queue is full"""
+
+
+def canonical_method(method):
+    """Expand a Werkzeug method string with its default cost parameters.
+
+    'scrypt' becomes 'scrypt:32768:8:1' and 'pbkdf2' becomes
+    'pbkdf2:sha256:<iterations>', matching the prefix Werkzeug writes in
+    front of the first '$' of a hash.
+    """
+    parts = method.split(':')
+    if parts[0] == 'scrypt':
+        defaults = ['scrypt', '32768', '8', '1']
+    elif parts[0] == 'pbkdf2':
+        defaults = ['pbkdf2', 'sha256', str(DEFAULT_PBKDF2_ITERATIONS)]
+    else:
+        raise ValueError(f'Unsupported password hash method: {method}')
+    if len(parts) > len(defaults):
+        raise ValueError(f'Unsupported password hash method: {method}')
+    return ':'.join(parts + defaults[len(parts):])
+
+
+class PasswordHasher:
+    """Run key-derivation calls on a small, bounded thread pool.
+
+    hashlib releases the GIL while deriving keys, so a login burst only
+    occupies ``max_workers`` cores and the request threads serving other
+    endpoints keep running. At most ``max_queue`` calls may wait for a
+    worker; beyond that :class:`HasherBusyError` is raised so the caller
+    can shed load. ``max_workers=0`` hashes inline on the calling thread.
+    """
+
+    def __init__(self, method='scrypt', max_workers=2, max_queue=64):
+        self.method = canonical_method(method)
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='password-hash') if max_workers else None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._rehashed = 0
+        self._max_queued = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._hash_total = 0.0
+
+    def _run(self, func, *args):
+        if self._executor is None:
+            return self._timed(time.perf_counter(), func, *args)
+        with self._lock:
+            if self._queued + self._running >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise HasherBusyError('Password hashing queue is full')
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+        return self._executor.submit(self._timed, time.perf_counter(), func, *args).result()
+
+    def _timed(self, submitted, func, *args):
+        started = time.perf_counter()
+        with self._lock:
+            if self._executor is not None:
+                self._queued -= 1
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._wait_total += started - submitted
+                self._wait_max = max(self._wait_max, started - submitted)
+                self._hash_total += finished - started
+
+    def hash(self, password):
+        """Hash ``password`` with the configured method"""
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, stored_hash, password):
+        return self._run(check_password_hash, stored_hash, password)
+
+    def needs_rehash(self, stored_hash):
+        """True when ``stored_hash`` was made with another method or cost"""
+        return stored_hash.split('$', 1)[0] != self.method
+
+    def verify_and_upgrade(self, stored_hash, password):
+        """Check a password and rehash it if the configured cost changed.
+
+        Returns (valid, new_hash); new_hash is None unless the caller
+        should store an upgraded hash.
+        """
+        if not self.verify(stored_hash, password):
+            return False, None
+        if not self.needs_rehash(stored_hash):
+            return True, None
+        new_hash = self.hash(password)
+        with self._lock:
+            self._rehashed += 1
+        return True, new_hash
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def stats(self):
+        """Return queue depth and timing counters"""
+        with self._lock:
+            return {
+                'method': self.method,
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'queue_depth': self._queued,
+                'max_queue_depth': self._max_queued,
+                'running': self._running,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'rehashed': self._rehashed,
+                'wait_avg_ms': round(self._wait_total * 1000 / self._completed, 3) if self._completed else 0.0,
+                'wait_max_ms': round(self._wait_max * 1000, 3),
+                'hash_avg_ms': round(self._hash_total * 1000 / self._completed, 3) if self._completed else 0.0,
+            }
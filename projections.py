@@ -0,0 +1,141 @@
+"""
+Finance Assistant Bot - Savings Projections
+===========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Seeded, vectorized Monte Carlo projections of savings with contributions.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import hashlib
+import json
+import math
+
+import numpy as np
+
+PERCENTILES = (5, 25, 50, 75, 95)
+# Paths are generated in fixed-size chunks, each from its own child seed,
+# so a seed gives the same result however the chunks are spread over workers
+CHUNK_PATHS = 10000
+MAX_PATHS = 200000
+MAX_MONTHS = 50 * 12
+
+
+class ProjectionInputError(ValueError):
+    """Raised for simulation parameters that cannot be used"""
+
+
+def validate_projection(params):
+    """Check and normalise simulation parameters, returning a new dict"""
+    try:
+        normalized = {
+            'principal': float(params.get('principal', 0)),
+            'monthly_contribution': float(params.get('monthly_contribution', 0) or 0),
+            'months': int(params['months']),
+            'expected_return': float(params.get('expected_return', 0)),
+            'volatility': float(params.get('volatility', 0)),
+            'paths': int(params.get('paths', CHUNK_PATHS)),
+            'seed': int(params.get('seed', 0)),
+            'target_amount': float(params['target_amount']) if params.get('target_amount') is not None else None,
+        }
+    except (KeyError, TypeError, ValueError):
+        raise ProjectionInputError('Invalid parameters')
+    if (normalized['principal'] < 0 or normalized['monthly_contribution'] < 0 or normalized['volatility'] < 0
+            or normalized['expected_return'] <= -100 or normalized['seed'] < 0):
+        raise ProjectionInputError('Invalid parameters')
+    if not 0 < normalized['months'] <= MAX_MONTHS:
+        raise ProjectionInputError(f'Horizon must be between 1 and {MAX_MONTHS} months')
+    if not 0 < normalized['paths'] <= MAX_PATHS:
+        raise ProjectionInputError(f'paths must be between 1 and {MAX_PATHS}')
+    return normalized
+
+
+def parameter_hash(params):
+    """Stable hash of normalised parameters, used as the cache key"""
+    canonical = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+def simulate_chunk(principal, monthly_contribution, months, expected_return, volatility, paths, seed_sequence):
+    """Simulate ``paths`` balances; returns float32 values after each year and at the horizon.
+
+    Monthly log-returns are normal with the annual volatility scaled to a
+    month and a drift that makes the mean annual growth equal
+    ``expected_return``. Contributions land at the end of each month.
+    Each year is advanced in one step: with growth factors g_1..g_12 and
+    G_k = g_1 * ... * g_k, the year-end balance is
+    G_12 * (V_0 + c * sum(1 / G_k)).
+    """
+    rng = np.random.default_rng(seed_sequence)
+    sigma = volatility / 100 / math.sqrt(12)
+    mu = math.log1p(expected_return / 100) / 12 - sigma ** 2 / 2
+    value = np.full(paths, principal)
+    checkpoints = list(range(12, months, 12)) + [months]
+    recorded = np.empty((len(checkpoints), paths), dtype=np.float32)
+    done = 0
+    for index, checkpoint in enumerate(checkpoints):
+        steps = checkpoint - done
+        growth = np.cumsum(rng.normal(mu, sigma, size=(steps, paths)), axis=0)
+        np.exp(growth, out=growth)
+        value = growth[-1] * (value + monthly_contribution * (1.0 / growth).sum(axis=0))
+        recorded[index] = value
+        done = checkpoint
+    return recorded
+
+
+def _simulate_chunk_args(args):
+    return simulate_chunk(*args)
+
+
+def run_projection(params, executor=None):
+    """Simulate validated ``params`` and summarise the distribution.
+
+    Chunks run on ``executor`` (a process pool) when given and there is
+    more than one; otherwise inline.
+    """
+    chunks = math.ceil(params['paths'] / CHUNK_PATHS)
+    seeds = np.random.SeedSequence(params['seed']).spawn(chunks)
+    jobs = [(params['principal'], params['monthly_contribution'], params['months'], params['expected_return'],
+             params['volatility'], min(CHUNK_PATHS, params['paths'] - i * CHUNK_PATHS), seeds[i])
+            for i in range(chunks)]
+    if executor is not None and chunks > 1:
+        results = list(executor.map(_simulate_chunk_args, jobs))
+    else:
+        results = [simulate_chunk(*job) for job in jobs]
+    values = np.concatenate(results, axis=1)
+
+    bands = np.percentile(values, PERCENTILES, axis=1)
+    months = params['months']
+    checkpoints = list(range(12, months, 12)) + [months]
+    final = values[-1]
+    total_contributed = params['principal'] + params['monthly_contribution'] * months
+    result = {
+        'mode': 'simulation',
+        'principal': params['principal'],
+        'monthly_contribution': params['monthly_contribution'],
+        'months': months,
+        'years': round(months / 12, 2),
+        'expected_return': params['expected_return'],
+        'volatility': params['volatility'],
+        'paths': params['paths'],
+        'seed': params['seed'],
+        'total_contributed': round(total_contributed, 2),
+        'mean_final': round(float(final.mean(dtype=np.float64)), 2),
+        'percentiles': {f'p{p}': round(float(v), 2) for p, v in zip(PERCENTILES, bands[:, -1])},
+        'bands': [dict({'month': checkpoint, 'year': round(checkpoint / 12, 2)},
+                       **{f'p{p}': round(float(v), 2) for p, v in zip(PERCENTILES, bands[:, i])})
+                  for i, checkpoint in enumerate(checkpoints)],
+        'probability_of_loss': round(float((final < total_contributed).mean()), 4),
+    }
+    if params['target_amount'] is not None:
+        result['target_amount'] = params['target_amount']
+        result['probability_of_target'] = round(float((final >= params['target_amount']).mean()), 4)
+    return result
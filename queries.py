@@ -0,0 +1,119 @@
+"""
+Finance Assistant Bot - Endpoint Queries
+========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: SQL run by the API endpoints and chat handlers, shared with the query-plan check.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+from search import TRANSACTION_COLUMNS
+
+# Queries the endpoints run as written. migrations.HOT_QUERIES explains
+# these same strings, so an edit here is what the plan check sees.
+USER_BY_USERNAME_SQL = 'SELECT * FROM users WHERE username = ?'
+USER_EXISTS_SQL = 'SELECT id FROM users WHERE username = ? OR email = ?'
+USER_BY_ID_SQL = 'SELECT * FROM users WHERE id = ?'
+
+USER_ACCOUNTS_SQL = 'SELECT * FROM accounts WHERE user_id = ?'
+USER_ACCOUNT_IDS_SQL = 'SELECT id FROM accounts WHERE user_id = ?'
+ACCOUNT_BY_NUMBER_SQL = 'SELECT * FROM accounts WHERE account_number = ? AND user_id = ?'
+
+RECENT_TRANSACTIONS_SQL = 'SELECT * FROM transactions WHERE account_id = ? ORDER BY created_at DESC LIMIT 10'
+
+STATEMENT_OPENING_BALANCE_SQL = '''
+    SELECT balance_after FROM transactions
+    WHERE account_id = ? AND created_at < ?
+    ORDER BY created_at DESC LIMIT 1
+'''
+STATEMENT_TOTALS_SQL = '''
+    SELECT COUNT(*) AS transaction_count,
+           COALESCE(SUM(CASE WHEN transaction_type IN ('deposit', 'transfer_in') THEN amount END), 0) AS total_deposits,
+           COALESCE(SUM(CASE WHEN transaction_type IN ('withdrawal', 'payment', 'transfer_out') THEN amount END), 0) AS total_withdrawals
+    FROM transactions
+    WHERE account_id = ? AND created_at >= ? AND created_at <= ?
+'''
+
+PENDING_BILLS_SQL = 'SELECT * FROM bills WHERE user_id = ? AND status = ? ORDER BY due_date'
+CALENDAR_BILLS_SQL = '''
+    SELECT * FROM bills
+    WHERE user_id = ? AND due_date >= ? AND due_date <= ?
+    ORDER BY due_date
+'''
+CALENDAR_RECURRING_SQL = '''
+    SELECT * FROM recurring_transactions
+    WHERE user_id = ? AND is_active = 1 AND next_date >= ? AND next_date <= ?
+'''
+CALENDAR_GOALS_SQL = '''
+    SELECT * FROM savings_goals
+    WHERE user_id = ? AND target_date >= ? AND target_date <= ?
+'''
+
+# ORDER BY id keeps the insertion order the indexes on (user_id, category)
+# and (user_id, target_date) would otherwise replace
+USER_BUDGETS_SQL = 'SELECT * FROM budgets WHERE user_id = ? ORDER BY id'
+USER_GOALS_SQL = 'SELECT * FROM savings_goals WHERE user_id = ? ORDER BY id'
+USER_INVESTMENTS_SQL = 'SELECT * FROM investments WHERE user_id = ? ORDER BY id'
+
+ACTIVE_RECURRING_SQL = '''
+    SELECT rt.*, a.account_number
+    FROM recurring_transactions rt
+    JOIN accounts a ON rt.account_id = a.id
+    WHERE rt.user_id = ? AND rt.is_active = 1
+    ORDER BY rt.next_date
+'''
+
+
+def transactions_listing_sql(account_number=False, category=False, cursor=False):
+    """Transaction page query of the user, newest first, with the optional filters.
+
+    Parameters: user id, then the account number and category when
+    filtered, the since date, the cursor's (created_at, id) when paging,
+    and the row limit.
+    """
+    query = f'''
+        SELECT {TRANSACTION_COLUMNS}, a.account_number, a.account_type
+        FROM transactions t
+        JOIN accounts a ON t.account_id = a.id
+        WHERE a.user_id = ?
+    '''
+    if account_number:
+        query += ' AND a.account_number = ?'
+    if category:
+        query += ' AND t.category = ?'
+    query += ' AND t.created_at >= ?'
+    if cursor:
+        query += ' AND (t.created_at, t.id) < (?, ?)'
+    return query + ' ORDER BY t.created_at DESC, t.id DESC LIMIT ?'
+
+
+def statement_page_sql(cursor=False):
+    """One page of an account statement, oldest first.
+
+    Parameters: account id, period start and end, the cursor's
+    (created_at, id) when paging, and the row limit.
+    """
+    cursor_clause = 'AND (created_at, id) > (?, ?)' if cursor else ''
+    return f'''
+        SELECT {TRANSACTION_COLUMNS} FROM transactions t
+        WHERE account_id = ? AND created_at >= ? AND created_at <= ?
+        {cursor_clause}
+        ORDER BY created_at ASC, id ASC
+        LIMIT ?
+    '''
+
+
+def alerts_sql(unread_only=False):
+    """The user's 50 latest alerts; parameter: user id"""
+    query = 'SELECT * FROM alerts WHERE user_id = ?'
+    if unread_only:
+        query += ' AND is_read = 0'
+    return query + ' ORDER BY created_at DESC LIMIT 50'
@@ -0,0 +1,352 @@
+"""
+Finance Assistant Bot - Recurring Scheduler
+===========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Posts due recurring transactions and recurring bills in batched, idempotent runs.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from budgets import add_months
+from importer import CREDIT_TYPES, recompute_balances
+from ledger import FIRST_ACCOUNT_SQL
+
+# (months, days) added per occurrence
+FREQUENCIES = {
+    'daily': (0, 1),
+    'weekly': (0, 7),
+    'biweekly': (0, 14),
+    'monthly': (1, 0),
+    'quarterly': (3, 0),
+    'yearly': (12, 0),
+    'annually': (12, 0),
+}
+SCHEDULER_BATCH_SIZE = 200
+# Occurrences one recurring transaction may post in a single run; the
+# rest are picked up by the next run
+MAX_CATCH_UP = 400
+MAX_REPORTED_PLANS = 100
+
+
+def occurrence_date(start, frequency, index):
+    """Return the ``index``-th occurrence counted from ``start``"""
+    months, days = FREQUENCIES[frequency]
+    if months:
+        return add_months(start, months * index)
+    return start + timedelta(days=days * index)
+
+
+def occurrence_index(anchor, frequency, day):
+    """Return the index of the first occurrence from ``anchor`` falling on or after ``day``"""
+    months, days = FREQUENCIES[frequency]
+    if months:
+        index = max(((day.year - anchor.year) * 12 + day.month - anchor.month) // months, 0)
+    else:
+        index = max(-(-(day - anchor).days // days), 0)
+    while occurrence_date(anchor, frequency, index) < day:
+        index += 1
+    return index
+
+
+def add_anchor_date_column(conn):
+    """Add recurring_transactions.anchor_date unless it is already there.
+
+    Rows are anchored on their first posted occurrence, or on next_date
+    when the scheduler has not posted them yet.
+    """
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(recurring_transactions)')]
+    if 'anchor_date' not in columns:
+        conn.execute('ALTER TABLE recurring_transactions ADD COLUMN anchor_date DATE')
+    conn.execute('''UPDATE recurring_transactions
+                    SET anchor_date = COALESCE((SELECT MIN(occurrence) FROM scheduled_postings
+                                                WHERE source = 'recurring' AND source_id = recurring_transactions.id),
+                                               next_date)
+                    WHERE anchor_date IS NULL''')
+
+
+class _Batch:
+    """Balances and ledger changes accumulated inside one write transaction"""
+
+    def __init__(self, conn, summary, dry_run):
+        self.conn = conn
+        self.summary = summary
+        self.dry_run = dry_run
+        self.balances = {}
+        self.earliest = {}
+        self.opening = {}
+        self.users = set()
+
+    def balance(self, account_id):
+        if account_id not in self.balances:
+            row = self.conn.execute('SELECT balance FROM accounts WHERE id = ?', (account_id,)).fetchone()
+            self.balances[account_id] = self.opening[account_id] = row['balance']
+        return self.balances[account_id]
+
+    def post(self, source, source_id, occurrence, user_id, account_id, transaction_type, amount,
+             description, category):
+        """Record one occurrence; returns False if it was already posted"""
+        cursor = self.conn.execute('''INSERT OR IGNORE INTO scheduled_postings (source, source_id, occurrence)
+                                      VALUES (?, ?, ?)''', (source, source_id, occurrence))
+        if not cursor.rowcount:
+            self.summary['duplicates'] += 1
+            return False
+        created_at = f'{occurrence} 00:00:00'
+        transaction_id = self.conn.execute('''
+            INSERT INTO transactions (account_id, transaction_type, amount, description, category, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)''',
+            (account_id, transaction_type, amount, description, category or 'Other', created_at)).lastrowid
+        self.conn.execute('''UPDATE scheduled_postings SET transaction_id = ?
+                             WHERE source = ? AND source_id = ? AND occurrence = ?''',
+                          (transaction_id, source, source_id, occurrence))
+        signed = amount if transaction_type in CREDIT_TYPES else -amount
+        self.balances[account_id] = self.balance(account_id) + signed
+        if created_at < self.earliest.get(account_id, '9999'):
+            self.earliest[account_id] = created_at
+        self.users.add(user_id)
+        if self.dry_run and len(self.summary['planned']) < MAX_REPORTED_PLANS:
+            self.summary['planned'].append({'source': source, 'id': source_id, 'user_id': user_id,
+                                            'occurrence': occurrence, 'transaction_type': transaction_type,
+                                            'amount': amount, 'description': description})
+        return True
+
+    def finish(self):
+        """Write account balances and rebuild balance_after from each account's earliest posting"""
+        for account_id, since in self.earliest.items():
+            net = self.balances[account_id] - self.opening[account_id]
+            recompute_balances(self.conn, account_id, since, self.opening[account_id], net)
+            self.conn.execute('UPDATE accounts SET balance = ? WHERE id = ?',
+                              (round(self.balances[account_id], 2), account_id))
+
+
+def _post_recurring(batch, row, as_of):
+    """Post every due occurrence of one recurring transaction and advance it.
+
+    Occurrences are counted from the rule's anchor date rather than from
+    the last next_date, so a monthly rule on the 31st that was clamped to
+    the 28th in February is back on the 31st in March.
+    """
+    summary = batch.summary
+    if row['frequency'] not in FREQUENCIES:
+        summary['invalid'] += 1
+        return
+    start = date.fromisoformat(row['next_date'][:10])
+    anchor = date.fromisoformat(row['anchor_date'][:10]) if row['anchor_date'] else start
+    end = date.fromisoformat(row['end_date'][:10]) if row['end_date'] else None
+    amount = abs(row['amount'])
+    debit = row['transaction_type'] not in CREDIT_TYPES
+    first = index = occurrence_index(anchor, row['frequency'], start)
+    while index - first < MAX_CATCH_UP:
+        occurrence = occurrence_date(anchor, row['frequency'], index)
+        if occurrence > as_of or (end and occurrence > end):
+            break
+        if debit and batch.balance(row['account_id']) < amount:
+            summary['insufficient_funds'] += 1
+            break
+        if batch.post('recurring', row['id'], occurrence.isoformat(), row['user_id'], row['account_id'],
+                      row['transaction_type'], amount, row['description'], row['category']):
+            summary['recurring_posted'] += 1
+        index += 1
+    if index == first and not (end and start > end):
+        return
+    next_date = occurrence_date(anchor, row['frequency'], index)
+    active = 0 if end and next_date > end else 1
+    summary['deactivated'] += 1 - active
+    batch.conn.execute('UPDATE recurring_transactions SET next_date = ?, anchor_date = ?, is_active = ? WHERE id = ?',
+                       (next_date.isoformat(), anchor.isoformat(), active, row['id']))
+
+
+def _pay_bill(batch, row, now):
+    """Pay one due recurring bill from the user's first account and roll it to next month"""
+    summary = batch.summary
+    account = batch.conn.execute(FIRST_ACCOUNT_SQL, (row['user_id'],)).fetchone()
+    if not account:
+        summary['invalid'] += 1
+        return
+    if batch.balance(account['id']) < row['amount']:
+        summary['insufficient_funds'] += 1
+        return
+    due = row['due_date'][:10]
+    if not batch.post('bill', row['id'], due, row['user_id'], account['id'], 'payment', row['amount'],
+                      f"{row['bill_type']} bill payment", 'Utilities'):
+        # Already paid and rolled forward by whoever posted it
+        return
+    summary['bills_paid'] += 1
+    batch.conn.execute("UPDATE bills SET status = 'paid', paid_at = ? WHERE id = ?", (now, row['id']))
+    next_due = add_months(date.fromisoformat(due), 1).isoformat()
+    batch.conn.execute('''INSERT INTO bills (user_id, bill_type, amount, due_date, status, recurring)
+                          VALUES (?, ?, ?, ?, 'pending', 1)''',
+                       (row['user_id'], row['bill_type'], row['amount'], next_due))
+    summary['bills_rolled'] += 1
+
+
+# Due rows are paged by (date, id) so rows left due (insufficient funds,
+# unknown frequency) are not selected again within a run
+DUE_RECURRING_SQL = '''SELECT * FROM recurring_transactions
+                       WHERE is_active = 1 AND next_date <= ? AND (next_date, id) > (?, ?)
+                       ORDER BY next_date, id LIMIT ?'''
+DUE_BILLS_SQL = '''SELECT * FROM bills
+                   WHERE recurring = 1 AND status = 'pending' AND due_date <= ? AND (due_date, id) > (?, ?)
+                   ORDER BY due_date, id LIMIT ?'''
+
+
+def run_due(conn, as_of=None, dry_run=False, batch_size=SCHEDULER_BATCH_SIZE, on_commit=None):
+    """Post everything due on or before ``as_of`` (default today) for all users.
+
+    Work is split into write transactions of ``batch_size`` recurring rows
+    or bills. Each posted occurrence is recorded in ``scheduled_postings``
+    under (source, id, occurrence date), so an occurrence is never posted
+    twice however many schedulers run or however long they were down.
+    Catch-up postings are dated on their occurrence and balance_after is
+    rebuilt from there. With ``dry_run`` every batch is rolled back and
+    the summary lists what would have been posted.
+
+    ``on_commit(user_ids)`` is called after each committed batch.
+    """
+    as_of = as_of or date.today()
+    started = time.perf_counter()
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    summary = {'as_of': as_of.isoformat(), 'dry_run': dry_run, 'recurring_posted': 0, 'bills_paid': 0,
+               'bills_rolled': 0, 'duplicates': 0, 'insufficient_funds': 0, 'deactivated': 0,
+               'invalid': 0, 'batches': 0}
+    if dry_run:
+        summary['planned'] = []
+
+    for sql, key, handle in ((DUE_RECURRING_SQL, 'next_date', lambda batch, row: _post_recurring(batch, row, as_of)),
+                             (DUE_BILLS_SQL, 'due_date', lambda batch, row: _pay_bill(batch, row, now))):
+        after = ('', 0)
+        while True:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = conn.execute(sql, (as_of.isoformat(), *after, batch_size)).fetchall()
+                if not rows:
+                    conn.rollback()
+                    break
+                batch = _Batch(conn, summary, dry_run)
+                for row in rows:
+                    handle(batch, row)
+                batch.finish()
+                if dry_run:
+                    conn.rollback()
+                else:
+                    conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            summary['batches'] += 1
+            if on_commit and batch.users and not dry_run:
+                on_commit(batch.users)
+            after = (rows[-1][key], rows[-1]['id'])
+
+    summary['seconds'] = round(time.perf_counter() - started, 4)
+    posted = summary['recurring_posted'] + summary['bills_paid']
+    summary['postings_per_second'] = round(posted / summary['seconds'], 1) if summary['seconds'] else 0.0
+    return summary
+
+
+def merge_summaries(summaries):
+    """Combine the run_due summaries of several databases into one"""
+    total = dict(summaries[0])
+    for summary in summaries[1:]:
+        for key, value in summary.items():
+            if key == 'planned':
+                total[key] = (total[key] + value)[:MAX_REPORTED_PLANS]
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                total[key] += value
+    posted = total['recurring_posted'] + total['bills_paid']
+    total['seconds'] = round(total['seconds'], 4)
+    total['postings_per_second'] = round(posted / total['seconds'], 1) if total['seconds'] else 0.0
+    return total
+
+
+class RecurringScheduler:
+    """Runs :func:`run_due` every ``interval`` seconds on a daemon thread.
+
+    Several processes may each run one; the occurrence ledger and
+    BEGIN IMMEDIATE keep their postings from overlapping. With
+    ``databases`` (a callable returning one connection factory per
+    database) each pass covers every database in turn.
+    """
+
+    def __init__(self, get_connection, interval=60, batch_size=SCHEDULER_BATCH_SIZE, on_commit=None,
+                 databases=None):
+        self.get_connection = get_connection
+        self.databases = databases
+        self.interval = interval
+        self.batch_size = batch_size
+        self.on_commit = on_commit
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._errors = 0
+        self._posted = 0
+        self._seconds = 0.0
+        self._last_run = None
+        self._last_error = None
+
+    def run(self, as_of=None, dry_run=False):
+        """Run one pass now and return its summary"""
+        summaries = []
+        for connect in self.databases() if self.databases else [self.get_connection]:
+            conn = connect()
+            try:
+                summaries.append(run_due(conn, as_of=as_of, dry_run=dry_run, batch_size=self.batch_size,
+                                         on_commit=self.on_commit))
+            finally:
+                conn.close()
+        summary = merge_summaries(summaries)
+        if not dry_run:
+            with self._lock:
+                self._runs += 1
+                self._posted += summary['recurring_posted'] + summary['bills_paid']
+                self._seconds += summary['seconds']
+                self._last_run = summary
+        return summary
+
+    def start(self):
+        if self._thread is None and self.interval > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='recurring-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run()
+            except Exception as e:
+                with self._lock:
+                    self._errors += 1
+                    self._last_error = f'{type(e).__name__}: {e}'
+            self._stop.wait(self.interval)
+
+    def stats(self):
+        """Return run counters and the last run's summary"""
+        with self._lock:
+            return {
+                'running': self._thread is not None,
+                'interval': self.interval,
+                'runs': self._runs,
+                'errors': self._errors,
+                'last_error': self._last_error,
+                'posted': self._posted,
+                'postings_per_second': round(self._posted / self._seconds, 1) if self._seconds else 0.0,
+                'last_run': self._last_run,
+            }
@@ -0,0 +1,181 @@
+"""
+Finance Assistant Bot - Transaction Search
+==========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: FTS5 full-text index over transaction descriptions, categories and tags.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import html
+import re
+
+from pagination import paginate
+
+# Private-use markers survive snippet() and are swapped for <mark> tags
+# only after the surrounding text has been HTML-escaped.
+_MARK_OPEN = '\x02'
+_MARK_CLOSE = '\x03'
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Transaction columns returned by the API; import_hash stays internal
+TRANSACTION_COLUMNS = ('t.id, t.account_id, t.transaction_type, t.amount, t.description, t.category, '
+                       't.balance_after, t.created_at')
+
+_TAGS_OF = '(SELECT group_concat(tag_name, \' \') FROM transaction_tags WHERE transaction_id = {0})'
+
+
+def create_fts_index(conn):
+    """Create and backfill transactions_fts plus its sync triggers.
+
+    Does nothing when this SQLite build lacks the FTS5 module; searches then
+    fall back to LIKE scans.
+    """
+    if not conn.execute("SELECT 1 FROM pragma_module_list WHERE name = 'fts5'").fetchone():
+        return
+    conn.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts
+                    USING fts5(description, category, tags,
+                               tokenize = 'unicode61 remove_diacritics 2',
+                               prefix = '2 3')''')
+    conn.execute('''CREATE TRIGGER IF NOT EXISTS trg_transactions_fts_insert
+                    AFTER INSERT ON transactions
+                    BEGIN
+                        INSERT INTO transactions_fts (rowid, description, category, tags)
+                        VALUES (NEW.id, NEW.description, NEW.category, '');
+                    END''')
+    conn.execute('''CREATE TRIGGER IF NOT EXISTS trg_transactions_fts_delete
+                    AFTER DELETE ON transactions
+                    BEGIN
+                        DELETE FROM transactions_fts WHERE rowid = OLD.id;
+                    END''')
+    conn.execute('''CREATE TRIGGER IF NOT EXISTS trg_transactions_fts_update
+                    AFTER UPDATE OF description, category ON transactions
+                    BEGIN
+                        UPDATE transactions_fts SET description = NEW.description, category = NEW.category
+                        WHERE rowid = NEW.id;
+                    END''')
+    conn.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_transaction_tags_fts_insert
+                     AFTER INSERT ON transaction_tags
+                     BEGIN
+                         UPDATE transactions_fts SET tags = COALESCE({_TAGS_OF.format('NEW.transaction_id')}, '')
+                         WHERE rowid = NEW.transaction_id;
+                     END''')
+    conn.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_transaction_tags_fts_delete
+                     AFTER DELETE ON transaction_tags
+                     BEGIN
+                         UPDATE transactions_fts SET tags = COALESCE({_TAGS_OF.format('OLD.transaction_id')}, '')
+                         WHERE rowid = OLD.transaction_id;
+                     END''')
+    conn.execute('DELETE FROM transactions_fts')
+    conn.execute(f'''INSERT INTO transactions_fts (rowid, description, category, tags)
+                     SELECT t.id, t.description, t.category, COALESCE({_TAGS_OF.format('t.id')}, '')
+                     FROM transactions t''')
+
+
+def has_fts_index(conn):
+    """Return True when the transactions_fts table exists"""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions_fts'").fetchone() is not None
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query of quoted prefix terms (None if empty)"""
+    tokens = _TOKEN_RE.findall(text or '')
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _highlight(snippet):
+    escaped = html.escape(snippet or '')
+    return escaped.replace(_MARK_OPEN, '<mark>').replace(_MARK_CLOSE, '</mark>')
+
+
+def search_transactions(conn, account_ids, text, limit, cursor=None, sort='recent'):
+    """Search the given accounts' transactions.
+
+    ``sort`` is 'recent' (created_at, id descending) or 'relevance' (bm25
+    rank, then id). Returns (rows as dicts, next_cursor). Each row carries a
+    ``snippet`` of the description with matched terms wrapped in <mark>.
+
+    Only 'recent' pages are stable. A relevance cursor holds the last bm25
+    score, and scores shift whenever a write changes the index statistics,
+    so a relevance page after such a write can skip or repeat rows. Use
+    it for a first page of best matches and 'recent' to walk every result.
+    """
+    if not account_ids:
+        return [], None
+    placeholders = ','.join('?' * len(account_ids))
+    match = build_match_query(text)
+
+    if match is None or not has_fts_index(conn):
+        return _like_search(conn, account_ids, text, limit, cursor)
+
+    params = [match] + list(account_ids)
+    if sort == 'relevance':
+        # Best-effort: the rank in the cursor is only valid until the index changes
+        key = ('rank', 'id')
+        cursor_clause = 'AND (bm25(transactions_fts), t.id) > (?, ?)' if cursor else ''
+        order = 'bm25(transactions_fts), t.id'
+    else:
+        key = ('created_at', 'id')
+        cursor_clause = 'AND (t.created_at, t.id) < (?, ?)' if cursor else ''
+        order = 't.created_at DESC, t.id DESC'
+    if cursor:
+        params.extend(cursor)
+
+    rows = conn.execute(f'''
+        SELECT {TRANSACTION_COLUMNS}, a.account_number, bm25(transactions_fts) AS rank,
+               snippet(transactions_fts, 0, '{_MARK_OPEN}', '{_MARK_CLOSE}', '…', 12) AS snippet
+        FROM transactions_fts
+        JOIN transactions t ON t.id = transactions_fts.rowid
+        JOIN accounts a ON a.id = t.account_id
+        WHERE transactions_fts MATCH ?
+        AND t.account_id IN ({placeholders})
+        {cursor_clause}
+        ORDER BY {order}
+        LIMIT ?
+    ''', params + [limit + 1]).fetchall()
+    page, next_cursor = paginate(rows, limit, key)
+
+    results = []
+    for row in page:
+        item = dict(row)
+        item['snippet'] = _highlight(item['snippet'])
+        results.append(item)
+    return results, next_cursor
+
+
+def _like_search(conn, account_ids, text, limit, cursor=None):
+    """Substring search used for empty queries or without FTS5"""
+    placeholders = ','.join('?' * len(account_ids))
+    params = list(account_ids) + [f'%{(text or "").lower()}%']
+    cursor_clause = ''
+    if cursor:
+        cursor_clause = 'AND (t.created_at, t.id) < (?, ?)'
+        params.extend(cursor)
+    rows = conn.execute(f'''
+        SELECT {TRANSACTION_COLUMNS}, a.account_number
+        FROM transactions t
+        JOIN accounts a ON t.account_id = a.id
+        WHERE t.account_id IN ({placeholders})
+        AND LOWER(t.description) LIKE ?
+        {cursor_clause}
+        ORDER BY t.created_at DESC, t.id DESC
+        LIMIT ?
+    ''', params + [limit + 1]).fetchall()
+    page, next_cursor = paginate(rows, limit)
+    results = []
+    for row in page:
+        item = dict(row)
+        item['snippet'] = html.escape(item['description'] or '')
+        results.append(item)
+    return results, next_cursor
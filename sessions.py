@@ -0,0 +1,143 @@
+"""
+Finance Assistant Bot - Session Storage
+=======================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Server-side sessions stored in a SQLite table with lazy loads and batched expiry.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import json
+import secrets
+import threading
+import time
+from collections.abc import MutableMapping
+
+from flask.sessions import SessionInterface, SessionMixin
+
+SESSION_BACKENDS = ('filesystem', 'sqlite', 'cookie')
+
+
+class SqliteSession(SessionMixin, MutableMapping):
+    """Session whose row is only read the first time a key is touched"""
+
+    def __init__(self, sid=None, loader=None):
+        self.sid = sid
+        self._loader = loader
+        self._data = None if loader else {}
+        self.modified = False
+        self.accessed = False
+
+    @property
+    def data(self):
+        self.accessed = True
+        if self._data is None:
+            self._data = self._loader(self.sid)
+            if self._data is None:
+                # Unknown or expired id: never adopt a client-chosen id
+                self.sid = None
+                self._data = {}
+        return self._data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+        self.modified = True
+
+    def __delitem__(self, key):
+        del self.data[key]
+        self.modified = True
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def clear(self):
+        if self.data:
+            self.data.clear()
+            self.modified = True
+
+
+class SqliteSessionInterface(SessionInterface):
+    """Store sessions in the ``sessions`` table (see migration 5).
+
+    Requests that never touch ``session`` cost no query, unchanged sessions
+    are never written back, and expired rows are deleted in one statement
+    at most every ``sweep_interval`` seconds instead of on every request.
+    ``get_connection`` returns a pooled connection that ``close()`` releases.
+    """
+
+    def __init__(self, get_connection, sweep_interval=300):
+        self.get_connection = get_connection
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+
+    def _load(self, sid):
+        conn = self.get_connection()
+        row = conn.execute('SELECT data FROM sessions WHERE id = ? AND expires_at > ?',
+                           (sid, int(time.time()))).fetchone()
+        conn.close()
+        return json.loads(row['data']) if row else None
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if not sid:
+            return SqliteSession()
+        return SqliteSession(sid, self._load)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+        if not session.modified:
+            return
+
+        conn = self.get_connection()
+        if not session:
+            if session.sid:
+                conn.execute('DELETE FROM sessions WHERE id = ?', (session.sid,))
+                conn.commit()
+                response.delete_cookie(name, domain=domain, path=path)
+            conn.close()
+            return
+
+        if not session.sid:
+            session.sid = secrets.token_urlsafe(32)
+        now = int(time.time())
+        expires_at = now + int(app.permanent_session_lifetime.total_seconds())
+        conn.execute('''INSERT INTO sessions (id, data, expires_at) VALUES (?, ?, ?)
+                        ON CONFLICT (id) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at''',
+                     (session.sid, json.dumps(dict(session), separators=(',', ':')), expires_at))
+        self._maybe_sweep(conn, now)
+        conn.commit()
+        conn.close()
+
+        response.set_cookie(name, session.sid,
+                            expires=self.get_expiration_time(app, session),
+                            httponly=self.get_cookie_httponly(app),
+                            domain=domain, path=path,
+                            secure=self.get_cookie_secure(app),
+                            samesite=self.get_cookie_samesite(app))
+
+    def _maybe_sweep(self, conn, now):
+        with self._sweep_lock:
+            if time.monotonic() < self._next_sweep:
+                return
+            self._next_sweep = time.monotonic() + self.sweep_interval
+        conn.execute('DELETE FROM sessions WHERE expires_at <= ?', (now,))
@@ -0,0 +1,231 @@
+"""
+Finance Assistant Bot - User Shards
+===================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Places each user's data in one of several SQLite files and moves users between them.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import hashlib
+import os
+
+# Shard number of the main database. It is also the directory: users,
+# sessions, exchange rates and the user_shards placement table live there.
+MAIN_DATABASE = -1
+
+USER_SHARD_SQL = 'SELECT shard FROM user_shards WHERE user_id = ?'
+
+# Tables whose rows carry the owning user_id
+USER_TABLES = ('accounts', 'bills', 'budgets', 'savings_goals', 'investments', 'alerts', 'loans', 'debts',
+               'recurring_transactions', 'custom_categories')
+
+# (table, rows belonging to :user, {id column: table it refers to}) in an
+# order where every referenced table comes first. A reference may be a
+# callable choosing the table from the row. Rollups and the search index
+# are kept up by triggers, so they are not copied.
+USER_ROWS = [
+    ('accounts', 'user_id = :user', {}),
+    ('transactions', 'account_id IN (SELECT id FROM accounts WHERE user_id = :user)',
+     {'account_id': 'accounts'}),
+    ('transaction_tags', '''transaction_id IN (SELECT t.id FROM transactions t
+                                               JOIN accounts a ON t.account_id = a.id
+                                               WHERE a.user_id = :user)''',
+     {'transaction_id': 'transactions'}),
+    ('bills', 'user_id = :user', {}),
+    ('recurring_transactions', 'user_id = :user', {'account_id': 'accounts'}),
+    ('scheduled_postings', '''(source = 'recurring' AND source_id IN
+                                  (SELECT id FROM recurring_transactions WHERE user_id = :user))
+                              OR (source = 'bill' AND source_id IN (SELECT id FROM bills WHERE user_id = :user))''',
+     {'source_id': lambda row: 'recurring_transactions' if row['source'] == 'recurring' else 'bills',
+      'transaction_id': 'transactions'}),
+    ('budgets', 'user_id = :user', {}),
+    ('savings_goals', 'user_id = :user', {}),
+    ('investments', 'user_id = :user', {}),
+    ('alerts', 'user_id = :user', {}),
+    ('loans', 'user_id = :user', {}),
+    ('debts', 'user_id = :user', {}),
+    ('custom_categories', 'user_id = :user', {}),
+]
+
+
+class ShardMoveError(Exception):
+    """Raised when a user cannot be moved"""
+
+
+def shard_path(database, shard):
+    """File of shard ``shard`` next to the main database: finance_bot.db -> finance_bot.shard0.db"""
+    if shard == MAIN_DATABASE:
+        return database
+    root, ext = os.path.splitext(database)
+    return f'{root}.shard{shard}{ext or ".db"}'
+
+
+def shard_for(user_id, shard_count):
+    """Hashed home shard of ``user_id`` among ``shard_count`` (the main database when 0)"""
+    if not shard_count:
+        return MAIN_DATABASE
+    digest = hashlib.blake2b(str(user_id).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % shard_count
+
+
+def lookup_shard(conn, user_id):
+    """Shard holding ``user_id``'s data; users without a placement row are in the main database"""
+    row = conn.execute(USER_SHARD_SQL, (user_id,)).fetchone()
+    return MAIN_DATABASE if row is None else row[0]
+
+
+def assign_shard(conn, user_id, shard_count):
+    """Place a new user on its hashed shard, in the caller's transaction; returns the shard"""
+    shard = shard_for(user_id, shard_count)
+    if shard != MAIN_DATABASE:
+        conn.execute('INSERT INTO user_shards (user_id, shard) VALUES (?, ?)', (user_id, shard))
+    return shard
+
+
+def copy_user_rows(source, target, user_id):
+    """Insert the user's rows from ``source`` into ``target`` under new ids; returns row counts"""
+    ids = {}
+    counts = {}
+    for table, where, references in USER_ROWS:
+        columns = [row[1] for row in source.execute(f'PRAGMA table_info({table})')]
+        copied = [column for column in columns if column != 'id']
+        insert = f"INSERT INTO {table} ({', '.join(copied)}) VALUES ({', '.join('?' * len(copied))})"
+        mapping = ids[table] = {}
+        rows = source.execute(f"SELECT {', '.join(columns)} FROM {table} WHERE {where}", {'user': user_id}).fetchall()
+        for row in rows:
+            values = dict(zip(columns, row))
+            for column, referenced in references.items():
+                if values[column] is not None:
+                    referenced = referenced(values) if callable(referenced) else referenced
+                    values[column] = ids[referenced].get(values[column])
+            cursor = target.execute(insert, [values[column] for column in copied])
+            if 'id' in values:
+                mapping[values['id']] = cursor.lastrowid
+        counts[table] = len(rows)
+    return counts
+
+
+def delete_user_rows(conn, user_id):
+    """Delete every row of the user, dependents first"""
+    for table, where, _ in reversed(USER_ROWS):
+        conn.execute(f'DELETE FROM {table} WHERE {where}', {'user': user_id})
+
+
+def move_user(directory, connect, user_id, target):
+    """Move one user's rows to shard ``target``; returns row counts, or None if already there.
+
+    ``directory`` is a connection to the main database and ``connect(shard)``
+    opens a write connection to a shard. The source is write-locked from
+    the copy until the placement is switched, so no write of the user is
+    left behind. Each step is recorded in user_shards first: an
+    interrupted move is finished by :func:`resume_moves`. Inserts for the
+    user that reach the old database afterwards fail (see moved_users)
+    instead of being lost. Run one move at a time.
+    """
+    if not directory.execute('SELECT 1 FROM users WHERE id = ?', (user_id,)).fetchone():
+        raise ShardMoveError(f'Unknown user {user_id}')
+    row = directory.execute('SELECT shard, moving_to, moved_from FROM user_shards WHERE user_id = ?',
+                            (user_id,)).fetchone()
+    if row is not None and (row['moved_from'] is not None or row['moving_to'] not in (None, target)):
+        raise ShardMoveError(f'User {user_id} has an unfinished move; run the rebalance to finish it')
+    source = MAIN_DATABASE if row is None else row['shard']
+    if source == target:
+        return None
+
+    directory.execute('BEGIN IMMEDIATE')
+    directory.execute('''INSERT INTO user_shards (user_id, shard, moving_to) VALUES (?, ?, ?)
+                         ON CONFLICT (user_id) DO UPDATE SET moving_to = excluded.moving_to''',
+                      (user_id, source, target))
+    directory.commit()
+
+    src = directory if source == MAIN_DATABASE else connect(source)
+    dst = directory if target == MAIN_DATABASE else connect(target)
+    try:
+        src.execute('BEGIN IMMEDIATE')
+        try:
+            dst.execute('BEGIN IMMEDIATE')
+            try:
+                # Rows left by an earlier interrupted move to this shard
+                delete_user_rows(dst, user_id)
+                dst.execute('DELETE FROM moved_users WHERE user_id = ?', (user_id,))
+                counts = copy_user_rows(src, dst, user_id)
+                dst.commit()
+            except BaseException:
+                dst.rollback()
+                raise
+            if directory is not src:
+                directory.execute('BEGIN IMMEDIATE')
+            directory.execute('UPDATE user_shards SET shard = ?, moving_to = NULL, moved_from = ? WHERE user_id = ?',
+                              (target, source, user_id))
+            if directory is not src:
+                directory.commit()
+            delete_user_rows(src, user_id)
+            src.execute('INSERT OR IGNORE INTO moved_users (user_id) VALUES (?)', (user_id,))
+            src.commit()
+        except BaseException:
+            if src.in_transaction:
+                src.rollback()
+            if directory.in_transaction:
+                directory.rollback()
+            raise
+        _finish_move(directory, user_id)
+    finally:
+        for conn in (src, dst):
+            if conn is not directory:
+                conn.close()
+    return counts
+
+
+def _finish_move(directory, user_id):
+    directory.execute('BEGIN IMMEDIATE')
+    directory.execute('UPDATE user_shards SET moved_from = NULL WHERE user_id = ?', (user_id,))
+    directory.commit()
+
+
+def resume_moves(directory, connect):
+    """Finish moves a crash interrupted; returns the user ids touched"""
+    resumed = []
+    for row in directory.execute('''SELECT user_id, moving_to, moved_from FROM user_shards
+                                    WHERE moving_to IS NOT NULL OR moved_from IS NOT NULL''').fetchall():
+        user_id = row['user_id']
+        if row['moved_from'] is not None:
+            # Switched over but the old copy may still be there
+            source = row['moved_from']
+            conn = directory if source == MAIN_DATABASE else connect(source)
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                delete_user_rows(conn, user_id)
+                conn.execute('INSERT OR IGNORE INTO moved_users (user_id) VALUES (?)', (user_id,))
+                conn.commit()
+            finally:
+                if conn is not directory:
+                    conn.close()
+            _finish_move(directory, user_id)
+        else:
+            # Not switched yet: the source copy is still complete, so start over
+            move_user(directory, connect, user_id, row['moving_to'])
+        resumed.append(user_id)
+    return resumed
+
+
+def plan_rebalance(directory, shard_count):
+    """(user id, current shard, hashed shard) for every user not on its hashed shard"""
+    rows = directory.execute(f'''SELECT u.id, COALESCE(s.shard, {MAIN_DATABASE}) FROM users u
+                                 LEFT JOIN user_shards s ON s.user_id = u.id ORDER BY u.id''').fetchall()
+    return [(user_id, current, shard_for(user_id, shard_count)) for user_id, current in rows
+            if shard_for(user_id, shard_count) != current]
+
+
+def placement_counts(directory):
+    """Number of users placed on each shard, the main database included"""
+    return dict(directory.execute(f'''SELECT COALESCE(s.shard, {MAIN_DATABASE}), COUNT(*) FROM users u
+                                      LEFT JOIN user_shards s ON s.user_id = u.id GROUP BY 1''').fetchall())
@@ -344,38 +344,15 @@ function getCommandFromButton(buttonText) {
 // Load financial dashboard data
 async function loadDashboardData() {
     try {
-        const [accountsRes, budgetsRes, goalsRes, investmentsRes, analysisRes] = await Promise.all([
-            fetch('/api/accounts'),
-            fetch('/api/budgets'),
-            fetch('/api/goals'),
-            fetch('/api/investments'),
-            fetch('/api/spending-analysis?days=30')
-        ]);
+        const response = await fetch('/api/dashboard?days=30');
+        if (!response.ok) return;
         
-        if (accountsRes.ok) {
-            const data = await accountsRes.json();
-            updateAccountsDisplay(data.accounts);
-        }
-        
-        if (budgetsRes.ok) {
-            const data = await budgetsRes.json();
-            updateBudgetsDisplay(data.budgets);
-        }
-        
-        if (goalsRes.ok) {
-            const data = await goalsRes.json();
-            updateGoalsDisplay(data.goals);
-        }
-        
-        if (investmentsRes.ok) {
-            const data = await investmentsRes.json();
-            updateInvestmentsDisplay(data.investments);
-        }
-        
-        if (analysisRes.ok) {
-            const data = await analysisRes.json();
-            updateSpendingChart(data);
-        }
+        const data = await response.json();
+        updateAccountsDisplay(data.accounts);
+        updateBudgetsDisplay(data.budgets);
+        updateGoalsDisplay(data.goals);
+        updateInvestmentsDisplay(data.investments);
+        updateSpendingChart(data.spending_analysis);
     } catch (error) {
         console.error('Error loading dashboard:', error);
     }
@@ -457,10 +434,10 @@ async function convertCurrency(amount, fromCurrency, toCurrency) {
     }
 }
 
-// Get expense trends
-async function getExpenseTrends(months = 6) {
+// Get expense trends (optionally with a month x category breakdown)
+async function getExpenseTrends(months = 6, byCategory = false) {
     try {
-        const response = await fetch(`/api/expense-trends?months=${months}`);
+        const response = await fetch(`/api/expense-trends?months=${months}&by_category=${byCategory}`);
         const data = await response.json();
         return data;
     } catch (error) {
@@ -0,0 +1,257 @@
+"""
+Finance Assistant Bot - Group-Commit Writer
+===========================================
+Project: Finance Assistant Bot
+Category: Custom Chatbots
+Description: Single writer thread that applies queued small writes in group commits.
+
+Developer Information:
+----------------------
+Founder: Molla Samser
+Email: help@rskworld.in
+Phone: +91 93305 39277
+Address: Nutanhat, Mongolkote, Purba Burdwan, West Bengal, India, 713147
+Website: https://rskworld.in
+Year: 2026
+"""
+
+import queue
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from ledger import BUSY_BASE_DELAY, BUSY_MAX_DELAY, BUSY_RETRIES, is_busy
+
+WRITE_BATCH_SIZE = 64
+WRITE_WINDOW = 0.0
+WRITE_QUEUE_SIZE = 4096
+# Recent queue latencies kept for the percentiles in stats()
+LATENCY_SAMPLES = 2048
+
+
+class WriteQueueBusyError(Exception):
+    """Raised when a write cannot be queued, or is not applied in time"""
+
+
+class _Write:
+    __slots__ = ('operation', 'future', 'queued_at')
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.future = Future()
+        self.queued_at = time.perf_counter()
+
+
+def execute(sql, params=()):
+    """An operation running one statement; its result is the cursor's rowcount"""
+    return lambda conn: conn.execute(sql, params).rowcount
+
+
+class WriteQueue:
+    """Applies queued write operations on one thread, many per transaction.
+
+    An operation is a callable taking the connection. The writer takes
+    the first waiting operation, then keeps collecting until it has
+    ``batch_size`` of them or ``window`` seconds have passed, and runs
+    them all in one BEGIN IMMEDIATE transaction. With no window a batch
+    is whatever queued up while the previous commit was running, which
+    adds no latency when idle. One commit (one fsync) covers the whole
+    batch. If an operation fails, the batch is rolled back and run again
+    with a savepoint around each operation, so only that operation's
+    caller sees the error. The future returned by submit() is resolved
+    only after the commit, so a caller that waits on it knows its write
+    is as durable as the connection's synchronous setting makes any
+    commit.
+    """
+
+    def __init__(self, connect, batch_size=WRITE_BATCH_SIZE, window=WRITE_WINDOW, max_queue=WRITE_QUEUE_SIZE):
+        self.connect = connect
+        self.batch_size = batch_size
+        self.window = window
+        self._queue = queue.Queue(max_queue)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        self._writes = 0
+        self._failed = 0
+        self._commits = 0
+        self._busy_retries = 0
+        self._largest_batch = 0
+        self._rejected = 0
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._commit_seconds = 0.0
+
+    def submit(self, operation):
+        """Queue ``operation(conn)``; returns a Future for its result"""
+        write = _Write(operation)
+        with self._lock:
+            if self._stopping:
+                raise RuntimeError('Write queue is stopped')
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='write-queue', daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait(write)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise WriteQueueBusyError('Write queue is full')
+        return write.future
+
+    def stop(self):
+        """Apply everything already queued, then stop the writer thread"""
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+        with self._lock:
+            self._thread = None
+            self._stopping = False
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                write = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if write is None:
+                # Stop after this batch
+                self._queue.put(None)
+                break
+            batch.append(write)
+        return batch
+
+    def _run(self):
+        batch = []
+        try:
+            conn = self.connect()
+            try:
+                while True:
+                    batch = self._collect()
+                    if batch is None:
+                        return
+                    self._apply(conn, batch)
+            finally:
+                conn.close()
+        except Exception as e:
+            # Let the next submit() start a fresh writer, and fail what is
+            # waiting now instead of leaving callers to time out
+            with self._lock:
+                self._thread = None
+            self._fail(batch or [], e)
+            self._fail(self._drain(), e)
+
+    def _drain(self):
+        writes = []
+        while True:
+            try:
+                write = self._queue.get_nowait()
+            except queue.Empty:
+                return writes
+            if write is not None:
+                writes.append(write)
+
+    def _fail(self, writes, error):
+        failed = 0
+        for write in writes:
+            if not write.future.done():
+                write.future.set_exception(error)
+                failed += 1
+        with self._lock:
+            self._failed += failed
+
+    def _apply(self, conn, batch):
+        isolate = False
+        attempt = 0
+        while True:
+            outcomes = []
+            started = time.perf_counter()
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                for write in batch:
+                    if not isolate:
+                        outcomes.append((True, write.operation(conn)))
+                        continue
+                    conn.execute('SAVEPOINT queued_write')
+                    try:
+                        outcomes.append((True, write.operation(conn)))
+                        conn.execute('RELEASE queued_write')
+                    except Exception as e:
+                        if isinstance(e, sqlite3.OperationalError) and is_busy(e):
+                            raise
+                        conn.execute('ROLLBACK TO queued_write')
+                        conn.execute('RELEASE queued_write')
+                        outcomes.append((False, e))
+                conn.commit()
+                break
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                if isinstance(e, sqlite3.OperationalError) and is_busy(e):
+                    if attempt < BUSY_RETRIES:
+                        attempt += 1
+                        with self._lock:
+                            self._busy_retries += 1
+                        time.sleep(random.uniform(0, min(BUSY_MAX_DELAY, BUSY_BASE_DELAY * 2 ** attempt)))
+                        continue
+                elif not isolate and len(outcomes) < len(batch):
+                    # An operation failed: run the batch again, isolating each one
+                    isolate = True
+                    continue
+                outcomes = [(False, e)] * len(batch)
+                break
+        committed_at = time.perf_counter()
+
+        failed = 0
+        for write, (ok, value) in zip(batch, outcomes):
+            if ok:
+                write.future.set_result(value)
+            else:
+                failed += 1
+                write.future.set_exception(value)
+        with self._lock:
+            self._commits += 1
+            self._writes += len(batch) - failed
+            self._failed += failed
+            self._largest_batch = max(self._largest_batch, len(batch))
+            self._commit_seconds += committed_at - started
+            self._latencies.extend(committed_at - write.queued_at for write in batch)
+
+    def stats(self):
+        """Return commit batch sizes and queue latency (submit to durable) percentiles"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            written = self._writes + self._failed
+
+            def percentile(p):
+                if not latencies:
+                    return 0.0
+                return round(latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000, 3)
+
+            return {
+                'running': self._thread is not None,
+                'batch_size': self.batch_size,
+                'window_ms': self.window * 1000,
+                'queued': self._queue.qsize(),
+                'writes': self._writes,
+                'failed': self._failed,
+                'rejected': self._rejected,
+                'commits': self._commits,
+                'busy_retries': self._busy_retries,
+                'avg_batch': round(written / self._commits, 2) if self._commits else 0.0,
+                'largest_batch': self._largest_batch,
+                'avg_commit_ms': round(self._commit_seconds / self._commits * 1000, 3) if self._commits else 0.0,
+                'latency_p50_ms': percentile(50),
+                'latency_p99_ms': percentile(99),
+            }